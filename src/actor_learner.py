@@ -0,0 +1,214 @@
+import time
+import queue
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+from pong_env import PongEnv
+from q_agent import DQN
+from profiler import Profiler
+
+def worker_epsilon(worker_id, num_workers, base=0.4, alpha=7):
+    """Epsilon fixe propre à chaque worker (du plus explorateur au plus glouton)"""
+    if num_workers == 1:
+        return base
+    return base ** (1 + alpha * worker_id / (num_workers - 1))
+
+def _run_worker(worker_id, shared_model, transitions, stop_event, epsilon,
+                opponent_difficulty, chunk_size, sync_interval, seed, hidden_size, dueling, frame_skip=1):
+    """Boucle d'un worker : joue avec sa copie du DQN et envoie les transitions par paquets"""
+    torch.set_num_threads(1)
+    rng = np.random.default_rng(seed)
+    env = PongEnv(opponent_difficulty=opponent_difficulty, frame_skip=frame_skip)
+    state_size = env.observation_space.shape[0]
+    action_size = env.action_space.n
+
+    # Copie locale des poids, resynchronisée toutes les sync_interval frames
+    model = DQN(state_size, action_size, hidden_size, dueling)
+    model.load_state_dict(shared_model.state_dict())
+    model.eval()
+
+    # Paquet de transitions préalloué
+    states = np.zeros((chunk_size, state_size), dtype=np.float32)
+    actions = np.zeros(chunk_size, dtype=np.int64)
+    rewards = np.zeros(chunk_size, dtype=np.float32)
+    next_states = np.zeros((chunk_size, state_size), dtype=np.float32)
+    dones = np.zeros(chunk_size, dtype=np.float32)
+    episodes = []
+
+    state, _ = env.reset(seed=seed)
+    score = 0
+    length = 0
+    size = 0
+    steps = 0
+
+    try:
+        while not stop_event.is_set():
+            if rng.random() < epsilon:
+                action = int(rng.integers(action_size))
+            else:
+                with torch.no_grad():
+                    action = model(torch.from_numpy(state).unsqueeze(0)).argmax().item()
+
+            next_state, reward, done, _, _ = env.step(action)
+
+            states[size] = state
+            actions[size] = action
+            rewards[size] = reward
+            next_states[size] = next_state
+            dones[size] = done
+            size += 1
+            score += reward
+            length += 1
+            steps += 1
+
+            if done:
+                episodes.append((score, env.episode_frames, env.hits, length))
+                score = 0
+                length = 0
+                state, _ = env.reset()
+            else:
+                state = next_state
+
+            # Envoi du paquet : les tensors passent par la mémoire partagée
+            if size == chunk_size:
+                chunk = (
+                    worker_id,
+                    torch.from_numpy(states.copy()),
+                    torch.from_numpy(actions.copy()),
+                    torch.from_numpy(rewards.copy()),
+                    torch.from_numpy(next_states.copy()),
+                    torch.from_numpy(dones.copy()),
+                    episodes,
+                )
+                # File pleine : on réessaie en surveillant l'arrêt plutôt que de bloquer indéfiniment
+                while not stop_event.is_set():
+                    try:
+                        transitions.put(chunk, timeout=0.1)
+                        break
+                    except queue.Full:
+                        pass
+                size = 0
+                episodes = []
+
+            if steps % sync_interval == 0:
+                model.load_state_dict(shared_model.state_dict())
+    except KeyboardInterrupt:
+        pass  # Le learner se charge de l'arrêt
+
+class ActorLearner:
+    """Des workers jouent en parallèle, le learner (processus principal) entraîne l'agent"""
+
+    def __init__(self, agent, num_workers, opponent_difficulty=0.2, chunk_size=256,
+                 sync_interval=1000, publish_interval=100, queue_size=64, seed=0, profiler=None, frame_skip=1):
+        self.agent = agent
+        self.profiler = profiler if profiler is not None else Profiler()
+        self.num_workers = num_workers
+        self.publish_interval = publish_interval
+
+        # Poids partagés lus par les workers
+        ctx = mp.get_context("spawn")
+        config = agent.config
+        self.shared_model = DQN(agent.state_size, agent.action_size, config.hidden_size, config.dueling).cpu()
+        self.shared_model.share_memory()
+        self._publish_weights()
+
+        self.transitions = ctx.Queue(maxsize=queue_size)
+        self.stop_event = ctx.Event()
+        self.epsilons = [worker_epsilon(i, num_workers) for i in range(num_workers)]
+        self.workers = [
+            ctx.Process(
+                target=_run_worker,
+                args=(i, self.shared_model, self.transitions, self.stop_event, self.epsilons[i],
+                      opponent_difficulty, chunk_size, sync_interval, None if seed is None else seed + i,
+                      config.hidden_size, config.dueling, frame_skip),
+                daemon=True,
+            )
+            for i in range(num_workers)
+        ]
+
+        # Compteurs de débit
+        self.transition_count = 0
+        self.update_count = 0
+        self.start_time = None
+
+    def _publish_weights(self):
+        """Copie les poids du learner dans le modèle partagé (lecture sans verrou côté workers)"""
+        with torch.no_grad():
+            for shared, param in zip(self.shared_model.state_dict().values(), self.agent.model.state_dict().values()):
+                shared.copy_(param)
+
+    def _receive(self, block):
+        """Transfère au plus un paquet par worker dans la mémoire du learner, renvoie les épisodes terminés"""
+        finished = []
+        for _ in range(self.num_workers):
+            try:
+                chunk = self.transitions.get(block=block, timeout=1.0 if block else None)
+            except queue.Empty:
+                break
+            block = False
+            worker_id, states, actions, rewards, next_states, dones, episodes = chunk
+            if self.agent.memory.n_step > 1:
+                # Un paquet est une séquence d'un seul worker : retours à n pas calculés par flux
+                for i in range(len(actions)):
+                    self.agent.memory.push(states[i].numpy(), int(actions[i]), float(rewards[i]),
+                                           next_states[i].numpy(), bool(dones[i]), stream=worker_id)
+            else:
+                self.agent.memory.push_batch(states.numpy(), actions.numpy(), rewards.numpy(),
+                                             next_states.numpy(), dones.numpy())
+            self.transition_count += len(actions)
+            finished.extend(episodes)
+        return finished
+
+    def throughput(self):
+        """Renvoie (transitions/s, mises à jour/s) depuis le démarrage"""
+        elapsed = max(time.time() - self.start_time, 1e-9) if self.start_time else 1e-9
+        return self.transition_count / elapsed, self.update_count / elapsed
+
+    def episodes(self):
+        """Entraîne en continu et renvoie (score, frames, hits, steps) de chaque épisode terminé par un worker"""
+        for worker in self.workers:
+            worker.start()
+        self.start_time = time.time()
+        updates_since_publish = 0
+
+        try:
+            while True:
+                # On attend des données tant que la mémoire est trop petite pour entraîner
+                warming_up = len(self.agent.memory) < self.agent.train_start
+                with self.profiler.timer("learner.receive"):
+                    finished = self._receive(block=warming_up)
+
+                with self.profiler.timer("agent.train_step"):
+                    trained = self.agent.train_step() is not None
+                if trained:
+                    self.update_count += self.agent.updates_per_step
+                    updates_since_publish += self.agent.updates_per_step
+                    if updates_since_publish >= self.publish_interval:
+                        with self.profiler.timer("learner.publish"):
+                            self._publish_weights()
+                        updates_since_publish = 0
+
+                yield from finished
+        finally:
+            self.close()
+
+    def _drain(self):
+        """Vide la file sans traiter les paquets"""
+        while True:
+            try:
+                self.transitions.get_nowait()
+            except queue.Empty:
+                return
+            except (OSError, EOFError):
+                pass  # Paquet d'un worker déjà terminé : sa mémoire partagée n'est plus accessible
+
+    def close(self, timeout=5.0):
+        """Arrête les workers en vidant la file pour débloquer leurs envois en cours"""
+        self.stop_event.set()
+        deadline = time.time() + timeout
+        for worker in self.workers:
+            while worker.is_alive() and time.time() < deadline:
+                self._drain()
+                worker.join(timeout=0.1)
+            if worker.is_alive():
+                worker.terminate()
@@ -1,39 +1,62 @@
 import random
-import pygame
+from physics import WINDOW_WIDTH, WINDOW_HEIGHT
+from trajectory import predict_intercept
+from controllers import NONE, UP, DOWN, apply_action
 
 class SimpleAI:
-    def __init__(self, paddle, difficulty=0.2):  # Difficulté réduite = plus précis
+    def __init__(self, paddle, difficulty=0.2, intercept_table=None, rng=None):  # Difficulté réduite = plus précis
         self.paddle = paddle
+        self.rng = rng if rng is not None else random.Random()  # Générateur de l'erreur de visée
         self.difficulty = difficulty
         self.reaction_delay = 0.02  # Délai réduit = plus rapide
         self.last_move_time = 0
-        self.prediction_range = 200  # Distance de prédiction en pixels
+        self.intercept_table = intercept_table  # InterceptTable optionnelle, sinon calcul exact
+        
+        # Abscisse du centre de la balle au contact de la raquette
+        rect = paddle.rect
+        self.is_left = rect.x + rect.width / 2 < WINDOW_WIDTH / 2
+        self.contact_x = rect.x + rect.width if self.is_left else rect.x
         
     def update(self, ball, current_time):
+        apply_action(self.paddle, self.decide(ball, current_time))
+        
+    def decide(self, ball, current_time):
+        """Action à appliquer à la raquette (sans la déplacer)"""
         actual_delay = self.reaction_delay * (1 + self.difficulty)
         
         if current_time - self.last_move_time < actual_delay:
-            return
+            return NONE
             
-        # Prédiction basique de la position future de la balle
-        predicted_y = ball.rect.centery + (ball.speed_y * self.prediction_range / abs(ball.speed_x) if ball.speed_x != 0 else 0)
-        
-        # Position cible avec prédiction
-        target_y = predicted_y
+        # Point d'impact sur notre raquette, rebonds sur les murs compris
+        target_y = self.predict(ball)
+        if target_y is None:
+            target_y = ball.rect.centery  # La balle s'éloigne : on la suit
         
         # Erreur réduite et proportionnelle à la distance
         distance_to_ball = abs(ball.rect.x - self.paddle.rect.x)
         error_factor = min(1.0, distance_to_ball / 400)  # Plus précis quand la balle est proche
-        error = random.uniform(-20, 20) * self.difficulty * error_factor
+        error = self.rng.uniform(-20, 20) * self.difficulty * error_factor
         target_y += error
         
         # Limite la position cible aux bords de l'écran
-        target_y = max(self.paddle.rect.height/2, min(target_y, pygame.display.get_surface().get_height() - self.paddle.rect.height/2))
+        target_y = max(self.paddle.rect.height/2, min(target_y, WINDOW_HEIGHT - self.paddle.rect.height/2))
+        
+        self.last_move_time = current_time
         
         # Déplace la raquette vers la cible avec une marge de tolérance plus petite
         if self.paddle.rect.centery < target_y - 2:
-            self.paddle.move(up=False)
+            return DOWN
         elif self.paddle.rect.centery > target_y + 2:
-            self.paddle.move(up=True)
+            return UP
+        return NONE
             
-        self.last_move_time = current_time 
\ No newline at end of file
+    def predict(self, ball):
+        """Ordonnée du centre de la balle à son arrivée sur la raquette (None si elle s'éloigne)"""
+        rect = ball.rect
+        radius = rect.width / 2
+        contact_x = self.contact_x + radius if self.is_left else self.contact_x - radius
+        x = rect.x + radius
+        y = rect.y + rect.height / 2
+        if self.intercept_table is not None:
+            return self.intercept_table.lookup(x, y, ball.speed_x, ball.speed_y)
+        return predict_intercept(x, y, ball.speed_x, ball.speed_y, contact_x, WINDOW_HEIGHT, radius)
@@ -0,0 +1,12 @@
+"""Benchmarks de débit de l'environnement, de la mémoire de replay, de l'agent et de train().
+
+Lancement depuis src/ : python -m benchmarks [--quick] [--output FICHIER] [--baseline FICHIER]
+
+Référence : benchmarks/baseline_quick.json, résultats de --quick sur CPU (machine et versions dans "meta").
+Comparaison : python -m benchmarks --quick --baseline benchmarks/baseline_quick.json
+Les valeurs dépendent de la machine : régénérer la référence sur la machine de comparaison, depuis le
+commit de référence, avec python -m benchmarks --quick --output benchmarks/baseline_quick.json
+"""
+from benchmarks.suite import run_suite, compare, peak_rss_mb, BENCHMARKS
+
+__all__ = ["run_suite", "compare", "peak_rss_mb", "BENCHMARKS"]
@@ -0,0 +1,46 @@
+import sys
+import json
+import argparse
+from benchmarks.suite import run_suite, compare, BENCHMARKS
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de débit d'IA-Pong")
+    parser.add_argument("names", nargs="*", help=f"Benchmarks à lancer parmi {', '.join(BENCHMARKS)} (tous par défaut)")
+    parser.add_argument("--quick", action="store_true", help="Tailles réduites pour un contrôle rapide")
+    parser.add_argument("--repeats", type=int, default=3, help="Nombre de répétitions (on garde la meilleure)")
+    parser.add_argument("--output", help="Fichier JSON où écrire les résultats")
+    parser.add_argument("--baseline", help="Résultats de référence (JSON) à comparer")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Dégradation relative signalée comme régression")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"benchmark inconnu : {', '.join(unknown)}")
+
+    results = run_suite(args.names or None, quick=args.quick, repeats=args.repeats)
+
+    print()
+    for key, result in results["results"].items():
+        print(f"{key:45s} {result['value']:>14.2f} {result['unit']}")
+    if results["peak_rss_mb"] is not None:
+        print(f"{'peak_rss':45s} {results['peak_rss_mb']:>14.1f} Mo")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows = compare(results, baseline, args.threshold)
+        print(f"\nComparaison avec {args.baseline} (seuil {args.threshold:.0%}) :")
+        for key, value, reference, gain, regression in rows:
+            flag = "  <-- RÉGRESSION" if regression else ""
+            print(f"{key:45s} {reference:>12.2f} -> {value:>12.2f} ({gain:+.1%}){flag}")
+        if any(row[-1] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+import os
+import sys
+import time
+import shutil
+import platform
+import tempfile
+import contextlib
+import numpy as np
+import torch
+
+SEED = 0
+
+
+def peak_rss_mb():
+    """Pic de mémoire résidente du processus en Mo (None si la plateforme ne le fournit pas)"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        try:
+            import psutil
+        except ImportError:
+            return None
+        return psutil.Process().memory_info().peak_wset / 2**20
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Octets sur macOS, kilo-octets sur Linux
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def _best_of(function, repeats):
+    """Meilleur temps de plusieurs exécutions : le moins sensible aux perturbations de la machine"""
+    return min(function() for _ in range(repeats))
+
+
+def _timed(loop):
+    start = time.perf_counter()
+    loop()
+    return time.perf_counter() - start
+
+
+def _random_transitions(rng, count, state_size=6):
+    return (rng.random((count, state_size), dtype=np.float32), rng.integers(0, 3, count),
+            rng.random(count, dtype=np.float32), rng.random((count, state_size), dtype=np.float32),
+            rng.random(count) < 0.01)
+
+
+def bench_env_single(quick, repeats):
+    """Steps/s de PongEnv avec des actions aléatoires tirées d'avance"""
+    from pong_env import PongEnv
+    steps = 20000 if quick else 200000
+    actions = np.random.default_rng(SEED).integers(0, 3, steps).tolist()
+
+    def run():
+        env = PongEnv()
+        env.reset(seed=SEED)
+        step = env.step
+        reset = env.reset
+
+        def loop():
+            for action in actions:
+                if step(action)[2]:
+                    reset()
+        return _timed(loop)
+
+    return {"env_steps_per_sec": (steps / _best_of(run, repeats), "steps/s", True)}
+
+
+def bench_env_vector(quick, repeats, num_envs=64):
+    """Steps/s cumulés de VectorPongEnv (num_envs parties par appel)"""
+    from vector_env import VectorPongEnv
+    steps = 500 if quick else 5000
+    actions = np.random.default_rng(SEED).integers(0, 3, (steps, num_envs))
+
+    def run():
+        env = VectorPongEnv(num_envs, seed=SEED)
+
+        def loop():
+            for batch in actions:
+                env.step(batch)
+        return _timed(loop)
+
+    return {f"vector_env_{num_envs}_steps_per_sec": (steps * num_envs / _best_of(run, repeats), "steps/s", True)}
+
+
+def bench_replay(quick, repeats, batch_size=128):
+    """Latence de push (unitaire et par batch) et de sample pour plusieurs capacités"""
+    from replay import ReplayMemory, PrioritizedReplayMemory
+    capacities = (10000, 100000) if quick else (10000, 100000, 1000000)
+    iterations = 200 if quick else 2000
+    results = {}
+    rng = np.random.default_rng(SEED)
+    pushes = _random_transitions(rng, iterations)
+
+    for capacity in capacities:
+        for name, memory_class in (("uniform", ReplayMemory), ("prioritized", PrioritizedReplayMemory)):
+            memory = memory_class(capacity, seed=SEED)
+            memory.push_batch(*_random_transitions(rng, capacity))
+            states, actions, rewards, next_states, dones = pushes
+
+            def push():
+                def loop():
+                    for i in range(iterations):
+                        memory.push(states[i], int(actions[i]), float(rewards[i]), next_states[i], bool(dones[i]))
+                return _timed(loop)
+
+            def push_batch():
+                return _timed(lambda: memory.push_batch(*pushes))
+
+            def sample():
+                def loop():
+                    for _ in range(iterations):
+                        memory.sample(batch_size)
+                return _timed(loop)
+
+            key = f"replay_{name}_{capacity}"
+            results[f"{key}_push_us"] = (_best_of(push, repeats) / iterations * 1e6, "µs", False)
+            results[f"{key}_push_batch_us"] = (_best_of(push_batch, repeats) / iterations * 1e6, "µs/transition", False)
+            results[f"{key}_sample_us"] = (_best_of(sample, repeats) / iterations * 1e6, "µs/batch", False)
+    return results
+
+
+def _make_agent(prioritized=False):
+    from q_agent import QLearningAgent
+    torch.manual_seed(SEED)
+    return QLearningAgent(6, 3, prioritized=prioritized, seed=SEED)
+
+
+def bench_agent(quick, repeats):
+    """Updates/s de train_step et latence de get_action / get_actions"""
+    results = {}
+    updates = 200 if quick else 2000
+    rng = np.random.default_rng(SEED)
+
+    for prioritized in (False, True):
+        agent = _make_agent(prioritized)
+        agent.memory.push_batch(*_random_transitions(rng, 20000))
+        agent.train_step()  # Préchauffage (allocations des buffers)
+
+        def train():
+            def loop():
+                for _ in range(updates):
+                    agent.train_step()
+                agent.pop_loss()  # Inclut la synchronisation avec le device
+            return _timed(loop)
+
+        name = "prioritized" if prioritized else "uniform"
+        results[f"train_step_{name}_updates_per_sec"] = (updates / _best_of(train, repeats), "updates/s", True)
+
+    # Politique gloutonne : on mesure le passage dans le réseau, pas le tirage aléatoire
+    agent = _make_agent()
+    agent.epsilon = 0.0
+    calls = 1000 if quick else 10000
+    states = rng.random((calls, 6), dtype=np.float32)
+    batch = rng.random((64, 6), dtype=np.float32)
+
+    def single():
+        def loop():
+            for state in states:
+                agent.get_action(state)
+        return _timed(loop)
+
+    def batched():
+        def loop():
+            for _ in range(calls // 10):
+                agent.get_actions(batch)
+        return _timed(loop)
+
+    results["get_action_us"] = (_best_of(single, repeats) / calls * 1e6, "µs", False)
+    results["get_actions_64_us"] = (_best_of(batched, repeats) / (calls // 10) * 1e6, "µs/batch", False)
+    return results
+
+
+def bench_train(quick, repeats, num_envs=1):
+    """Frames/s de bout en bout de train() sur un nombre fixe d'épisodes (dossiers temporaires)"""
+    import train
+    episodes = 5 if quick else 30
+
+    def run():
+        directory = tempfile.mkdtemp(prefix="pong_bench_")
+        try:
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                summary = train.train(save_interval=10**9, model_dir=os.path.join(directory, "models"),
+                                      stats_dir=os.path.join(directory, "stats"), load_model=False,
+                                      num_envs=num_envs, seed=SEED, plot=False, max_episodes=episodes)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+        return summary["frames"] / summary["duration"]
+
+    return {"train_frames_per_sec": (max(run() for _ in range(1 if quick else repeats)), "frames/s", True)}
+
+
+BENCHMARKS = {
+    "env": bench_env_single,
+    "vector_env": bench_env_vector,
+    "replay": bench_replay,
+    "agent": bench_agent,
+    "train": bench_train,
+}
+
+
+def run_suite(names=None, quick=False, repeats=3, verbose=True):
+    """Lance les benchmarks choisis et renvoie un dict sérialisable en JSON"""
+    np.random.seed(SEED)
+    torch.manual_seed(SEED)
+    torch.set_num_threads(1)  # Résultats comparables d'une machine chargée à l'autre
+
+    results = {}
+    for name in names or BENCHMARKS:
+        if verbose:
+            print(f"Benchmark {name}...", flush=True)
+        for key, (value, unit, higher_is_better) in BENCHMARKS[name](quick, repeats).items():
+            results[key] = {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+    return {
+        "meta": {
+            "timestamp": time.time(),
+            "quick": quick,
+            "repeats": repeats,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "torch": torch.__version__,
+            "platform": platform.platform(),
+            "device": "cuda" if torch.cuda.is_available() else "cpu",
+        },
+        "results": results,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def compare(current, baseline, threshold=0.10):
+    """Compare deux résultats, renvoie [(nom, valeur, référence, variation relative, régression)]"""
+    rows = []
+    for key, result in current["results"].items():
+        reference = baseline["results"].get(key)
+        if reference is None or not reference["value"]:
+            continue
+        change = result["value"] / reference["value"] - 1
+        # Variation signée : positive = amélioration
+        gain = change if result["higher_is_better"] else -change
+        rows.append((key, result["value"], reference["value"], gain, gain < -threshold))
+    return rows
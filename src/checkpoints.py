@@ -0,0 +1,158 @@
+import os
+import json
+import queue
+import threading
+import torch
+
+INDEX_FILE = "index.json"
+BEST_MODEL_FILE = "best_model.pth"
+
+
+class CheckpointManager:
+    """Checkpoints d'entraînement avec politique de rétention, index et écriture en arrière-plan.
+
+    Seuls les keep_last derniers checkpoints et les keep_best meilleurs (selon
+    le score) sont conservés. Chaque checkpoint est accompagné d'un export
+    d'inférence qui ne contient que les poids du réseau principal (en float16
+    si half=True). L'index (épisode, score, fichiers) est dans index.json.
+    """
+
+    def __init__(self, model_dir, keep_last=3, keep_best=3, half=True, async_save=True, queue_size=2):
+        self.model_dir = model_dir
+        self.keep_last = keep_last
+        self.keep_best = keep_best
+        self.half = half
+        os.makedirs(model_dir, exist_ok=True)
+
+        self.index_path = os.path.join(model_dir, INDEX_FILE)
+        self.entries = []
+        self.best_score = None
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                index = json.load(f)
+            self.entries = index["checkpoints"]
+            self.best_score = index.get("best_score")
+
+        # Écritures faites par un thread dédié, dans l'ordre des demandes
+        self._error = None
+        self._queue = None
+        self._thread = None
+        if async_save:
+            self._queue = queue.Queue(maxsize=queue_size)
+            self._thread = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+            self._thread.start()
+
+    def save(self, agent, episode, score):
+        """Enregistre un checkpoint de l'épisode, renvoie True si c'est le meilleur score jusqu'ici"""
+        is_best = self.best_score is None or score > self.best_score
+        if is_best:
+            self.best_score = score
+        self._submit(self._write_checkpoint, agent, episode, score, is_best)
+        return is_best
+
+    def save_as(self, agent, filename):
+        """Enregistre un checkpoint complet hors rétention (ex. interrupted_model.pth)"""
+        self._submit(self._write_file, agent, filename)
+
+    def _submit(self, task, agent, *args):
+        self._raise_error()
+        # Copie de l'état sur le thread d'entraînement, écriture sur le thread dédié
+        checkpoint = agent.checkpoint(snapshot=self._queue is not None)
+        if self._queue is None:
+            task(checkpoint, *args)
+        else:
+            # Le flush de la mémoire sur disque (msync) se fait aussi sur le thread dédié
+            memory = agent.memory
+            self._queue.put((task, checkpoint, args, memory, memory.cursor()))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                task, checkpoint, args, memory, cursor = item
+                memory.flush(cursor)
+                task(checkpoint, *args)
+            except Exception as error:  # Relancée sur le thread d'entraînement
+                self._error = error
+            finally:
+                self._queue.task_done()
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _write(self, obj, path):
+        """Écriture atomique : un fichier n'est jamais visible à moitié écrit"""
+        tmp_path = path + ".tmp"
+        torch.save(obj, tmp_path)
+        os.replace(tmp_path, path)
+
+    def _write_file(self, checkpoint, filename):
+        self._write(checkpoint, os.path.join(self.model_dir, filename))
+
+    def _write_checkpoint(self, checkpoint, episode, score, is_best):
+        path = f"model_episode_{episode}.pth"
+        export_path = f"policy_episode_{episode}.pth"
+        self._write(checkpoint, os.path.join(self.model_dir, path))
+        self._write(self.export(checkpoint, self.half), os.path.join(self.model_dir, export_path))
+        if is_best:
+            self._write(checkpoint, os.path.join(self.model_dir, BEST_MODEL_FILE))
+
+        # Un épisode déjà indexé (nouvel entraînement dans le même dossier) est remplacé
+        self.entries = [entry for entry in self.entries if entry["path"] != path]
+        self.entries.append({"episode": episode, "score": float(score), "path": path, "export": export_path})
+        self._apply_retention()
+        self._write_index()
+
+    def _apply_retention(self):
+        by_episode = sorted(self.entries, key=lambda entry: entry["episode"])
+        by_score = sorted(self.entries, key=lambda entry: entry["score"], reverse=True)
+        kept = by_episode[len(by_episode) - self.keep_last:] if self.keep_last > 0 else []
+        kept += by_score[:self.keep_best]
+        kept_paths = {entry["path"] for entry in kept}
+
+        for entry in self.entries:
+            if entry["path"] not in kept_paths:
+                for filename in (entry["path"], entry["export"]):
+                    path = os.path.join(self.model_dir, filename)
+                    if os.path.exists(path):
+                        os.remove(path)
+        self.entries = [entry for entry in by_episode if entry["path"] in kept_paths]
+
+    def _write_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"best_score": self.best_score, "checkpoints": self.entries}, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    @staticmethod
+    def export(checkpoint, half=True):
+        """Export d'inférence : poids du réseau principal et variante de réseau, sans optimiseur ni target"""
+        dtype = torch.float16 if half else torch.float32
+        return {
+            'model_state_dict': {name: tensor.to(dtype) for name, tensor in checkpoint['model_state_dict'].items()},
+            'config': checkpoint['config'],
+        }
+
+    def best(self):
+        """Entrée d'index du meilleur checkpoint conservé (None si aucun)"""
+        self.wait()
+        if not self.entries:
+            return None
+        return max(self.entries, key=lambda entry: entry["score"])
+
+    def wait(self):
+        """Attend la fin des écritures en cours"""
+        if self._queue is not None:
+            self._queue.join()
+        self._raise_error()
+
+    def close(self):
+        """Termine les écritures en attente puis arrête le thread"""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self._raise_error()
@@ -0,0 +1,120 @@
+import copy
+import time
+import threading
+from metrics import Metric
+
+# Actions des contrôleurs de raquette, mêmes codes que PongEnv
+NONE, UP, DOWN = 0, 1, 2
+
+
+def apply_action(paddle, action):
+    if action == UP:
+        paddle.move(up=True)
+    elif action == DOWN:
+        paddle.move(up=False)
+
+
+class AsyncController:
+    """Exécute un contrôleur (SimpleAI, DQNPolicy...) sur un thread, hors de la boucle de rendu.
+
+    update(ball, current_time) a la même interface que celle des contrôleurs : elle applique la
+    dernière décision disponible sans attendre, puis publie l'état courant au worker. Une décision
+    est manquée si le worker n'a pas répondu au dernier état publié ou l'a fait en plus de
+    latency_budget secondes ; sans décision fraîche la raquette ne bouge pas.
+
+    Le contrôleur fourni travaille sur des copies de la balle et des raquettes, mises à jour à
+    partir de l'état publié : il ne lit jamais les objets du jeu pendant qu'ils bougent.
+    """
+
+    def __init__(self, controller, latency_budget=0.008, name=None):
+        self.controller = controller
+        self.latency_budget = latency_budget
+        self.paddle = controller.paddle
+        self.opponent = getattr(controller, "opponent", None)
+        controller.paddle = copy.deepcopy(self.paddle)
+        if self.opponent is not None:
+            controller.opponent = copy.deepcopy(self.opponent)
+        self.ball = None
+
+        self.condition = threading.Condition()
+        self.snapshot = None  # (numéro, instant de publication, état, temps de jeu)
+        self.decision = None  # (numéro, action, latence)
+        self.published = 0
+        self.consumed = 0
+        self.error = None
+        self.running = True
+
+        # Métriques
+        self.frames = 0
+        self.missed = 0
+        self.latency = Metric(window=600, quantiles=(0.5, 0.95, 0.99))
+
+        self.thread = threading.Thread(target=self._run, name=name or "async-controller", daemon=True)
+        self.thread.start()
+
+    def update(self, ball, current_time):
+        if self.error is not None:
+            raise RuntimeError("le contrôleur asynchrone a échoué") from self.error
+
+        with self.condition:
+            decision = self.decision
+        if self.published:
+            self.frames += 1
+            fresh = decision is not None and decision[0] == self.published and decision[2] <= self.latency_budget
+            if not fresh:
+                self.missed += 1
+        # Chaque décision n'est appliquée qu'une fois, même si elle arrive en retard
+        if decision is not None and decision[0] > self.consumed:
+            self.consumed = decision[0]
+            apply_action(self.paddle, decision[1])
+        self.publish(ball, current_time)
+
+    def publish(self, ball, current_time):
+        state = (ball.rect.x, ball.rect.y, ball.speed_x, ball.speed_y, self.paddle.rect.y,
+                 self.opponent.rect.y if self.opponent is not None else None)
+        with self.condition:
+            if self.ball is None:
+                self.ball = copy.deepcopy(ball)
+            self.published += 1
+            self.snapshot = (self.published, time.perf_counter(), state, current_time)
+            self.condition.notify()
+
+    def _run(self):
+        seen = 0
+        while True:
+            with self.condition:
+                while self.running and (self.snapshot is None or self.snapshot[0] == seen):
+                    self.condition.wait()
+                if not self.running:
+                    return
+                seen, published_at, state, current_time = self.snapshot
+                ball = self.ball
+            ball.rect.x, ball.rect.y, ball.speed_x, ball.speed_y, paddle_y, opponent_y = state
+            self.controller.paddle.rect.y = paddle_y
+            if opponent_y is not None:
+                self.controller.opponent.rect.y = opponent_y
+            try:
+                action = self.controller.decide(ball, current_time)
+            except Exception as error:
+                self.error = error
+                return
+            latency = time.perf_counter() - published_at
+            with self.condition:
+                self.decision = (seen, action, latency)
+            self.latency.update(latency)
+
+    def stats(self):
+        """Décisions attendues, manquées et latence de calcul (en ms)"""
+        summary = self.latency.summary()
+        return {
+            "frames": self.frames,
+            "missed": self.missed,
+            "missed_rate": self.missed / max(self.frames, 1),
+            "latency_ms": {key: summary[key] * 1e3 for key in ("mean", "p50", "p95", "p99", "max")},
+        }
+
+    def close(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        self.thread.join()
@@ -1,6 +1,37 @@
 from enum import Enum, auto
+from collections import OrderedDict
 import pygame
 
+WHITE = (255, 255, 255)
+
+class TextCache:
+    """Polices chargées une seule fois et surfaces de texte mémorisées par (texte, taille, couleur), LRU bornée"""
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+
+    def font(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            font = self.fonts[size] = pygame.font.Font(None, size)
+        return font
+
+    def render(self, text, size, color=WHITE):
+        key = (text, size, color)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self.surfaces[key] = self.font(size).render(text, True, color)
+            if len(self.surfaces) > self.max_entries:
+                self.surfaces.popitem(last=False)  # Le moins récemment utilisé
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
+
+# Cache partagé par le jeu et les écrans
+text_cache = TextCache()
+
 class GameState(Enum):
     MENU = auto()
     PLAYING = auto()
@@ -8,21 +39,21 @@ class GameState(Enum):
     GAME_OVER = auto()
 
 class Menu:
-    def __init__(self, screen):
+    def __init__(self, screen, texts=text_cache):
         self.screen = screen
         self.options = ["Jouer", "Quitter"]
         self.selected = 0
-        self.font = pygame.font.Font(None, 74)
+        self.texts = texts
 
     def draw(self):
         self.screen.fill((0, 0, 0))
-        title = self.font.render("AI PONG BATTLE", True, (255, 255, 255))
+        title = self.texts.render("AI PONG BATTLE", 74)
         title_rect = title.get_rect(center=(self.screen.get_width()//2, 100))
         self.screen.blit(title, title_rect)
 
         for i, option in enumerate(self.options):
             color = (255, 255, 0) if i == self.selected else (255, 255, 255)
-            text = self.font.render(option, True, color)
+            text = self.texts.render(option, 74, color)
             rect = text.get_rect(center=(self.screen.get_width()//2, 300 + i * 100))
             self.screen.blit(text, rect)
 
@@ -40,9 +71,9 @@ class Menu:
         return GameState.MENU
 
 class PauseScreen:
-    def __init__(self, screen):
+    def __init__(self, screen, texts=text_cache):
         self.screen = screen
-        self.font = pygame.font.Font(None, 74)
+        self.texts = texts
         self.overlay = pygame.Surface((screen.get_width(), screen.get_height()))
         self.overlay.fill((0, 0, 0))
         self.overlay.set_alpha(128)
@@ -52,19 +83,18 @@ class PauseScreen:
         self.screen.blit(game_screen, (0, 0))
         self.screen.blit(self.overlay, (0, 0))
         
-        text = self.font.render("PAUSE", True, (255, 255, 255))
+        text = self.texts.render("PAUSE", 74)
         rect = text.get_rect(center=(self.screen.get_width()//2, self.screen.get_height()//2))
         self.screen.blit(text, rect)
         
-        sub_font = pygame.font.Font(None, 36)
-        sub_text = sub_font.render("Appuyez sur ESPACE pour continuer", True, (255, 255, 255))
+        sub_text = self.texts.render("Appuyez sur ESPACE pour continuer", 36)
         sub_rect = sub_text.get_rect(center=(self.screen.get_width()//2, self.screen.get_height()//2 + 50))
         self.screen.blit(sub_text, sub_rect)
 
 class GameOverScreen:
-    def __init__(self, screen):
+    def __init__(self, screen, texts=text_cache):
         self.screen = screen
-        self.font = pygame.font.Font(None, 74)
+        self.texts = texts
         self.overlay = pygame.Surface((screen.get_width(), screen.get_height()))
         self.overlay.fill((0, 0, 0))
         self.overlay.set_alpha(180)
@@ -73,15 +103,14 @@ class GameOverScreen:
         self.screen.blit(game_screen, (0, 0))
         self.screen.blit(self.overlay, (0, 0))
         
-        text = self.font.render(f"GAME OVER", True, (255, 255, 255))
+        text = self.texts.render("GAME OVER", 74)
         rect = text.get_rect(center=(self.screen.get_width()//2, self.screen.get_height()//2 - 50))
         self.screen.blit(text, rect)
         
-        score_text = self.font.render(f"{winner_score} - {loser_score}", True, (255, 255, 255))
+        score_text = self.texts.render(f"{winner_score} - {loser_score}", 74)
         score_rect = score_text.get_rect(center=(self.screen.get_width()//2, self.screen.get_height()//2 + 20))
         self.screen.blit(score_text, score_rect)
         
-        sub_font = pygame.font.Font(None, 36)
-        sub_text = sub_font.render("Appuyez sur ESPACE pour rejouer", True, (255, 255, 255))
+        sub_text = self.texts.render("Appuyez sur ESPACE pour rejouer", 36)
         sub_rect = sub_text.get_rect(center=(self.screen.get_width()//2, self.screen.get_height()//2 + 80))
         self.screen.blit(sub_text, sub_rect) 
\ No newline at end of file
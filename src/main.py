@@ -1,12 +1,20 @@
 import sys
+import time
+import random
+import argparse
+import multiprocessing as mp
 from typing import Tuple
 import pygame
 import math
 pygame.init()  # Initialisation de pygame avant d'importer les autres modules
 
 from elements import Paddle, Ball
-from game_states import GameState, Menu, PauseScreen, GameOverScreen
+from physics import step_ball
+from game_states import GameState, Menu, PauseScreen, GameOverScreen, text_cache
 from ai import SimpleAI
+from numpy_policy import DQNPolicy, load_model
+from controllers import AsyncController, NONE, UP, DOWN
+from recording import Recorder, events_mask
 from stats import StatsManager
 
 # Constantes
@@ -16,22 +24,58 @@ FPS = 60
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
 WINNING_SCORE = 5
+MAX_HEADLESS_FRAMES = 360000  # Une heure de jeu simulé : borne contre un échange sans fin
 
 class Game:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-        pygame.display.set_caption("AI Pong Battle")
-        self.clock = pygame.time.Clock()
+    def __init__(self, headless=False, seed=None, stats_dir="stats", verbose=True, left="simple", right="simple",
+                 async_ai=False, latency_budget=0.008, record=None, record_compress=False):
+        # Mode headless : ni fenêtre, ni événements, ni rendu, temps simulé à FPS images par seconde
+        self.headless = headless
+        # IA calculées sur des threads à partir du dernier état publié. Ignoré en headless, où les
+        # parties doivent rester reproductibles et ne jamais attendre une décision
+        self.async_ai = async_ai and not headless
+        self.latency_budget = latency_budget
+        self.ai1 = self.ai2 = None
+        # Enregistrement frame par frame des parties (relu avec recording.py)
+        self.recorder = None
+        if record is not None:
+            self.recorder = Recorder(record, compress=record_compress,
+                                     metadata={"source": "game", "seed": seed, "left": left, "right": right})
+        # Contrôle de chaque raquette : "simple" (SimpleAI) ou chemin d'un modèle (.npz NumPy, .pth torch),
+        # chargé une seule fois pour toutes les parties
+        self.players = [None if spec == "simple" else load_model(spec) for spec in (left, right)]
+        self.verbose = verbose
+        self.frame = 0
+        self.rng = random.Random(seed)
         self.running = True
+        self.last_stats = None
         
-        # États de jeu
-        self.state = GameState.MENU
-        self.menu = Menu(self.screen)
-        self.pause_screen = PauseScreen(self.screen)
-        self.game_over_screen = GameOverScreen(self.screen)
-        
-        # Gestionnaire de stats
-        self.stats_manager = StatsManager()
+        if headless:
+            self.screen = None
+            self.state = GameState.PLAYING
+            # Horodatage des stats : départ réel puis temps simulé
+            epoch = time.time()
+            self.stats_manager = StatsManager(stats_dir, clock=lambda: epoch + self.current_time())
+        else:
+            self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+            pygame.display.set_caption("AI Pong Battle")
+            self.clock = pygame.time.Clock()
+            
+            # États de jeu
+            self.state = GameState.MENU
+            self.menu = Menu(self.screen)
+            self.pause_screen = PauseScreen(self.screen)
+            self.game_over_screen = GameOverScreen(self.screen)
+
+            # Fond précomposé (ligne centrale comprise) et zones dessinées à la frame précédente
+            self.background = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
+            self.background.fill(BLACK)
+            pygame.draw.aaline(self.background, WHITE, (WINDOW_WIDTH//2, 0), (WINDOW_WIDTH//2, WINDOW_HEIGHT))
+            self.previous_rects = []
+            self.drawn_view = None  # Vue actuellement affichée : None force un rendu complet
+            
+            # Gestionnaire de stats
+            self.stats_manager = StatsManager(stats_dir)
         
         self.init_game()
 
@@ -39,14 +83,46 @@ class Game:
         # Création des éléments
         self.paddle1 = Paddle(50, WINDOW_HEIGHT//2 - 45)
         self.paddle2 = Paddle(WINDOW_WIDTH - 65, WINDOW_HEIGHT//2 - 45)
-        self.ball = Ball(WINDOW_WIDTH//2, WINDOW_HEIGHT//2)
+        self.ball = Ball(WINDOW_WIDTH//2, WINDOW_HEIGHT//2, rng=random.Random(self.rng.random()))
         # Création des IA
-        self.ai1 = SimpleAI(self.paddle1, difficulty=0.2)
-        self.ai2 = SimpleAI(self.paddle2, difficulty=0.2)
+        self.close_controllers()
+        self.ai1 = self.make_controller(self.players[0], self.paddle1, self.paddle2)
+        self.ai2 = self.make_controller(self.players[1], self.paddle2, self.paddle1)
         # Stats
         self.stats_manager.start_game()
+        if self.recorder is not None:
+            self.recorder.mark_rally()
         # Capture de l'écran pour le pause/game over
-        self.game_screen = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        if not self.headless:
+            self.game_screen = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        
+    def make_controller(self, model, paddle, opponent):
+        rng = random.Random(self.rng.random())  # Tiré dans tous les cas : même suite de parties par graine
+        if model is None:
+            controller = SimpleAI(paddle, difficulty=0.2, rng=rng)
+        else:
+            controller = DQNPolicy(paddle, opponent, model)
+        if self.async_ai:
+            return AsyncController(controller, self.latency_budget)
+        return controller
+
+    def close_controllers(self):
+        """Arrête les threads des IA asynchrones et affiche leurs échéances manquées"""
+        for player, ai in (("Joueur 1", self.ai1), ("Joueur 2", self.ai2)):
+            if not isinstance(ai, AsyncController):
+                continue
+            ai.close()
+            stats = ai.stats()
+            if self.verbose and stats["frames"]:
+                latency = stats["latency_ms"]
+                print(f"IA {player} : {stats['missed']}/{stats['frames']} décisions manquées ({stats['missed_rate']:.1%}), "
+                      f"latence moyenne {latency['mean']:.2f} ms, p99 {latency['p99']:.2f} ms")
+
+    def current_time(self):
+        """Temps de jeu en secondes : horloge pygame, ou nombre de frames simulées en headless"""
+        if self.headless:
+            return self.frame / FPS
+        return pygame.time.get_ticks() / 1000.0
 
     def handle_events(self):
         for event in pygame.event.get():
@@ -80,7 +156,8 @@ class Game:
         if self.state != GameState.PLAYING:
             return
 
-        current_time = pygame.time.get_ticks() / 1000.0
+        self.frame += 1
+        current_time = self.current_time()
 
         # Position des raquettes avant mise à jour
         old_pos1 = self.paddle1.rect.centery
@@ -94,25 +171,17 @@ class Game:
         reaction_time1 = abs(self.paddle1.rect.centery - old_pos1) / self.paddle1.speed if old_pos1 != self.paddle1.rect.centery else 0
         reaction_time2 = abs(self.paddle2.rect.centery - old_pos2) / self.paddle2.speed if old_pos2 != self.paddle2.rect.centery else 0
 
-        # Mouvement de la balle
-        old_speed = math.sqrt(self.ball.speed_x**2 + self.ball.speed_y**2)
-        self.ball.move()
+        # Mouvement de la balle, murs et raquettes
+        result = step_ball(self.ball, self.paddle1, self.paddle2, WINDOW_HEIGHT, WINDOW_WIDTH)
 
-        # Collisions avec les murs
-        if self.ball.rect.top <= 0 or self.ball.rect.bottom >= WINDOW_HEIGHT:
-            self.ball.bounce("y")
-
-        # Collisions avec les raquettes
-        if self.ball.rect.colliderect(self.paddle1.rect):
-            self.ball.bounce("x", self.paddle1)
+        if result.left_hit:
             # Log du hit pour player 1
             ball_speed = math.sqrt(self.ball.speed_x**2 + self.ball.speed_y**2)
             accuracy = abs(self.ball.rect.centery - self.paddle1.rect.centery) / (self.paddle1.rect.height / 2)
             accuracy = max(0, 1 - accuracy)  # 1 = parfait, 0 = bord de la raquette
             self.stats_manager.log_hit("player1", ball_speed, reaction_time1, accuracy)
             
-        elif self.ball.rect.colliderect(self.paddle2.rect):
-            self.ball.bounce("x", self.paddle2)
+        elif result.right_hit:
             # Log du hit pour player 2
             ball_speed = math.sqrt(self.ball.speed_x**2 + self.ball.speed_y**2)
             accuracy = abs(self.ball.rect.centery - self.paddle2.rect.centery) / (self.paddle2.rect.height / 2)
@@ -120,18 +189,42 @@ class Game:
             self.stats_manager.log_hit("player2", ball_speed, reaction_time2, accuracy)
 
         # Points
-        if self.ball.rect.left <= 0:
+        if result.left_missed:
             self.paddle2.score += 1
             self.stats_manager.log_score("player2")
             self.ball.reset(WINDOW_WIDTH//2, WINDOW_HEIGHT//2)
-        elif self.ball.rect.right >= WINDOW_WIDTH:
+        elif result.right_missed:
             self.paddle1.score += 1
             self.stats_manager.log_score("player1")
             self.ball.reset(WINDOW_WIDTH//2, WINDOW_HEIGHT//2)
 
+        if self.recorder is not None:
+            self.record_frame(result, old_pos1, old_pos2)
+
         # Vérification de la victoire
         if self.paddle1.score >= WINNING_SCORE or self.paddle2.score >= WINNING_SCORE:
-            stats = self.stats_manager.end_game()
+            self.end_game()
+
+    def record_frame(self, result, old_pos1, old_pos2):
+        """Enregistre l'état affiché de la frame, actions déduites du mouvement des raquettes"""
+        actions = [UP if paddle.rect.centery < old else DOWN if paddle.rect.centery > old else NONE
+                   for paddle, old in ((self.paddle1, old_pos1), (self.paddle2, old_pos2))]
+        events = events_mask(result.left_hit, result.right_hit, result.left_missed, result.right_missed)
+        self.recorder.record(self.ball, self.paddle1, self.paddle2, actions[0], actions[1], events,
+                             self.paddle1.score, self.paddle2.score, self.ball.hits)
+        if result.left_missed or result.right_missed:
+            self.recorder.mark_rally()
+
+    def close(self):
+        self.close_controllers()
+        self.stats_manager.close()
+        if self.recorder is not None:
+            self.recorder.close()
+
+    def end_game(self):
+        stats = self.last_stats = self.stats_manager.end_game()
+        self.state = GameState.GAME_OVER
+        if self.verbose:
             print(f"\nStats de la partie :")
             print(f"Durée : {stats.duration:.1f}s")
             print(f"Score : {stats.player1_score} - {stats.player2_score}")
@@ -142,38 +235,54 @@ class Game:
             print(f"Vitesse max de la balle : {stats.ball_speed_max:.1f}")
             print(f"Précision Joueur 1 : {stats.player1_accuracy:.1f}%")
             print(f"Précision Joueur 2 : {stats.player2_accuracy:.1f}%")
-            self.state = GameState.GAME_OVER
 
-    def draw_game(self):
-        self.screen.fill(BLACK)
-        
+    def draw_game(self, full=False):
+        """Dessine la frame de jeu et renvoie les zones de l'écran à mettre à jour"""
+        if full:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            # Efface la frame précédente en restaurant le fond sous ses seuls éléments
+            for rect in self.previous_rects:
+                self.screen.blit(self.background, rect, rect)
+
         # Dessiner les éléments
-        self.paddle1.draw(self.screen)
-        self.paddle2.draw(self.screen)
-        self.ball.draw(self.screen)
-
-        # Afficher les scores
-        font = pygame.font.Font(None, 74)
-        score1 = font.render(str(self.paddle1.score), True, WHITE)
-        score2 = font.render(str(self.paddle2.score), True, WHITE)
-        self.screen.blit(score1, (WINDOW_WIDTH//4, 20))
-        self.screen.blit(score2, (3*WINDOW_WIDTH//4, 20))
-
-        # Afficher le nombre de rebonds
-        hits_font = pygame.font.Font(None, 36)
-        hits_text = hits_font.render(f"Rebonds: {self.ball.hits}", True, WHITE)
-        self.screen.blit(hits_text, (WINDOW_WIDTH//2 - 50, 20))
-
-        # Ligne centrale
+        rects = [self.paddle1.draw(self.screen), self.paddle2.draw(self.screen), self.ball.draw(self.screen)]
+
+        # Scores et nombre de rebonds : surfaces mémorisées, rendues seulement quand la valeur change
+        score1 = text_cache.render(str(self.paddle1.score), 74, WHITE)
+        score2 = text_cache.render(str(self.paddle2.score), 74, WHITE)
+        hits_text = text_cache.render(f"Rebonds: {self.ball.hits}", 36, WHITE)
+        rects.append(self.screen.blit(score1, (WINDOW_WIDTH//4, 20)))
+        rects.append(self.screen.blit(score2, (3*WINDOW_WIDTH//4, 20)))
+        rects.append(self.screen.blit(hits_text, (WINDOW_WIDTH//2 - 50, 20)))
+
+        # Ligne centrale par-dessus le texte, comme avant
         pygame.draw.aaline(self.screen, WHITE, (WINDOW_WIDTH//2, 0), (WINDOW_WIDTH//2, WINDOW_HEIGHT))
 
+        dirty = self.previous_rects + rects
+        self.previous_rects = rects
+        return dirty
+
     def draw(self):
+        if self.state == GameState.PLAYING:
+            if self.drawn_view == GameState.PLAYING:
+                pygame.display.update(self.draw_game())
+            else:
+                self.draw_game(full=True)
+                pygame.display.flip()
+                self.drawn_view = GameState.PLAYING
+            return
+
+        # Menu, pause et game over sont statiques : rendus seulement quand ce qu'ils affichent change
+        view = (self.state, self.menu.selected, self.paddle1.score, self.paddle2.score)
+        if view == self.drawn_view:
+            return
+        if self.drawn_view == GameState.PLAYING:
+            # Capture de la dernière frame de jeu pour pause/game over
+            self.game_screen.blit(self.screen, (0, 0))
+
         if self.state == GameState.MENU:
             self.menu.draw()
-        elif self.state == GameState.PLAYING:
-            self.draw_game()
-            # Capture l'écran pour pause/game over
-            self.game_screen.blit(self.screen, (0, 0))
         elif self.state == GameState.PAUSED:
             self.pause_screen.draw(self.game_screen)
         elif self.state == GameState.GAME_OVER:
@@ -182,6 +291,19 @@ class Game:
             self.game_over_screen.draw(self.game_screen, winner_score, loser_score)
 
         pygame.display.flip()
+        self.drawn_view = view
+
+    def play_match(self, max_frames=MAX_HEADLESS_FRAMES):
+        """Joue une partie complète aussi vite que possible (mode headless) et renvoie ses GameStats"""
+        if self.state != GameState.PLAYING:
+            self.init_game()
+            self.state = GameState.PLAYING
+        start_frame = self.frame
+        while self.state == GameState.PLAYING:
+            self.update()
+            if self.frame - start_frame >= max_frames and self.state == GameState.PLAYING:
+                self.end_game()  # Partie arrêtée au score courant
+        return self.last_stats
 
     def run(self):
         while self.running:
@@ -190,9 +312,53 @@ class Game:
             self.draw()
             self.clock.tick(FPS)
         
+        self.close()
         pygame.quit()
         sys.exit()
 
+def _play_headless(seed, stats_dir, left="simple", right="simple"):
+    game = Game(headless=True, seed=seed, stats_dir=stats_dir, verbose=False, left=left, right=right)
+    try:
+        return game.play_match()
+    finally:
+        game.close()
+
+def run_headless_matches(num_matches, processes=None, seed=0, stats_dir="stats", left="simple", right="simple"):
+    """Joue num_matches parties headless (graines seed, seed+1, ...), réparties sur plusieurs processus"""
+    seeds = range(seed, seed + num_matches)
+    if processes == 1:
+        return [_play_headless(s, stats_dir, left, right) for s in seeds]
+    # pygame.init() fait intercepter SIGTERM par SDL dans les workers : Pool.terminate() ne les
+    # arrêterait pas, on les laisse donc se terminer normalement avec close() puis join()
+    pool = mp.get_context("spawn").Pool(processes)
+    try:
+        return pool.starmap(_play_headless, [(s, stats_dir, left, right) for s in seeds])
+    finally:
+        pool.close()
+        pool.join()
+
 if __name__ == "__main__":
-    game = Game()
-    game.run() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="AI Pong Battle")
+    parser.add_argument("--headless", type=int, metavar="N", help="Joue N parties sans affichage, en temps simulé")
+    parser.add_argument("--processes", type=int, help="Processus pour les parties headless (tous les coeurs par défaut)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--left", default="simple", help="Raquette de gauche : simple, modèle .npz (NumPy) ou .pth (torch)")
+    parser.add_argument("--right", default="simple", help="Raquette de droite : simple, modèle .npz (NumPy) ou .pth (torch)")
+    parser.add_argument("--async-ai", action="store_true", help="Calcule les IA sur des threads, hors de la boucle de rendu")
+    parser.add_argument("--latency-budget", type=float, default=8.0, help="Délai maximal d'une décision d'IA asynchrone (ms)")
+    parser.add_argument("--record", metavar="FICHIER", help="Enregistre la partie interactive (relecture : python recording.py FICHIER)")
+    parser.add_argument("--compress", action="store_true", help="Compresse l'enregistrement (zlib)")
+    args = parser.parse_args()
+    
+    if args.headless:
+        start = time.time()
+        results = run_headless_matches(args.headless, args.processes, args.seed, left=args.left, right=args.right)
+        elapsed = time.time() - start
+        simulated = sum(stats.duration for stats in results)
+        wins = sum(stats.player1_score > stats.player2_score for stats in results)
+        print(f"{len(results)} parties en {elapsed:.1f}s ({simulated / max(elapsed, 1e-9):.0f}x le temps réel)")
+        print(f"Victoires joueur 1 : {wins} / {len(results)}")
+    else:
+        game = Game(left=args.left, right=args.right, async_ai=args.async_ai, latency_budget=args.latency_budget / 1000,
+                    record=args.record, record_compress=args.compress)
+        game.run() 
\ No newline at end of file
@@ -0,0 +1,227 @@
+import math
+from collections import deque
+import numpy as np
+
+
+class RollingWindow:
+    """Fenêtre glissante sur les size dernières valeurs : moyenne, min et max en O(1) amorti"""
+
+    def __init__(self, size):
+        self.size = size
+        self.values = np.zeros(size)
+        self.count = 0
+        self.total = 0.0
+        # Files monotones (indice, valeur) pour le min et le max de la fenêtre
+        self._min = deque()
+        self._max = deque()
+
+    def update(self, value):
+        i = self.count
+        slot = i % self.size
+        if i >= self.size:
+            self.total -= self.values[slot]
+        self.values[slot] = value
+        self.total += value
+        self.count += 1
+
+        # Somme recalculée à chaque tour complet pour éviter la dérive des flottants
+        if self.count % self.size == 0:
+            self.total = float(self.values.sum())
+
+        oldest = i - self.size + 1
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        for queue in (self._min, self._max):
+            queue.append((i, value))
+            if queue[0][0] < oldest:
+                queue.popleft()
+
+    def __len__(self):
+        return min(self.count, self.size)
+
+    @property
+    def mean(self):
+        return self.total / len(self) if self.count else math.nan
+
+    @property
+    def min(self):
+        return self._min[0][1] if self.count else math.nan
+
+    @property
+    def max(self):
+        return self._max[0][1] if self.count else math.nan
+
+    def percentile(self, q):
+        """Percentile exact de la fenêtre (calculé à la demande, O(size))"""
+        if not self.count:
+            return math.nan
+        return float(np.percentile(self.values[:len(self)], q))
+
+
+class P2Quantile:
+    """Estimation d'un quantile sur tout l'historique en mémoire constante (algorithme P² de Jain et Chlamtac)"""
+
+    def __init__(self, q):
+        self.q = q
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5]
+        self.increments = [0, q / 2, q, (1 + q) / 2, 1]
+
+    def update(self, value):
+        heights = self.heights
+        if len(heights) < 5:
+            heights.append(value)
+            heights.sort()
+            return
+
+        # Cellule de la nouvelle valeur, en élargissant les extrêmes si besoin
+        if value < heights[0]:
+            heights[0] = value
+            k = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            k = 3
+        else:
+            k = next(i for i in range(4) if heights[i] <= value < heights[i + 1])
+
+        positions = self.positions
+        for i in range(k + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Ajustement des trois marqueurs centraux (interpolation parabolique, sinon linéaire)
+        for i in range(1, 4):
+            d = self.desired[i] - positions[i]
+            if (d >= 1 and positions[i + 1] - positions[i] > 1) or (d <= -1 and positions[i - 1] - positions[i] < -1):
+                d = 1 if d > 0 else -1
+                candidate = heights[i] + d / (positions[i + 1] - positions[i - 1]) * (
+                    (positions[i] - positions[i - 1] + d) * (heights[i + 1] - heights[i]) / (positions[i + 1] - positions[i])
+                    + (positions[i + 1] - positions[i] - d) * (heights[i] - heights[i - 1]) / (positions[i] - positions[i - 1])
+                )
+                if not heights[i - 1] < candidate < heights[i + 1]:
+                    candidate = heights[i] + d * (heights[i + d] - heights[i]) / (positions[i + d] - positions[i])
+                heights[i] = candidate
+                positions[i] += d
+
+    @property
+    def value(self):
+        heights = self.heights
+        if not heights:
+            return math.nan
+        if len(heights) < 5:
+            return float(np.percentile(heights, self.q * 100))
+        return heights[2]
+
+
+class ChunkedHistory:
+    """Historique borné en blocs NumPy : quand il est plein, la résolution est divisée par deux (moyenne par paires)"""
+
+    def __init__(self, chunk_size=1024, max_chunks=64, dtype=np.float32):
+        if max_chunks % 2:
+            raise ValueError("max_chunks doit être pair")
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self.dtype = dtype
+        self.chunks = []
+        self.current = np.empty(chunk_size, dtype=dtype)
+        self.filled = 0
+        self.stride = 1  # Nombre de valeurs d'origine par point stocké
+        self._pending = 0.0
+        self._pending_count = 0
+
+    def append(self, value):
+        # Avec stride > 1, on stocke la moyenne de stride valeurs consécutives
+        self._pending += value
+        self._pending_count += 1
+        if self._pending_count < self.stride:
+            return
+        self.current[self.filled] = self._pending / self.stride
+        self._pending = 0.0
+        self._pending_count = 0
+        self.filled += 1
+        if self.filled == self.chunk_size:
+            self.chunks.append(self.current)
+            self.current = np.empty(self.chunk_size, dtype=self.dtype)
+            self.filled = 0
+            if len(self.chunks) == self.max_chunks:
+                self._compact()
+
+    def _compact(self):
+        """Fusionne les points deux à deux : la mémoire reste bornée sur un entraînement sans fin"""
+        merged = np.concatenate(self.chunks).reshape(-1, 2).mean(axis=1).astype(self.dtype)
+        self.chunks = list(merged.reshape(-1, self.chunk_size))
+        self.stride *= 2
+
+    def values(self):
+        """Renvoie (épisodes, valeurs) : indices (depuis 0) du milieu de chaque point stocké"""
+        stored = np.concatenate(self.chunks + [self.current[:self.filled]])
+        x = np.arange(len(stored)) * self.stride + (self.stride - 1) / 2
+        return x, stored
+
+    def __len__(self):
+        return (len(self.chunks) * self.chunk_size + self.filled) * self.stride + self._pending_count
+
+
+class Metric:
+    """Statistiques d'une grandeur par épisode : fenêtre glissante, EMA, extrêmes, quantiles et historique borné"""
+
+    def __init__(self, window=100, ema_alpha=0.01, quantiles=(0.5, 0.9), chunk_size=1024, max_chunks=64):
+        self.window = RollingWindow(window)
+        self.ema_alpha = ema_alpha
+        self.ema = math.nan
+        self.last = math.nan
+        self.min = math.inf
+        self.max = -math.inf
+        self.quantiles = {q: P2Quantile(q) for q in quantiles}
+        self.history = ChunkedHistory(chunk_size, max_chunks)
+
+    def update(self, value):
+        value = float(value)
+        self.last = value
+        self.window.update(value)
+        self.ema = value if math.isnan(self.ema) else self.ema + self.ema_alpha * (value - self.ema)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        for quantile in self.quantiles.values():
+            quantile.update(value)
+        self.history.append(value)
+
+    @property
+    def mean(self):
+        """Moyenne de la fenêtre glissante"""
+        return self.window.mean
+
+    def quantile(self, q):
+        """Quantile estimé sur tout l'historique (q parmi ceux donnés au constructeur)"""
+        return self.quantiles[q].value
+
+    def summary(self):
+        return {
+            "last": self.last, "mean": self.mean, "ema": self.ema,
+            "window_min": self.window.min, "window_max": self.window.max,
+            "min": self.min, "max": self.max,
+            **{f"p{int(q * 100)}": quantile.value for q, quantile in self.quantiles.items()},
+        }
+
+
+class MetricsTracker:
+    """Ensemble de Metric indexées par nom, mises à jour ensemble à chaque fin d'épisode"""
+
+    def __init__(self, names=("score", "loss", "length", "hits"), window=100, **kwargs):
+        self.metrics = {name: Metric(window, **kwargs) for name in names}
+
+    def update(self, **values):
+        """Met à jour les grandeurs fournies (les valeurs None sont ignorées)"""
+        for name, value in values.items():
+            if value is not None:
+                self.metrics[name].update(value)
+
+    def __getitem__(self, name):
+        return self.metrics[name]
+
+    def summary(self):
+        return {name: metric.summary() for name, metric in self.metrics.items()}
@@ -0,0 +1,161 @@
+import os
+import time
+import json
+import argparse
+import numpy as np
+from physics import WINDOW_WIDTH, WINDOW_HEIGHT
+from controllers import apply_action
+
+# Inférence du DQN sans torch : le jeu démarre en quelques dizaines de ms et ne charge pas torch en mémoire.
+# torch n'est importé que pour l'export et pour la comparaison avec le chemin torch.
+
+# Couches de chaque variante de réseau, dans l'ordre du forward (noms du state_dict de q_agent.DQN)
+LAYERS = {
+    False: ("network.0", "network.2", "network.4"),
+    True: ("features.0", "features.2", "value", "advantage"),
+}
+
+
+def export_npz(checkpoint_path, npz_path):
+    """Convertit un checkpoint (complet ou export d'inférence) en .npz des poids du réseau principal"""
+    import torch
+    checkpoint = torch.load(checkpoint_path, map_location="cpu")
+    config = checkpoint.get('config', {})
+    state_dict = checkpoint['model_state_dict']
+    arrays = {}
+    for layer in LAYERS[bool(config.get('dueling', False))]:
+        # Poids transposés : le forward calcule x @ W + b sans copie
+        arrays[f"{layer}.weight"] = np.ascontiguousarray(state_dict[f"{layer}.weight"].float().numpy().T)
+        arrays[f"{layer}.bias"] = state_dict[f"{layer}.bias"].float().numpy()
+    np.savez(npz_path, config=np.array(json.dumps(config)), **arrays)
+    return npz_path
+
+
+class NumpyDQN:
+    """Même forward que q_agent.DQN, en NumPy float32"""
+
+    def __init__(self, arrays, config=None):
+        self.config = config or {}
+        self.dueling = bool(self.config.get('dueling', False))
+        self.layers = [(arrays[f"{layer}.weight"], arrays[f"{layer}.bias"]) for layer in LAYERS[self.dueling]]
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            config = json.loads(str(data["config"]))
+            arrays = {name: data[name].astype(np.float32, copy=False) for name in data.files if name != "config"}
+        return cls(arrays, config)
+
+    def __call__(self, x):
+        """Q-valeurs d'un batch d'observations (n, 6)"""
+        (w1, b1), (w2, b2) = self.layers[:2]
+        h = np.maximum(x @ w1 + b1, 0)
+        h = np.maximum(h @ w2 + b2, 0)
+        if not self.dueling:
+            w3, b3 = self.layers[2]
+            return h @ w3 + b3
+        (wv, bv), (wa, ba) = self.layers[2:]
+        advantage = h @ wa + ba
+        return h @ wv + bv + advantage - advantage.mean(1, keepdims=True)
+
+
+def load_torch_model(path):
+    """Chemin torch équivalent (pour comparaison) : même interface observations -> Q-valeurs"""
+    import torch
+    from q_agent import DQN, AgentConfig
+    checkpoint = torch.load(path, map_location="cpu")
+    config = AgentConfig(**checkpoint.get('config', {}))
+    model = DQN(6, 3, config.hidden_size, config.dueling)
+    model.load_state_dict({name: tensor.float() for name, tensor in checkpoint['model_state_dict'].items()})
+    model.eval()
+
+    def forward(x):
+        with torch.no_grad():
+            return model(torch.from_numpy(x)).numpy()
+    return forward
+
+
+def load_model(path):
+    """Politique NumPy pour un .npz, torch pour un checkpoint .pth"""
+    if path.endswith(".npz"):
+        return NumpyDQN.load(path)
+    return load_torch_model(path)
+
+
+class DQNPolicy:
+    """Contrôleur de raquette piloté par un DQN entraîné, interchangeable avec SimpleAI dans Game.
+
+    Le réseau a été entraîné sur la raquette de gauche : pour celle de droite, l'observation
+    est vue en miroir (axe x inversé, raquettes échangées).
+    """
+
+    def __init__(self, paddle, opponent, model):
+        self.paddle = paddle
+        self.opponent = opponent
+        self.model = model
+        rect = paddle.rect
+        self.mirrored = rect.x + rect.width / 2 > WINDOW_WIDTH / 2
+        self.observation = np.zeros((1, 6), dtype=np.float32)
+
+    def observe(self, ball):
+        """Même normalisation que PongEnv._get_observation"""
+        ball_rect = ball.rect
+        half_width = WINDOW_WIDTH / 2
+        half_height = WINDOW_HEIGHT / 2
+        sign = -1 if self.mirrored else 1
+        paddle, opponent = self.paddle.rect, self.opponent.rect
+        self.observation[0] = (
+            sign * ((ball_rect.x + ball_rect.width / 2) / half_width - 1),
+            (ball_rect.y + ball_rect.height / 2) / half_height - 1,
+            sign * ball.speed_x / ball.max_speed,
+            ball.speed_y / ball.max_speed,
+            (paddle.y + paddle.height / 2) / half_height - 1,
+            (opponent.y + opponent.height / 2) / half_height - 1,
+        )
+        return self.observation
+
+    def update(self, ball, current_time):
+        apply_action(self.paddle, self.decide(ball, current_time))
+
+    def decide(self, ball, current_time):
+        # Actions de PongEnv : 0 = ne bouge pas, 1 = monte, 2 = descend
+        return int(self.model(self.observe(ball)).argmax())
+
+
+def compare_latency(checkpoint_path, npz_path, frames=10000):
+    """Temps de chargement et latence par frame des chemins NumPy et torch.
+
+    À lancer dans un processus neuf : le chargement torch inclut l'import de torch.
+    """
+    observations = np.random.default_rng(0).uniform(-1, 1, (frames, 1, 6)).astype(np.float32)
+    results = {}
+    for name, path in (("numpy", npz_path), ("torch", checkpoint_path)):
+        start = time.perf_counter()
+        model = load_model(path)
+        load_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for observation in observations:
+            int(model(observation).argmax())
+        results[name] = {"load_ms": load_time * 1e3, "frame_us": (time.perf_counter() - start) / frames * 1e6}
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export et inférence NumPy des politiques DQN")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export", help="Checkpoint .pth -> poids .npz")
+    export_parser.add_argument("checkpoint")
+    export_parser.add_argument("output", nargs="?", help="Par défaut : même nom en .npz")
+    bench_parser = subparsers.add_parser("bench", help="Compare chargement et latence NumPy / torch")
+    bench_parser.add_argument("checkpoint")
+    bench_parser.add_argument("npz")
+    bench_parser.add_argument("--frames", type=int, default=10000)
+    args = parser.parse_args()
+
+    if args.command == "export":
+        output = args.output or os.path.splitext(args.checkpoint)[0] + ".npz"
+        export_npz(args.checkpoint, output)
+        print(f"{args.checkpoint} -> {output} ({os.path.getsize(output) / 1024:.0f} Ko)")
+    else:
+        for name, result in compare_latency(args.checkpoint, args.npz, args.frames).items():
+            print(f"{name:6s} chargement {result['load_ms']:>8.1f} ms   {result['frame_us']:>7.1f} µs/frame")
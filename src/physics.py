@@ -0,0 +1,200 @@
+import math
+import random
+from typing import NamedTuple, Optional, Tuple
+
+# Dimensions du terrain et des éléments
+WINDOW_WIDTH = 800
+WINDOW_HEIGHT = 600
+PADDLE_WIDTH = 15
+PADDLE_HEIGHT = 90
+PADDLE_SPEED = 5
+BALL_SIZE = 15
+BALL_BASE_SPEED = 6
+BALL_MAX_SPEED = 12
+BALL_MIN_ANGLE = 15  # Angle minimum en degrés
+BALL_MAX_ANGLE = 60  # Angle max de rebond sur une raquette
+PADDLE_EFFECT = 0.3  # Effet de la raquette en mouvement
+SPEED_UP = 0.4  # Accélération à chaque rebond sur une raquette
+
+# Positions de départ
+LEFT_PADDLE_X = 50
+RIGHT_PADDLE_X = WINDOW_WIDTH - 65
+PADDLE_START_Y = WINDOW_HEIGHT // 2 - 45
+BALL_START_X = WINDOW_WIDTH // 2
+BALL_START_Y = WINDOW_HEIGHT // 2
+
+MAX_SPEED_Y_RATIO = math.tan(math.radians(75))  # Max 75 degrés
+SIN_MIN_ANGLE = math.sin(math.radians(BALL_MIN_ANGLE))
+
+
+class Box:
+    """Rectangle à coordonnées flottantes, même interface que pygame.Rect pour ce dont on a besoin"""
+    __slots__ = ("x", "y", "width", "height")
+
+    def __init__(self, x: float, y: float, width: float, height: float):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+    @property
+    def left(self) -> float:
+        return self.x
+
+    @property
+    def right(self) -> float:
+        return self.x + self.width
+
+    @property
+    def top(self) -> float:
+        return self.y
+
+    @property
+    def bottom(self) -> float:
+        return self.y + self.height
+
+    @property
+    def centerx(self) -> float:
+        return self.x + self.width / 2
+
+    @property
+    def centery(self) -> float:
+        return self.y + self.height / 2
+
+    @property
+    def center(self) -> Tuple[float, float]:
+        return (self.centerx, self.centery)
+
+    def colliderect(self, other: "Box") -> bool:
+        return (self.x < other.x + other.width and other.x < self.x + self.width
+                and self.y < other.y + other.height and other.y < self.y + self.height)
+
+
+class Paddle:
+    def __init__(self, x: float, y: float, width: int = PADDLE_WIDTH, height: int = PADDLE_HEIGHT):
+        self.rect = Box(x, y, width, height)
+        self.speed = PADDLE_SPEED
+        self.score = 0
+        self.movement = 0  # Pour tracker le mouvement de la raquette
+
+    def move(self, up: bool = True):
+        rect = self.rect
+        previous_y = rect.y
+        if up and previous_y > 0:
+            rect.y -= self.speed
+        elif not up and previous_y + rect.height < WINDOW_HEIGHT:
+            rect.y += self.speed
+        self.movement = rect.y - previous_y
+
+
+class Ball:
+    def __init__(self, x: float, y: float, size: int = BALL_SIZE, rng: Optional[random.Random] = None):
+        self.rect = Box(x, y, size, size)
+        self.base_speed = BALL_BASE_SPEED
+        self.speed_x = self.base_speed
+        self.speed_y = 0
+        self.size = size
+        self.max_speed = BALL_MAX_SPEED
+        self.min_angle = BALL_MIN_ANGLE
+        self.hits = 0
+        # Générateur dédié pour rendre la simulation déterministe
+        self.rng = rng if rng is not None else random.Random()
+
+    def move(self):
+        # Assure une vitesse minimale en X
+        if abs(self.speed_x) < self.base_speed:
+            self.speed_x = math.copysign(self.base_speed, self.speed_x)
+
+        # Limite la vitesse Y pour éviter les angles trop verticaux
+        max_speed_y = abs(self.speed_x) * MAX_SPEED_Y_RATIO
+        self.speed_y = max(min(self.speed_y, max_speed_y), -max_speed_y)
+
+        self.rect.x += self.speed_x
+        self.rect.y += self.speed_y
+
+    def bounce(self, axis: str = "y", paddle: Paddle = None):
+        if axis == "y":
+            self.speed_y *= -1
+            # Ajoute une petite perturbation aléatoire sur rebond mur
+            self.speed_y += self.rng.uniform(-0.5, 0.5)
+        else:
+            # Inverse la direction X
+            self.speed_x *= -1
+
+            if paddle:
+                # Calcul de l'angle de rebond basé sur le point d'impact
+                relative_intersect_y = (paddle.rect.centery - self.rect.centery)
+                normalized_intersect = relative_intersect_y / (paddle.rect.height / 2)
+
+                # Assure un angle minimum
+                if abs(normalized_intersect) < SIN_MIN_ANGLE:
+                    normalized_intersect = math.copysign(SIN_MIN_ANGLE, normalized_intersect)
+
+                bounce_angle = math.radians(normalized_intersect * BALL_MAX_ANGLE)
+
+                # Ajout de l'effet de la raquette en mouvement
+                paddle_effect = paddle.movement * PADDLE_EFFECT
+
+                # Conversion en vélocités avec accélération jusqu'à max_speed
+                speed = min(abs(self.speed_x) + SPEED_UP, self.max_speed)
+                self.speed_x = math.copysign(speed * math.cos(bounce_angle), self.speed_x)
+                self.speed_y = speed * -math.sin(bounce_angle) + paddle_effect
+
+                self.hits += 1
+
+    def reset(self, x: float, y: float):
+        self.rect.x = x
+        self.rect.y = y
+        # Réinitialisation avec angle minimum garanti
+        angle = self.rng.uniform(self.min_angle, 45)
+        if self.rng.random() < 0.5:
+            angle = -angle
+
+        self.speed_x = self.base_speed * self.rng.choice([-1, 1])
+        self.speed_y = self.base_speed * math.tan(math.radians(angle))
+        self.hits = 0
+
+
+class StepResult(NamedTuple):
+    """Événements produits par une frame de simulation"""
+    wall_bounce: bool
+    left_hit: bool
+    right_hit: bool
+    left_missed: bool  # La balle sort à gauche : point pour la droite
+    right_missed: bool  # La balle sort à droite : point pour la gauche
+
+
+def move_ball(ball: Ball, height: int = WINDOW_HEIGHT) -> bool:
+    """Mouvement de la balle et rebond sur les murs, renvoie True en cas de rebond"""
+    ball.move()
+
+    # Collisions avec les murs
+    rect = ball.rect
+    wall_bounce = rect.y <= 0 or rect.y + rect.height >= height
+    if wall_bounce:
+        ball.bounce("y")
+    return wall_bounce
+
+
+def collide_paddles(ball: Ball, left: Paddle, right: Paddle, width: int = WINDOW_WIDTH) -> Tuple[bool, bool, bool, bool]:
+    """Rebonds sur les raquettes puis sorties, renvoie (left_hit, right_hit, left_missed, right_missed)"""
+    rect = ball.rect
+    left_hit = rect.colliderect(left.rect)
+    right_hit = False
+    if left_hit:
+        ball.bounce("x", left)
+    else:
+        right_hit = rect.colliderect(right.rect)
+        if right_hit:
+            ball.bounce("x", right)
+
+    # Sorties de terrain
+    left_missed = rect.x <= 0
+    right_missed = not left_missed and rect.x + rect.width >= width
+    return left_hit, right_hit, left_missed, right_missed
+
+
+def step_ball(ball: Ball, left: Paddle, right: Paddle, height: int = WINDOW_HEIGHT, width: int = WINDOW_WIDTH) -> StepResult:
+    """Fait avancer la balle d'une frame : mouvement, murs, raquettes et sorties"""
+    wall_bounce = move_ball(ball, height)
+    return StepResult(wall_bounce, *collide_paddles(ball, left, right, width))
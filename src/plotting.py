@@ -0,0 +1,132 @@
+import threading
+import multiprocessing as mp
+import numpy as np
+from stats_log import StatsReader
+
+
+class BoundedHistory:
+    """Historique de taille bornée : moyennes de paquets de bin_size valeurs consécutives.
+
+    Quand les capacity paquets sont pleins, ils sont fusionnés deux à deux et bin_size
+    double : mémoire constante et coût d'ajout proportionnel aux seules nouvelles valeurs.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = max(2, capacity + capacity % 2)  # Pair : les paquets se fusionnent deux à deux
+        self.sums = np.zeros(self.capacity)
+        self.bins = 0  # Paquets complets
+        self.bin_size = 1
+        self.partial_sum = 0.0  # Paquet en cours de remplissage
+        self.partial_count = 0
+
+    def __len__(self):
+        return self.bins * self.bin_size + self.partial_count
+
+    def _halve(self):
+        half = self.capacity // 2
+        self.sums[:half] = self.sums[0::2] + self.sums[1::2]
+        self.bins = half
+        self.bin_size *= 2
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        while len(values):
+            if self.bins == self.capacity:
+                self._halve()
+            # Complète d'abord le paquet en cours
+            if self.partial_count:
+                take = min(len(values), self.bin_size - self.partial_count)
+                self.partial_sum += values[:take].sum()
+                self.partial_count += take
+                values = values[take:]
+                if self.partial_count == self.bin_size:
+                    self.sums[self.bins] = self.partial_sum
+                    self.bins += 1
+                    self.partial_sum, self.partial_count = 0.0, 0
+                continue
+            # Paquets complets en une opération, dans la limite de la place restante
+            full = min(len(values) // self.bin_size, self.capacity - self.bins)
+            if full:
+                block = values[:full * self.bin_size].reshape(full, self.bin_size)
+                self.sums[self.bins:self.bins + full] = block.sum(1)
+                self.bins += full
+                values = values[full * self.bin_size:]
+            else:
+                self.partial_sum, self.partial_count = values.sum(), len(values)
+                values = values[:0]
+
+    def data(self):
+        """Abscisses (centre de chaque paquet) et moyennes, paquet en cours compris"""
+        x = np.arange(self.bins) * self.bin_size + (self.bin_size - 1) / 2
+        y = self.sums[:self.bins] / self.bin_size
+        if self.partial_count:
+            x = np.append(x, self.bins * self.bin_size + (self.partial_count - 1) / 2)
+            y = np.append(y, self.partial_sum / self.partial_count)
+        return x, y
+
+
+class _Figure:
+    """Figure matplotlib persistante, redessinée en mettant à jour les données des courbes"""
+
+    def __init__(self, filename):
+        # Import paresseux et API objet (pas de pyplot) : utilisable hors du thread principal
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        self.filename = filename
+        self.figure = Figure(figsize=(10, 5))
+        FigureCanvasAgg(self.figure)
+        self.axes = self.figure.add_subplot()
+        self.score_line, = self.axes.plot([], [], label='Score', alpha=0.4)
+        self.avg_line, = self.axes.plot([], [], label='Score moyen (100 épisodes)', linewidth=2)
+        self.axes.set_xlabel('Épisode')
+        self.axes.set_ylabel('Score')
+        self.axes.legend()
+
+    def draw(self, scores, avg_scores):
+        self.score_line.set_data(*scores.data())
+        self.avg_line.set_data(*avg_scores.data())
+        self.axes.relim()
+        self.axes.autoscale_view()
+        self.figure.savefig(self.filename)
+
+
+def run_plotter(stats_path, filename, interval, max_points, stop_event):
+    """Boucle du consommateur : lit les nouvelles lignes du journal et ne redessine que s'il y en a"""
+    reader = StatsReader(stats_path)
+    figure = None
+    # Au plus max_points (+1 paquet en cours) par courbe, quelle que soit la durée de l'entraînement
+    history = {"score": BoundedHistory(max_points), "avg_score": BoundedHistory(max_points)}
+    stopping = False
+    while not stopping:
+        stopping = stop_event.wait(interval)
+        new = reader.read_new(["score", "avg_score"])
+        if len(new["score"]) == 0:
+            continue
+        for field, values in new.items():
+            history[field].extend(values)
+        if figure is None:
+            figure = _Figure(filename)
+        figure.draw(history["score"], history["avg_score"])
+
+
+class ProgressPlotter:
+    """Tracé de la progression en arrière-plan à partir du journal de stats (thread ou processus séparé)"""
+
+    def __init__(self, stats_path, filename="training_progress.png", interval=30.0, max_points=2000,
+                 use_process=False):
+        if use_process:
+            ctx = mp.get_context("spawn")
+            self.stop_event = ctx.Event()
+            self.worker = ctx.Process(target=run_plotter, daemon=True,
+                                      args=(stats_path, filename, interval, max_points, self.stop_event))
+        else:
+            self.stop_event = threading.Event()
+            self.worker = threading.Thread(target=run_plotter, daemon=True, name="progress-plotter",
+                                           args=(stats_path, filename, interval, max_points, self.stop_event))
+        self.worker.start()
+
+    def close(self, timeout=30):
+        """Dernier tracé avec les données déjà écrites puis arrêt"""
+        self.stop_event.set()
+        self.worker.join(timeout)
@@ -1,14 +1,33 @@
 import gymnasium as gym
 import numpy as np
 from gymnasium import spaces
-import pygame
-from elements import Ball, Paddle
+import random
+import time
+from physics import (Ball, Paddle, move_ball, collide_paddles, WINDOW_WIDTH, WINDOW_HEIGHT, PADDLE_SPEED,
+                     LEFT_PADDLE_X, RIGHT_PADDLE_X, PADDLE_START_Y, BALL_START_X, BALL_START_Y)
+from trajectory import predict_intercept, RIGHT_CONTACT_X
+from profiler import Profiler
+from recording import events_mask
+
+# Nombre de tirages du bruit de l'adversaire générés d'un coup
+NOISE_BLOCK_SIZE = 4096
+
+# Comportements de l'adversaire : suit la balle ou vise le point d'impact prédit
+OPPONENT_MODES = ("tracker", "predictive")
+
+# Phases mesurées par le mode profile
+PROFILE_PHASES = ("agent", "opponent", "physics", "collision", "reward")
 
 class PongEnv(gym.Env):
     metadata = {"render_modes": ["human"], "render_fps": 60}
 
-    def __init__(self, opponent_difficulty=0.2):
+    def __init__(self, opponent_difficulty=0.2, profile=False, opponent_mode="tracker", profiler=None,
+                 frame_skip=1, max_pool=False, recorder=None):
         super().__init__()
+        if opponent_mode not in OPPONENT_MODES:
+            raise ValueError(f"opponent_mode inconnu : {opponent_mode}")
+        if frame_skip < 1:
+            raise ValueError(f"frame_skip doit être >= 1 : {frame_skip}")
         
         # Espace d'observation : [ball_x, ball_y, ball_vx, ball_vy, paddle_y, opponent_y]
         # Normalisé entre -1 et 1
@@ -22,98 +41,196 @@ class PongEnv(gym.Env):
         self.action_space = spaces.Discrete(3)
         
         # Setup du jeu
-        self.window_width = 800
-        self.window_height = 600
-        self.paddle_speed = 5
+        self.window_width = WINDOW_WIDTH
+        self.window_height = WINDOW_HEIGHT
+        self.paddle_speed = PADDLE_SPEED
         self.opponent_difficulty = opponent_difficulty
+        self.opponent_mode = opponent_mode
+        
+        # Répétition d'action : un step joue frame_skip frames de physique avec la même action,
+        # récompenses cumulées. max_pool renvoie le maximum des deux dernières observations
+        self.frame_skip = frame_skip
+        self.max_pool = max_pool
+        
+        # recording.Recorder optionnel : chaque frame de physique est enregistrée, un épisode par échange
+        self.recorder = recorder
+        self.action = 0
+        self.opponent_action = 0
+        
+        # Générateur de la physique (rebonds sur les murs), ré-initialisable via reset(seed)
+        self.rng = random.Random()
         
-        # Initialisation de pygame si pas déjà fait
-        if not pygame.get_init():
-            pygame.init()
+        # Bruit de l'adversaire tiré par blocs depuis self.np_random (graine de reset)
+        self._noise = []
+        self._noise_index = 0
+        
+        # Mode profile : temps de chaque phase du step dans le profiler (partagé avec train() s'il est fourni)
+        self.profiler = profiler if profiler is not None else Profiler(enabled=profile)
+        self.profile = self.profiler.enabled
         
         self.reset()
         
     def reset(self, seed=None):
         super().reset(seed=seed)
+        if seed is not None:
+            self.rng.seed(seed)
+            # Nouveau générateur : on jette le bloc de bruit déjà tiré
+            self._noise = []
+            self._noise_index = 0
         
         # Reset des éléments du jeu
-        self.paddle = Paddle(50, self.window_height//2 - 45)
-        self.opponent = Paddle(self.window_width - 65, self.window_height//2 - 45)
-        self.ball = Ball(self.window_width//2, self.window_height//2)
+        self.paddle = Paddle(LEFT_PADDLE_X, PADDLE_START_Y)
+        self.opponent = Paddle(RIGHT_PADDLE_X, PADDLE_START_Y)
+        self.ball = Ball(BALL_START_X, BALL_START_Y, rng=self.rng)
         
         # Stats pour la récompense
         self.hits = 0
         self.missed = False
         self.opponent_missed = False
         self.last_distance = self._get_paddle_ball_distance()
+        self.episode_frames = 0  # Frames de physique de l'épisode (frame_skip par step, moins en fin d'épisode)
+        if self.recorder is not None:
+            self.recorder.mark_rally()
         
         return self._get_observation(), {}
     
     def step(self, action):
+        self.action = action
+        reward, terminated = self._advance(action)
+        frames = 1
+        previous = None
+        # Frames répétées, arrêt dès la fin de l'épisode
+        while frames < self.frame_skip and not terminated:
+            if self.max_pool and frames == self.frame_skip - 1:
+                previous = self._get_observation()
+            frame_reward, terminated = self._advance(action)
+            reward += frame_reward
+            frames += 1
+        self.episode_frames += frames
+        
+        observation = self._get_observation()
+        if previous is not None:
+            np.maximum(observation, previous, out=observation)
+        return observation, reward, terminated, False, {}
+    
+    def _advance(self, action):
+        """Une frame de physique, renvoie (récompense, fin d'épisode)"""
+        if self.profile:
+            return self._profiled_advance(action)
+            
+        self._move_agent(action)
+        self._move_opponent()
+        move_ball(self.ball, self.window_height)
+        left_hit, right_hit, missed, opponent_missed = collide_paddles(self.ball, self.paddle, self.opponent, self.window_width)
+        return self._finish_frame(left_hit, right_hit, missed, opponent_missed)
+    
+    def _profiled_advance(self, action):
+        """Même frame que _advance(), avec le temps passé dans chaque phase"""
+        profiler = self.profiler
+        t0 = time.perf_counter()
+        self._move_agent(action)
+        t1 = time.perf_counter()
+        self._move_opponent()
+        t2 = time.perf_counter()
+        move_ball(self.ball, self.window_height)
+        t3 = time.perf_counter()
+        left_hit, right_hit, missed, opponent_missed = collide_paddles(self.ball, self.paddle, self.opponent, self.window_width)
+        t4 = time.perf_counter()
+        result = self._finish_frame(left_hit, right_hit, missed, opponent_missed)
+        t5 = time.perf_counter()
+        
+        profiler.add_time("env.agent", t1 - t0)
+        profiler.add_time("env.opponent", t2 - t1)
+        profiler.add_time("env.physics", t3 - t2)
+        profiler.add_time("env.collision", t4 - t3)
+        profiler.add_time("env.reward", t5 - t4)
+        profiler.count("env.frames")
+        return result
+    
+    def profile_report(self):
+        """Temps moyen par frame de chaque phase, en microsecondes"""
+        frames = max(self.profiler.counters["env.frames"], 1)
+        return {phase: self.profiler.totals[f"env.{phase}"] / frames * 1e6 for phase in PROFILE_PHASES}
+    
+    def _move_agent(self, action):
         # Action de l'agent
         if action == 1:  # Monter
             self.paddle.move(up=True)
         elif action == 2:  # Descendre
             self.paddle.move(up=False)
             
-        # IA simple pour l'adversaire
-        target_y = self.ball.rect.centery
-        error = np.random.uniform(-50, 50) * self.opponent_difficulty
-        target_y += error
+    def _move_opponent(self):
+        # IA simple pour l'adversaire, bruit lu dans le bloc pré-tiré
+        if self._noise_index >= len(self._noise):
+            self._noise = self.np_random.uniform(-50, 50, NOISE_BLOCK_SIZE).tolist()
+            self._noise_index = 0
+        error = self._noise[self._noise_index] * self.opponent_difficulty
+        self._noise_index += 1
         
-        if self.opponent.rect.centery < target_y - 2:
+        ball = self.ball
+        ball_rect = ball.rect
+        target_y = None
+        if self.opponent_mode == "predictive" and ball.speed_x > 0:
+            radius = ball_rect.width / 2
+            target_y = predict_intercept(ball_rect.x + radius, ball_rect.y + radius, ball.speed_x, ball.speed_y,
+                                         RIGHT_CONTACT_X, self.window_height, radius)
+        if target_y is None:
+            target_y = ball_rect.y + ball_rect.height / 2
+        target_y += error
+        opponent_rect = self.opponent.rect
+        opponent_centery = opponent_rect.y + opponent_rect.height / 2
+        if opponent_centery < target_y - 2:
             self.opponent.move(up=False)
-        elif self.opponent.rect.centery > target_y + 2:
+            self.opponent_action = 2
+        elif opponent_centery > target_y + 2:
             self.opponent.move(up=True)
-            
-        # Mouvement de la balle
-        self.ball.move()
-        
-        # Collisions avec les murs
-        if self.ball.rect.top <= 0 or self.ball.rect.bottom >= self.window_height:
-            self.ball.bounce("y")
-            
-        # Collisions avec les raquettes
-        if self.ball.rect.colliderect(self.paddle.rect):
-            self.ball.bounce("x", self.paddle)
+            self.opponent_action = 1
+        else:
+            self.opponent_action = 0
+    
+    def _finish_frame(self, left_hit, right_hit, missed, opponent_missed):
+        """Met à jour les compteurs et calcule la récompense à partir de l'état déjà connu"""
+        if left_hit:
             self.hits += 1
-        elif self.ball.rect.colliderect(self.opponent.rect):
-            self.ball.bounce("x", self.opponent)
+        if self.recorder is not None:
+            self.recorder.record(self.ball, self.paddle, self.opponent, self.action, self.opponent_action,
+                                 events_mask(left_hit, right_hit, missed, opponent_missed), hits=self.hits)
             
         # Points et fin d'épisode
-        terminated = False
-        if self.ball.rect.left <= 0:
-            self.missed = True
-            terminated = True
-        elif self.ball.rect.right >= self.window_width:
-            self.opponent_missed = True
-            terminated = True
-            
-        # Calcul de la récompense
-        reward = self._calculate_reward()
+        self.missed = missed
+        self.opponent_missed = opponent_missed
+        terminated = missed or opponent_missed
         
-        # Mise à jour de la distance pour la prochaine frame
-        self.last_distance = self._get_paddle_ball_distance()
+        # Distance raquette-balle calculée une seule fois pour la récompense et la frame suivante
+        distance = self._get_paddle_ball_distance()
+        reward = self._calculate_reward(left_hit, distance)
+        self.last_distance = distance
         
-        return self._get_observation(), reward, terminated, False, {}
+        return reward, terminated
     
     def _get_observation(self):
         # Normalisation des observations entre -1 et 1
+        ball = self.ball
+        ball_rect = ball.rect
+        half_width = self.window_width / 2
+        half_height = self.window_height / 2
         return np.array([
-            self.ball.rect.centerx / (self.window_width/2) - 1,  # x position
-            self.ball.rect.centery / (self.window_height/2) - 1,  # y position
-            self.ball.speed_x / self.ball.max_speed,  # x velocity
-            self.ball.speed_y / self.ball.max_speed,  # y velocity
-            self.paddle.rect.centery / (self.window_height/2) - 1,  # paddle y
-            self.opponent.rect.centery / (self.window_height/2) - 1  # opponent y
+            (ball_rect.x + ball_rect.width / 2) / half_width - 1,  # x position
+            (ball_rect.y + ball_rect.height / 2) / half_height - 1,  # y position
+            ball.speed_x / ball.max_speed,  # x velocity
+            ball.speed_y / ball.max_speed,  # y velocity
+            (self.paddle.rect.y + self.paddle.rect.height / 2) / half_height - 1,  # paddle y
+            (self.opponent.rect.y + self.opponent.rect.height / 2) / half_height - 1  # opponent y
         ], dtype=np.float32)
     
     def _get_paddle_ball_distance(self):
         """Calcule la distance entre la raquette et la balle"""
-        return abs(self.paddle.rect.centery - self.ball.rect.centery)
+        paddle_rect = self.paddle.rect
+        ball_rect = self.ball.rect
+        return abs((paddle_rect.y + paddle_rect.height / 2) - (ball_rect.y + ball_rect.height / 2))
     
-    def _calculate_reward(self):
-        """Calcule la récompense basée sur plusieurs facteurs"""
+    def _calculate_reward(self, hit, distance):
+        """Calcule la récompense à partir de la collision et de la distance raquette-balle de ce step"""
         reward = 0
         
         # Récompense/pénalité pour le résultat
@@ -122,19 +239,18 @@ class PongEnv(gym.Env):
         elif self.opponent_missed:
             reward += 2.0  # Grosse récompense si l'adversaire rate
             
-        # Récompense pour les hits
-        if self.ball.rect.colliderect(self.paddle.rect):
+        # Récompense pour les hits (la balle n'a pas bougé depuis la collision)
+        if hit:
             reward += 0.5  # Récompense pour toucher la balle
             
             # Bonus pour la précision
-            accuracy = abs(self.ball.rect.centery - self.paddle.rect.centery) / (self.paddle.rect.height / 2)
+            accuracy = distance / (self.paddle.rect.height / 2)
             accuracy = max(0, 1 - accuracy)
             reward += accuracy * 0.3
             
         # Récompense pour se rapprocher de la balle quand elle vient vers nous
         if self.ball.speed_x < 0:  # Si la balle vient vers nous
-            current_distance = self._get_paddle_ball_distance()
-            if current_distance < self.last_distance:
+            if distance < self.last_distance:
                 reward += 0.1  # Petit bonus pour se rapprocher de la balle
                 
         return reward
@@ -0,0 +1,125 @@
+import io
+import time
+import cProfile
+import pstats
+from collections import defaultdict
+
+
+class _NullTimer:
+    """Timer d'un profiler désactivé : ne mesure rien"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add_time(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class Profiler:
+    """Timers nommés et compteurs pour les chemins chauds de l'entraînement.
+
+    Désactivé, timer() renvoie un context manager partagé qui ne fait rien et
+    count() retourne immédiatement : l'instrumentation peut rester en place.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.totals = defaultdict(float)
+        self.calls = defaultdict(int)
+        self.counters = defaultdict(int)
+        self.start_time = time.perf_counter()
+
+    def timer(self, name):
+        """Context manager qui ajoute sa durée au timer name"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def add_time(self, name, seconds, calls=1):
+        self.totals[name] += seconds
+        self.calls[name] += calls
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counters[name] += n
+
+    def reset(self):
+        """Repart de zéro (une fenêtre de mesure par résumé)"""
+        self.totals.clear()
+        self.calls.clear()
+        self.counters.clear()
+        self.start_time = time.perf_counter()
+
+    def summary(self):
+        """{nom: (appels, total en s, moyenne en µs, part du temps écoulé)} et les compteurs"""
+        elapsed = max(time.perf_counter() - self.start_time, 1e-9)
+        timers = {
+            name: (self.calls[name], total, total / max(self.calls[name], 1) * 1e6, total / elapsed)
+            for name, total in self.totals.items()
+        }
+        return {"elapsed": elapsed, "timers": timers, "counters": dict(self.counters)}
+
+    def report(self):
+        """Résumé lisible, timers triés par temps total"""
+        summary = self.summary()
+        elapsed = summary["elapsed"]
+        lines = [f"Profil sur {elapsed:.1f}s :"]
+        for name, (calls, total, mean_us, share) in sorted(summary["timers"].items(), key=lambda item: -item[1][1]):
+            lines.append(f"  {name:24s} {calls:>9d} appels {total:>8.2f}s {mean_us:>10.1f} µs/appel {share:>6.1%}")
+        for name, value in sorted(summary["counters"].items()):
+            lines.append(f"  {name:24s} {value:>9d} ({value / elapsed:.0f}/s)")
+        return "\n".join(lines)
+
+
+class ProfileWindow:
+    """cProfile des épisodes start à end - 1 (numérotés à partir de 1), résultat écrit dans un fichier .pstats"""
+
+    def __init__(self, start, end, filename):
+        self.start = start
+        self.end = end
+        self.filename = filename
+        self.profile = None
+
+    def on_episode_end(self, episode):
+        """À appeler après chaque épisode terminé (et avec 0 avant le premier).
+
+        Le profil démarre avant l'épisode start et s'arrête après l'épisode end - 1 :
+        renvoie alors le rapport pstats.
+        """
+        if episode + 1 == self.start and self.profile is None:
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        elif episode + 1 == self.end and self.profile is not None:
+            return self.stop()
+        return None
+
+    def stop(self, top=25):
+        if self.profile is None:
+            return None
+        self.profile.disable()
+        self.profile.dump_stats(self.filename)
+        self.profile = None
+
+        stream = io.StringIO()
+        pstats.Stats(self.filename, stream=stream).sort_stats("cumulative").print_stats(top)
+        return stream.getvalue()
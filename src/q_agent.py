@@ -1,44 +1,60 @@
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 import torch.optim as optim
 import numpy as np
-from collections import deque
-import random
 import os
+import json
+import copy
+from dataclasses import dataclass, asdict
+from replay import ReplayMemory, PrioritizedReplayMemory
+
+@dataclass
+class AgentConfig:
+    """Variante de réseau et de cible utilisée par l'agent (enregistrée dans les checkpoints)"""
+    hidden_size: int = 128
+    dueling: bool = False  # Tête valeur/avantage séparée
+    double_dqn: bool = False  # Action choisie par le réseau principal, évaluée par le target
+    n_step: int = 1  # Retours à n pas calculés dans la mémoire de replay
 
 class DQN(nn.Module):
-    def __init__(self, input_size, output_size, hidden_size=128):
+    def __init__(self, input_size, output_size, hidden_size=128, dueling=False):
         super(DQN, self).__init__()
+        self.dueling = dueling
         
-        self.network = nn.Sequential(
-            nn.Linear(input_size, hidden_size),
-            nn.ReLU(),
-            nn.Linear(hidden_size, hidden_size),
-            nn.ReLU(),
-            nn.Linear(hidden_size, output_size)
-        )
+        if dueling:
+            # Tronc commun puis têtes valeur V(s) et avantage A(s, a)
+            self.features = nn.Sequential(
+                nn.Linear(input_size, hidden_size),
+                nn.ReLU(),
+                nn.Linear(hidden_size, hidden_size),
+                nn.ReLU()
+            )
+            self.value = nn.Linear(hidden_size, 1)
+            self.advantage = nn.Linear(hidden_size, output_size)
+        else:
+            self.network = nn.Sequential(
+                nn.Linear(input_size, hidden_size),
+                nn.ReLU(),
+                nn.Linear(hidden_size, hidden_size),
+                nn.ReLU(),
+                nn.Linear(hidden_size, output_size)
+            )
         
     def forward(self, x):
+        if self.dueling:
+            features = self.features(x)
+            advantage = self.advantage(features)
+            return self.value(features) + advantage - advantage.mean(1, keepdim=True)
         return self.network(x)
 
-class ReplayMemory:
-    def __init__(self, capacity):
-        self.memory = deque(maxlen=capacity)
-        
-    def push(self, state, action, reward, next_state, done):
-        self.memory.append((state, action, reward, next_state, done))
-        
-    def sample(self, batch_size):
-        return random.sample(self.memory, batch_size)
-    
-    def __len__(self):
-        return len(self.memory)
-
 class QLearningAgent:
-    def __init__(self, state_size, action_size, device="cuda" if torch.cuda.is_available() else "cpu"):
+    def __init__(self, state_size, action_size, device="cuda" if torch.cuda.is_available() else "cpu", prioritized=False,
+                 memory_capacity=50000, memory_dir=None, updates_per_step=1, seed=None, config=None):
         self.state_size = state_size
         self.action_size = action_size
         self.device = device
+        self.config = config if config is not None else AgentConfig()
         
         # Hyperparamètres
         self.gamma = 0.99  # Facteur de réduction
@@ -48,86 +64,206 @@ class QLearningAgent:
         self.learning_rate = 0.0005  # Learning rate plus petit pour stabilité
         self.batch_size = 128  # Batch size plus grand
         self.train_start = 1000  # Commence l'entraînement après 1000 exemples
+        self.updates_per_step = updates_per_step  # Mises à jour du réseau par step d'environnement
+        self.seed = seed
         
         # Réseaux plus grands
-        self.model = DQN(state_size, action_size, hidden_size=128).to(device)
-        self.target_model = DQN(state_size, action_size, hidden_size=128).to(device)
-        self.target_model.load_state_dict(self.model.state_dict())
+        self._build_networks()
         
-        self.optimizer = optim.Adam(self.model.parameters(), lr=self.learning_rate)
-        self.memory = ReplayMemory(50000)  # Mémoire plus grande
+        # Mémoire plus grande, éventuellement priorisée et/ou sur disque (memory_dir)
+        self.prioritized = prioritized
+        self.memory = self._create_memory(memory_capacity, memory_dir)
         
-        # Pour le suivi des performances
+        # Pour le suivi des performances (la loss reste sur le device jusqu'à pop_loss)
         self.training_step = 0
+        self._loss_sum = torch.zeros((), device=device)
+        self._loss_count = 0
+        
+        # Sélection d'actions : générateur vectorisé et buffer d'entrée réutilisé (pinned sur GPU)
+        self.rng = np.random.default_rng(seed)
+        self._input_buffer = None
+        
+    def _build_networks(self):
+        """Crée les réseaux et l'optimiseur correspondant à self.config"""
+        self.model = DQN(self.state_size, self.action_size, self.config.hidden_size, self.config.dueling).to(self.device)
+        self.target_model = DQN(self.state_size, self.action_size, self.config.hidden_size, self.config.dueling).to(self.device)
+        self.target_model.load_state_dict(self.model.state_dict())
+        
+        # Implémentation multi-tensor d'Adam : une passe par groupe au lieu d'une par paramètre
+        self.optimizer = optim.Adam(self.model.parameters(), lr=self.learning_rate, foreach=True)
+        
+    def _create_memory(self, capacity, storage_dir):
+        memory_class = PrioritizedReplayMemory if self.prioritized else ReplayMemory
+        return memory_class(capacity, self.state_size, device=self.device, seed=self.seed, storage_dir=storage_dir,
+                            n_step=self.config.n_step, gamma=self.gamma)
         
     def update_target_model(self):
         """Met à jour le réseau target avec les poids du réseau principal"""
         self.target_model.load_state_dict(self.model.state_dict())
         
-    def get_action(self, state):
-        """Sélectionne une action selon la politique epsilon-greedy"""
-        if random.random() < self.epsilon:
-            return random.randrange(self.action_size)
+    def _get_input_buffer(self, size):
+        """Renvoie un buffer CPU d'au moins size états, agrandi seulement si nécessaire"""
+        if self._input_buffer is None or len(self._input_buffer) < size:
+            pin = str(self.device).startswith("cuda")
+            self._input_buffer = torch.empty((size, self.state_size), dtype=torch.float32, pin_memory=pin)
+        return self._input_buffer[:size]
+        
+    def get_actions(self, states):
+        """Sélectionne une action par état (tableau [N, state_size]) selon la politique epsilon-greedy"""
+        states = np.asarray(states, dtype=np.float32)
+        n = len(states)
+        
+        # Exploration tirée en un seul masque pour tout le batch
+        explore = self.rng.random(n) < self.epsilon
+        actions = np.empty(n, dtype=np.int64)
+        if explore.any():
+            actions[explore] = self.rng.integers(self.action_size, size=int(explore.sum()))
+        if explore.all():
+            return actions
             
+        # Une seule passe avant pour tout le batch
+        buffer = self._get_input_buffer(n)
+        buffer.copy_(torch.from_numpy(states))
         with torch.no_grad():
-            state = torch.FloatTensor(state).unsqueeze(0).to(self.device)
-            q_values = self.model(state)
-            return q_values.argmax().item()
+            q_values = self.model(buffer.to(self.device, non_blocking=True))
+        greedy = q_values.argmax(1).cpu().numpy()
+        actions[~explore] = greedy[~explore]
+        return actions
+        
+    def get_action(self, state):
+        """Sélectionne une action selon la politique epsilon-greedy"""
+        return int(self.get_actions(np.expand_dims(state, 0))[0])
             
     def train_step(self):
-        """Effectue une étape d'entraînement sur un batch"""
+        """Effectue updates_per_step étapes d'entraînement, renvoie la dernière loss (tensor, sans synchronisation)"""
         if len(self.memory) < self.train_start:
             return
             
-        # Sample batch
-        batch = self.memory.sample(self.batch_size)
-        states, actions, rewards, next_states, dones = zip(*batch)
-        
-        # Conversion en tensors
-        states = torch.FloatTensor(states).to(self.device)
-        actions = torch.LongTensor(actions).to(self.device)
-        rewards = torch.FloatTensor(rewards).to(self.device)
-        next_states = torch.FloatTensor(next_states).to(self.device)
-        dones = torch.FloatTensor(dones).to(self.device)
-        
-        # Calcul des Q-values
-        current_q_values = self.model(states).gather(1, actions.unsqueeze(1))
-        next_q_values = self.target_model(next_states).max(1)[0].detach()
-        target_q_values = rewards + (1 - dones) * self.gamma * next_q_values
+        for _ in range(self.updates_per_step):
+            loss = self._update()
+        
+        # Mise à jour de epsilon
+        self.epsilon = max(self.epsilon_min, self.epsilon * self.epsilon_decay)
+        
+        return loss
+        
+    def _update(self):
+        """Une mise à jour du réseau sur un batch tiré des buffers persistants de la mémoire"""
+        batch = self.memory.sample_stacked(self.batch_size)
+        stacked_states, actions, rewards, dones = batch[:4]
+        next_states = stacked_states[self.batch_size:]
+        
+        # Calcul des Q-values : en Double DQN une seule passe sur [states; next_states]
+        if self.config.double_dqn:
+            q_values = self.model(stacked_states)
+            current_q_values = q_values[:self.batch_size].gather(1, actions.unsqueeze(1)).squeeze(1)
+            next_actions = q_values[self.batch_size:].detach().argmax(1, keepdim=True)
+        else:
+            current_q_values = self.model(stacked_states[:self.batch_size]).gather(1, actions.unsqueeze(1)).squeeze(1)
+        
+        with torch.no_grad():
+            next_q_values = self.target_model(next_states)
+            if self.config.double_dqn:
+                target_q_values = next_q_values.gather(1, next_actions).squeeze(1)
+            else:
+                target_q_values = next_q_values.max(1)[0]
+            # Les retours à n pas sont actualisés par gamma ** n
+            target_q_values.mul_(1 - dones).mul_(self.gamma ** self.config.n_step).add_(rewards)
         
         # Calcul de la perte et optimisation
-        loss = nn.MSELoss()(current_q_values.squeeze(), target_q_values)
+        if self.prioritized:
+            # Perte pondérée par l'importance sampling, puis retour des erreurs TD dans l'arbre
+            weights, indices = batch[4:]
+            td_errors = current_q_values - target_q_values
+            loss = (weights * td_errors.pow(2)).mean()
+            self.memory.update_priorities(indices, td_errors.detach().cpu().numpy())
+        else:
+            loss = F.mse_loss(current_q_values, target_q_values)
         
-        self.optimizer.zero_grad()
+        self.optimizer.zero_grad(set_to_none=True)
         loss.backward()
         self.optimizer.step()
         
-        # Mise à jour de epsilon
-        self.epsilon = max(self.epsilon_min, self.epsilon * self.epsilon_decay)
+        loss = loss.detach()
+        self._loss_sum += loss
+        self._loss_count += 1
         
         # Mise à jour périodique du réseau target
         self.training_step += 1
         if self.training_step % 100 == 0:
             self.update_target_model()
             
-        return loss.item()
+        return loss
         
-    def save(self, filename):
-        """Sauvegarde le modèle"""
-        torch.save({
+    def pop_loss(self):
+        """Renvoie la loss moyenne depuis le dernier appel (seule lecture device -> hôte) et la remet à zéro"""
+        if self._loss_count == 0:
+            return 0.0
+        mean_loss = (self._loss_sum / self._loss_count).item()
+        self._loss_sum.zero_()
+        self._loss_count = 0
+        return mean_loss
+        
+    def checkpoint(self, snapshot=False):
+        """Contenu d'un checkpoint complet (flush la mémoire si elle est sur disque).
+        
+        Avec snapshot=True, les tensors sont copiés sur CPU : le checkpoint peut
+        être écrit depuis un autre thread pendant que l'entraînement continue. La
+        mémoire n'est alors pas flushée, c'est au thread d'écriture de le faire
+        (memory.flush(memory.cursor()) relevé au moment du snapshot).
+        """
+        if not snapshot:
+            self.memory.flush()
+        checkpoint = {
             'model_state_dict': self.model.state_dict(),
             'target_model_state_dict': self.target_model.state_dict(),
             'optimizer_state_dict': self.optimizer.state_dict(),
             'epsilon': self.epsilon,
-            'training_step': self.training_step
-        }, filename)
+            'training_step': self.training_step,
+            'memory_dir': self.memory.storage_dir,
+            'config': asdict(self.config)
+        }
+        if snapshot:
+            for key in ('model_state_dict', 'target_model_state_dict'):
+                checkpoint[key] = {name: tensor.detach().to("cpu", copy=True) for name, tensor in checkpoint[key].items()}
+            checkpoint['optimizer_state_dict'] = copy.deepcopy(checkpoint['optimizer_state_dict'])
+        return checkpoint
+        
+    def save(self, filename):
+        """Sauvegarde le modèle (et flush la mémoire si elle est sur disque)"""
+        torch.save(self.checkpoint(), filename)
         
     def load(self, filename):
         """Charge le modèle"""
         if os.path.exists(filename):
-            checkpoint = torch.load(filename)
-            self.model.load_state_dict(checkpoint['model_state_dict'])
+            checkpoint = torch.load(filename, map_location=self.device)
+            
+            # Reconstruit les réseaux si le checkpoint vient d'une autre variante
+            config = AgentConfig(**checkpoint.get('config', {}))
+            if config != self.config:
+                self.config = config
+                self._build_networks()
+                # Mémoire recréée avec le n_step chargé : accumulateurs vides, retours actualisés avec le bon n
+                if self.memory.n_step != config.n_step:
+                    self.memory.flush()  # Une mémoire sur disque remplie avec l'ancien n est rouverte vide
+                    self.memory = self._create_memory(self.memory.capacity, self.memory.storage_dir)
+            
+            # Export d'inférence (poids seuls, éventuellement en float16) : pas d'état d'entraînement
+            model_state = {name: tensor.float() for name, tensor in checkpoint['model_state_dict'].items()}
+            self.model.load_state_dict(model_state)
+            if 'optimizer_state_dict' not in checkpoint:
+                self.update_target_model()
+                return
+            
             self.target_model.load_state_dict(checkpoint['target_model_state_dict'])
             self.optimizer.load_state_dict(checkpoint['optimizer_state_dict'])
             self.epsilon = checkpoint['epsilon']
-            self.training_step = checkpoint['training_step'] 
\ No newline at end of file
+            self.training_step = checkpoint['training_step']
+            
+            # Réouverture de la mémoire sur disque associée au checkpoint
+            memory_dir = checkpoint.get('memory_dir')
+            meta_path = os.path.join(memory_dir, "meta.json") if memory_dir else None
+            if meta_path and os.path.exists(meta_path) and memory_dir != self.memory.storage_dir:
+                with open(meta_path) as f:
+                    capacity = json.load(f)["capacity"]
+                self.memory = self._create_memory(capacity, memory_dir) 
\ No newline at end of file
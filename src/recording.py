@@ -0,0 +1,279 @@
+import os
+import json
+import zlib
+import struct
+import argparse
+import numpy as np
+from physics import WINDOW_WIDTH, WINDOW_HEIGHT
+
+# Enregistrement d'une partie frame par frame, dans un format binaire à largeur fixe :
+#   en-tête : MAGIC, taille du JSON de métadonnées (uint32), métadonnées
+#   chunks  : CHUNK_HEADER (marque, première frame, nombre de frames, octets) puis les frames,
+#             brutes (lisibles directement via memmap) ou compressées avec zlib
+#   index   : table des chunks et premières frames des échanges, puis TRAILER (position de l'index).
+# Un fichier sans index (enregistrement interrompu) est relu en parcourant les en-têtes de chunks.
+
+MAGIC = b"PONGREC1"
+CHUNK_MARK = b"CHNK"
+INDEX_MARK = b"PONGIDX1"
+CHUNK_HEADER = struct.Struct("<4sQII")
+TRAILER = struct.Struct("<Q8s")
+VERSION = 1
+
+# Une frame : 35 octets
+FRAME_DTYPE = np.dtype([
+    ("frame", "<u4"),
+    ("ball_x", "<f4"), ("ball_y", "<f4"), ("ball_vx", "<f4"), ("ball_vy", "<f4"),
+    ("paddle1_y", "<f4"), ("paddle2_y", "<f4"),
+    ("action1", "i1"), ("action2", "i1"),
+    ("events", "u1"),
+    ("score1", "u1"), ("score2", "u1"),
+    ("hits", "<u2"),
+])
+
+CHUNK_DTYPE = np.dtype([("first_frame", "<u8"), ("offset", "<u8"), ("frames", "<u4"), ("nbytes", "<u4")])
+
+# Événements de la frame (bits du champ events)
+LEFT_HIT, RIGHT_HIT, LEFT_MISSED, RIGHT_MISSED = 1, 2, 4, 8
+
+
+def events_mask(left_hit=False, right_hit=False, left_missed=False, right_missed=False):
+    return left_hit | right_hit << 1 | left_missed << 2 | right_missed << 3
+
+
+class Recorder:
+    """Écrit les frames par chunks de chunk_frames : une frame ne coûte qu'un ajout à une liste"""
+
+    def __init__(self, path, chunk_frames=4096, compress=False, metadata=None):
+        self.path = path
+        self.chunk_frames = chunk_frames
+        self.compress = compress
+        self.file = open(path, "wb")
+        header = {"version": VERSION, "width": WINDOW_WIDTH, "height": WINDOW_HEIGHT, "fps": 60,
+                  "chunk_frames": chunk_frames, "compressed": compress, **(metadata or {})}
+        encoded = json.dumps(header).encode()
+        self.file.write(MAGIC + struct.pack("<I", len(encoded)) + encoded)
+        self.frame = 0
+        self.pending = []
+        self.chunks = []
+        self.rallies = [0]
+
+    def record(self, ball, paddle1, paddle2, action1=0, action2=0, events=0, score1=0, score2=0, hits=0):
+        rect = ball.rect
+        self.pending.append((self.frame, rect.x, rect.y, ball.speed_x, ball.speed_y, paddle1.rect.y, paddle2.rect.y,
+                             action1, action2, events, score1, score2, hits))
+        self.frame += 1
+        if len(self.pending) >= self.chunk_frames:
+            self.flush()
+
+    def mark_rally(self):
+        """Un nouvel échange commence à la prochaine frame enregistrée"""
+        if self.rallies[-1] != self.frame:
+            self.rallies.append(self.frame)
+
+    def flush(self):
+        """Écrit les frames en attente dans un nouveau chunk"""
+        if not self.pending:
+            return
+        payload = np.array(self.pending, dtype=FRAME_DTYPE).tobytes()
+        if self.compress:
+            payload = zlib.compress(payload, 1)
+        first_frame = self.frame - len(self.pending)
+        offset = self.file.tell() + CHUNK_HEADER.size
+        self.file.write(CHUNK_HEADER.pack(CHUNK_MARK, first_frame, len(self.pending), len(payload)))
+        self.file.write(payload)
+        self.chunks.append((first_frame, offset, len(self.pending), len(payload)))
+        self.pending = []
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush()
+        if len(self.rallies) > 1 and self.rallies[-1] == self.frame:
+            self.rallies.pop()  # Échange marqué mais jamais joué
+        index_offset = self.file.tell()
+        chunks = np.array(self.chunks, dtype=CHUNK_DTYPE)
+        rallies = np.array(self.rallies, dtype="<u8")
+        self.file.write(struct.pack("<QQ", len(chunks), len(rallies)))
+        self.file.write(chunks.tobytes() + rallies.tobytes())
+        self.file.write(TRAILER.pack(index_offset, INDEX_MARK))
+        self.file.close()
+
+
+class Replay:
+    """Lecture d'un enregistrement par memmap : accès direct à n'importe quelle frame ou échange"""
+
+    def __init__(self, path):
+        self.data = np.memmap(path, dtype=np.uint8, mode="r")
+        if bytes(self.data[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{path} n'est pas un enregistrement de partie")
+        (size,) = struct.unpack_from("<I", self.data, len(MAGIC))
+        start = len(MAGIC) + 4
+        self.metadata = json.loads(bytes(self.data[start:start + size]))
+        self.compressed = self.metadata["compressed"]
+        self._cached = (None, None)  # Dernier chunk décompressé
+        self._read_index(start + size)
+        self.first_frames = self.chunks["first_frame"]
+        self.num_frames = int(self.chunks["first_frame"][-1] + self.chunks["frames"][-1]) if len(self.chunks) else 0
+
+    def _read_index(self, data_start):
+        end = len(self.data)
+        if end >= data_start + TRAILER.size:
+            index_offset, mark = TRAILER.unpack_from(self.data, end - TRAILER.size)
+            if mark == INDEX_MARK:
+                num_chunks, num_rallies = struct.unpack_from("<QQ", self.data, index_offset)
+                position = index_offset + 16
+                self.chunks = np.frombuffer(self.data, CHUNK_DTYPE, num_chunks, position)
+                position += num_chunks * CHUNK_DTYPE.itemsize
+                self.rallies = np.frombuffer(self.data, "<u8", num_rallies, position)
+                return
+
+        # Enregistrement interrompu : parcours des chunks complets, échanges retrouvés par les points marqués
+        chunks = []
+        position = data_start
+        while position + CHUNK_HEADER.size <= end:
+            mark, first_frame, frames, nbytes = CHUNK_HEADER.unpack_from(self.data, position)
+            if mark != CHUNK_MARK or position + CHUNK_HEADER.size + nbytes > end:
+                break
+            chunks.append((first_frame, position + CHUNK_HEADER.size, frames, nbytes))
+            position += CHUNK_HEADER.size + nbytes
+        self.chunks = np.array(chunks, dtype=CHUNK_DTYPE)
+        rallies = [0]
+        for i in range(len(self.chunks)):
+            frames = self._chunk(i)
+            points = frames["frame"][(frames["events"] & (LEFT_MISSED | RIGHT_MISSED)) != 0] + 1
+            rallies.extend(points.tolist())
+        self.rallies = np.array(rallies, dtype="<u8")
+
+    def __len__(self):
+        return self.num_frames
+
+    def _chunk(self, i):
+        """Frames du chunk i : vue sur le memmap, ou copie décompressée gardée en cache"""
+        if self._cached[0] == i:
+            return self._cached[1]
+        first_frame, offset, frames, nbytes = self.chunks[i]
+        raw = self.data[offset:offset + nbytes]
+        if self.compressed:
+            result = np.frombuffer(zlib.decompress(raw), dtype=FRAME_DTYPE)
+        else:
+            result = raw.view(FRAME_DTYPE)
+        self._cached = (i, result)
+        return result
+
+    def frame(self, index):
+        """État enregistré de la frame index (structure FRAME_DTYPE)"""
+        if not 0 <= index < self.num_frames:
+            raise IndexError(f"frame {index} hors de l'enregistrement ({self.num_frames} frames)")
+        i = int(np.searchsorted(self.first_frames, index, side="right")) - 1
+        return self._chunk(i)[index - int(self.first_frames[i])]
+
+    def frames(self, start=0, stop=None):
+        """Frames [start, stop) dans un seul tableau"""
+        stop = self.num_frames if stop is None else min(stop, self.num_frames)
+        if start >= stop:
+            return np.zeros(0, dtype=FRAME_DTYPE)
+        first = int(np.searchsorted(self.first_frames, start, side="right")) - 1
+        last = int(np.searchsorted(self.first_frames, stop - 1, side="right")) - 1
+        parts = []
+        for i in range(first, last + 1):
+            chunk = self._chunk(i)
+            base = int(self.first_frames[i])
+            parts.append(chunk[max(start - base, 0):stop - base])
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def rally_start(self, rally):
+        """Première frame de l'échange numéro rally (0 = début de l'enregistrement)"""
+        return int(self.rallies[rally])
+
+    def rally_at(self, index):
+        """Numéro de l'échange en cours à la frame index"""
+        return int(np.searchsorted(self.rallies, index, side="right")) - 1
+
+    def close(self):
+        # Le fichier est libéré avec la dernière vue sur le memmap
+        self._cached = (None, None)
+        self.data = self.chunks = self.rallies = self.first_frames = None
+
+
+def apply_frame(game, record):
+    """Place les éléments de Game dans l'état d'une frame enregistrée"""
+    game.ball.rect.x = float(record["ball_x"])
+    game.ball.rect.y = float(record["ball_y"])
+    game.ball.speed_x = float(record["ball_vx"])
+    game.ball.speed_y = float(record["ball_vy"])
+    game.ball.hits = int(record["hits"])
+    game.paddle1.rect.y = float(record["paddle1_y"])
+    game.paddle2.rect.y = float(record["paddle2_y"])
+    game.paddle1.score = int(record["score1"])
+    game.paddle2.score = int(record["score2"])
+
+
+def play(path, speed=1.0, start_frame=0, rally=None):
+    """Rejoue un enregistrement dans la fenêtre du jeu, avec le rendu de Game.
+
+    Espace : pause, flèches gauche/droite : -/+ 1 seconde, haut/bas : vitesse x2 / ÷2,
+    N/P : échange suivant/précédent, Échap : quitter.
+    """
+    import pygame
+    from main import Game, GameState, FPS
+
+    replay = Replay(path)
+    if not len(replay):
+        raise ValueError(f"{path} ne contient aucune frame")
+    game = Game(verbose=False)
+    game.state = GameState.PLAYING
+    position = float(replay.rally_start(rally) if rally is not None else start_frame)
+    paused = False
+    last = len(replay) - 1
+
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                replay.close()
+                pygame.quit()
+                return
+            if event.type != pygame.KEYDOWN:
+                continue
+            if event.key == pygame.K_SPACE:
+                paused = not paused
+            elif event.key == pygame.K_RIGHT:
+                position += FPS
+            elif event.key == pygame.K_LEFT:
+                position -= FPS
+            elif event.key == pygame.K_UP:
+                speed *= 2
+            elif event.key == pygame.K_DOWN:
+                speed /= 2
+            elif event.key in (pygame.K_n, pygame.K_p):
+                current = replay.rally_at(int(position))
+                target = current + 1 if event.key == pygame.K_n else current - (position == replay.rally_start(current))
+                position = replay.rally_start(min(max(target, 0), len(replay.rallies) - 1))
+        position = min(max(position, 0), last)
+
+        apply_frame(game, replay.frame(int(position)))
+        game.draw()
+        pygame.display.set_caption(f"Replay {os.path.basename(path)} - frame {int(position)}/{last} "
+                                   f"échange {replay.rally_at(int(position))} x{speed:g}")
+        if not paused:
+            position += speed
+        game.clock.tick(FPS)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Relecture d'un enregistrement de partie")
+    parser.add_argument("path")
+    parser.add_argument("--speed", type=float, default=1.0, help="Vitesse de relecture (2 = deux fois plus vite)")
+    parser.add_argument("--frame", type=int, default=0, help="Frame de départ")
+    parser.add_argument("--rally", type=int, help="Échange de départ (prioritaire sur --frame)")
+    parser.add_argument("--info", action="store_true", help="Affiche le contenu sans rejouer")
+    args = parser.parse_args()
+
+    if args.info:
+        replay = Replay(args.path)
+        size = os.path.getsize(args.path)
+        print(json.dumps(replay.metadata, indent=2))
+        print(f"{len(replay)} frames, {len(replay.chunks)} chunks, {len(replay.rallies)} échanges, "
+              f"{size / 1024:.0f} Ko ({size / max(len(replay), 1):.1f} octets/frame)")
+    else:
+        play(args.path, args.speed, args.frame, args.rally)
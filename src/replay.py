@@ -0,0 +1,380 @@
+import os
+import json
+import numpy as np
+import torch
+
+class NStepAccumulator:
+    """Replie les transitions de plusieurs flux parallèles en transitions à n pas.
+
+    Les n dernières transitions de chaque flux restent en attente ; une
+    transition sort dès que son retour à n pas est complet, ou avec un retour
+    tronqué quand l'épisode de son flux se termine.
+    """
+
+    def __init__(self, n_step, gamma, num_streams, state_size):
+        self.n_step = n_step
+        self.gamma = gamma
+        self.t = 0
+        self.states = np.zeros((n_step, num_streams, state_size), dtype=np.float32)
+        self.actions = np.zeros((n_step, num_streams), dtype=np.int64)
+        self.rewards = np.zeros((n_step, num_streams), dtype=np.float32)
+        self.valid = np.zeros((n_step, num_streams), dtype=bool)
+
+    def add(self, states, actions, rewards, next_states, dones):
+        """Ajoute un step de chaque flux, renvoie les transitions à n pas terminées (ou None)"""
+        slot = self.t % self.n_step
+        self.states[slot] = states
+        self.actions[slot] = actions
+        self.rewards[slot] = rewards
+        self.valid[slot] = True
+        self.t += 1
+
+        # Slots triés par âge (0 = step courant) et retours calculés par récurrence
+        ages = np.arange(self.n_step)
+        slots = (slot - ages) % self.n_step
+        returns = np.zeros_like(self.rewards)
+        returns[0] = self.rewards[slots[0]]
+        for age in range(1, self.n_step):
+            returns[age] = self.rewards[slots[age]] + self.gamma * returns[age - 1]
+
+        dones = np.asarray(dones, dtype=bool)
+        ready = self.valid[slots] & (dones[None, :] | (ages == self.n_step - 1)[:, None])
+        if not ready.any():
+            return None
+
+        age_index, stream_index = np.nonzero(ready)
+        slot_index = slots[age_index]
+        self.valid[slot_index, stream_index] = False
+        return (
+            self.states[slot_index, stream_index],
+            self.actions[slot_index, stream_index],
+            returns[age_index, stream_index],
+            np.asarray(next_states)[stream_index],
+            dones[stream_index],
+        )
+
+class ReplayMemory:
+    """Mémoire de replay circulaire stockée dans des tableaux NumPy contigus préalloués.
+
+    Avec `storage_dir`, les tableaux sont des fichiers np.memmap sur disque : la
+    capacité peut dépasser la RAM et la mémoire se rouvre telle quelle (curseur
+    d'écriture compris) après un redémarrage.
+
+    Avec `n_step` > 1, les transitions sont stockées avec leur retour à n pas
+    (l'agent doit alors actualiser la cible avec gamma ** n_step). Une mémoire sur
+    disque remplie avec un autre n_step ou gamma est rouverte vide.
+    """
+
+    def __init__(self, capacity, state_size=6, device="cpu", seed=None, storage_dir=None, n_step=1, gamma=0.99):
+        self.capacity = capacity
+        self.state_size = state_size
+        self.device = device
+        self.storage_dir = storage_dir
+        self.rng = np.random.default_rng(seed)
+        self.n_step = n_step
+        self.gamma = gamma
+        self._accumulators = {}  # Un accumulateur n pas par flux (ou groupe de flux parallèles)
+
+        self.position = 0  # Prochaine case à écrire
+        self.size = 0
+        self._batch = None  # Buffers de batch persistants, créés au premier tirage
+        if storage_dir is None:
+            self._allocate()
+        else:
+            self._open_storage()
+
+    def _fields(self):
+        """Nom, dtype et forme de chaque tableau de stockage (états en float32, actions/dones en int8)"""
+        return (
+            ("states", np.float32, (self.capacity, self.state_size)),
+            ("actions", np.int8, (self.capacity,)),
+            ("rewards", np.float32, (self.capacity,)),
+            ("next_states", np.float32, (self.capacity, self.state_size)),
+            ("dones", np.int8, (self.capacity,)),
+        )
+
+    def _allocate(self):
+        """Crée les tableaux de stockage en mémoire"""
+        for name, dtype, shape in self._fields():
+            setattr(self, name, np.zeros(shape, dtype=dtype))
+
+    def _open_storage(self):
+        """Ouvre (ou crée) les fichiers memmap et restaure le curseur depuis meta.json"""
+        os.makedirs(self.storage_dir, exist_ok=True)
+        meta_path = os.path.join(self.storage_dir, "meta.json")
+        mode = "w+"
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if meta["capacity"] != self.capacity or meta["state_size"] != self.state_size:
+                raise ValueError(f"La mémoire dans {self.storage_dir} a une capacité de {meta['capacity']} "
+                                 f"et des états de taille {meta['state_size']}")
+            # Retours calculés avec un autre n ou gamma : inutilisables, la mémoire repart vide
+            if (meta.get("n_step", 1), meta.get("gamma", self.gamma)) == (self.n_step, self.gamma):
+                self.position = meta["position"]
+                self.size = meta["size"]
+            mode = "r+"
+
+        for name, dtype, shape in self._fields():
+            path = os.path.join(self.storage_dir, f"{name}.dat")
+            setattr(self, name, np.memmap(path, dtype=dtype, mode=mode, shape=shape))
+
+        if mode == "w+" or self.size == 0:
+            self.flush()
+
+    def cursor(self):
+        """Curseur courant (position, taille), à passer à flush depuis un autre thread"""
+        return self.position, self.size
+
+    def flush(self, cursor=None):
+        """Écrit les données sur disque puis le curseur (sans effet sans storage_dir).
+
+        Appelée depuis un autre thread, cursor est le curseur relevé par le thread qui
+        remplit la mémoire : les transitions avant lui sont déjà dans les memmaps.
+        """
+        if self.storage_dir is None:
+            return
+        position, size = cursor if cursor is not None else self.cursor()
+        for name, _, _ in self._fields():
+            getattr(self, name).flush()
+
+        # Écriture atomique : le curseur ne pointe jamais sur des données non écrites
+        meta_path = os.path.join(self.storage_dir, "meta.json")
+        with open(meta_path + ".tmp", "w") as f:
+            json.dump({"capacity": self.capacity, "state_size": self.state_size, "n_step": self.n_step,
+                       "gamma": self.gamma, "position": position, "size": size}, f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    def push(self, state, action, reward, next_state, done, stream=0):
+        """Ajoute une transition ; stream distingue des séquences entrelacées en mode n pas"""
+        if self.n_step > 1:
+            self._push_n_step(("single", stream), [state], [action], [reward], [next_state], [done])
+            return
+            
+        i = self.position
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        self._on_write(i)
+
+    def push_batch(self, states, actions, rewards, next_states, dones):
+        """Ajoute un batch de transitions en une seule écriture vectorisée.
+
+        En mode n pas, chaque ligne est le step courant d'un flux parallèle
+        (une partie de VectorPongEnv par exemple).
+        """
+        if self.n_step > 1:
+            self._push_n_step(("batch", len(actions)), states, actions, rewards, next_states, dones)
+            return
+        self._write_batch(states, actions, rewards, next_states, dones)
+
+    def _push_n_step(self, key, states, actions, rewards, next_states, dones):
+        accumulator = self._accumulators.get(key)
+        if accumulator is None:
+            accumulator = NStepAccumulator(self.n_step, self.gamma, len(actions), self.state_size)
+            self._accumulators[key] = accumulator
+        ready = accumulator.add(states, actions, rewards, next_states, dones)
+        if ready is not None:
+            self._write_batch(*ready)
+
+    def _write_batch(self, states, actions, rewards, next_states, dones):
+        n = len(actions)
+        indices = (self.position + np.arange(n)) % self.capacity
+        self.states[indices] = states
+        self.actions[indices] = actions
+        self.rewards[indices] = rewards
+        self.next_states[indices] = next_states
+        self.dones[indices] = dones
+
+        self.position = int((self.position + n) % self.capacity)
+        self.size = min(self.size + n, self.capacity)
+        self._on_write(indices)
+
+    def _on_write(self, indices):
+        """Appelé après chaque écriture (utilisé par le replay priorisé)"""
+        pass
+
+    def _batch_buffers(self, batch_size):
+        """Buffers NumPy et tensors réutilisés d'un tirage à l'autre (recréés si batch_size change)"""
+        if self._batch is None or len(self._batch["actions"]) != batch_size:
+            on_cpu = str(self.device) == "cpu"
+            stacked = np.zeros((2 * batch_size, self.state_size), dtype=np.float32)
+            rewards = np.zeros(batch_size, dtype=np.float32)
+            self._batch = {
+                # États et états suivants empilés : [states; next_states]
+                "stacked": stacked,
+                "actions": np.zeros(batch_size, dtype=np.int8),
+                "rewards": rewards,
+                "dones": np.zeros(batch_size, dtype=np.int8),
+                # Sur CPU les tensors float partagent directement la mémoire des tableaux NumPy
+                "stacked_t": torch.from_numpy(stacked) if on_cpu else torch.zeros(stacked.shape, device=self.device),
+                "actions_t": torch.zeros(batch_size, dtype=torch.int64, device=self.device),
+                "rewards_t": torch.from_numpy(rewards) if on_cpu else torch.zeros(batch_size, device=self.device),
+                "dones_t": torch.zeros(batch_size, device=self.device),
+                "weights_t": torch.zeros(batch_size, device=self.device),
+                "on_cpu": on_cpu,
+            }
+        return self._batch
+
+    def _gather(self, indices):
+        """Copie les transitions sélectionnées dans les buffers persistants, sans allocation"""
+        batch = self._batch_buffers(len(indices))
+        n = len(indices)
+        np.take(self.states, indices, axis=0, out=batch["stacked"][:n])
+        np.take(self.next_states, indices, axis=0, out=batch["stacked"][n:])
+        np.take(self.actions, indices, out=batch["actions"])
+        np.take(self.rewards, indices, out=batch["rewards"])
+        np.take(self.dones, indices, out=batch["dones"])
+
+        if not batch["on_cpu"]:
+            batch["stacked_t"].copy_(torch.from_numpy(batch["stacked"]), non_blocking=True)
+            batch["rewards_t"].copy_(torch.from_numpy(batch["rewards"]), non_blocking=True)
+        batch["actions_t"].copy_(torch.from_numpy(batch["actions"]))
+        batch["dones_t"].copy_(torch.from_numpy(batch["dones"]))
+        return batch["stacked_t"], batch["actions_t"], batch["rewards_t"], batch["dones_t"]
+
+    def sample_stacked(self, batch_size):
+        """Tire batch_size transitions uniformément, renvoie (stacked_states, actions, rewards, dones).
+
+        stacked_states contient les états puis les états suivants ; les tensors
+        renvoyés sont réutilisés et écrasés au tirage suivant.
+        """
+        indices = self.rng.integers(0, self.size, size=batch_size)
+        return self._gather(indices)
+
+    def sample(self, batch_size):
+        """Tire batch_size transitions uniformément, renvoie (states, actions, rewards, next_states, dones)"""
+        stacked, actions, rewards, dones, *extras = self.sample_stacked(batch_size)
+        return (stacked[:batch_size], actions, rewards, stacked[batch_size:], dones, *extras)
+
+    def __len__(self):
+        return self.size
+
+class SumTree:
+    """Arbre de sommes stocké dans un tableau : tirage proportionnel et mise à jour en O(log n)"""
+
+    def __init__(self, capacity):
+        # Nombre de feuilles arrondi à une puissance de 2 pour une descente simple
+        self.leaf_count = 1
+        while self.leaf_count < capacity:
+            self.leaf_count *= 2
+        self.depth = self.leaf_count.bit_length() - 1
+        self.tree = np.zeros(2 * self.leaf_count, dtype=np.float64)  # Racine en 1
+
+    @property
+    def total(self):
+        return self.tree[1]
+
+    def update(self, indices, priorities):
+        """Met à jour les priorités de plusieurs feuilles puis remonte niveau par niveau"""
+        nodes = np.asarray(indices) + self.leaf_count
+        self.tree[nodes] = priorities
+        for _ in range(self.depth):
+            # Les doublons recalculent la même somme, pas besoin de np.unique
+            nodes = nodes // 2
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def update_one(self, index, priority):
+        """Met à jour une seule feuille : boucle Python, sans le coût fixe des opérations vectorisées"""
+        tree = self.tree
+        node = int(index) + self.leaf_count
+        tree[node] = priority
+        node //= 2
+        while node:
+            tree[node] = tree[2 * node] + tree[2 * node + 1]
+            node //= 2
+
+    def find(self, values):
+        """Renvoie pour chaque valeur la feuille dont l'intervalle de somme cumulée la contient"""
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        for _ in range(self.depth):
+            left = self.tree[2 * nodes]
+            go_right = values > left
+            values -= left * go_right
+            nodes = 2 * nodes + go_right
+        return nodes - self.leaf_count
+
+class PrioritizedReplayMemory(ReplayMemory):
+    """Replay priorisé proportionnel aux erreurs TD, avec poids d'importance sampling"""
+
+    def __init__(self, capacity, state_size=6, device="cpu", seed=None, storage_dir=None, n_step=1, gamma=0.99,
+                 alpha=0.6, beta=0.4, beta_frames=100000, epsilon=1e-6):
+        super().__init__(capacity, state_size, device, seed, storage_dir, n_step, gamma)
+        self.alpha = alpha
+        self.beta_start = beta
+        self.beta_frames = beta_frames
+        self.epsilon = epsilon  # Évite les priorités nulles
+        self.max_priority = 1.0
+        self.sample_count = 0
+        self.tree = SumTree(capacity)
+
+        # Les priorités ne sont pas sauvegardées : une mémoire rouverte repart de la priorité max
+        if self.size > 0:
+            self.tree.update(np.arange(self.size), self.max_priority ** self.alpha)
+
+    @property
+    def beta(self):
+        """Beta augmente linéairement jusqu'à 1 pour corriger complètement le biais en fin d'entraînement"""
+        progress = min(1.0, self.sample_count / self.beta_frames)
+        return self.beta_start + progress * (1.0 - self.beta_start)
+
+    def _on_write(self, indices):
+        # Une nouvelle transition reçoit la priorité max pour être vue au moins une fois
+        if np.ndim(indices) == 0:
+            self.tree.update_one(indices, self.max_priority ** self.alpha)  # push d'une transition
+        else:
+            self.tree.update(indices, self.max_priority ** self.alpha)
+
+    def sample_stacked(self, batch_size):
+        """Tirage stratifié proportionnel aux priorités, renvoie aussi les poids et les indices"""
+        segment = self.tree.total / batch_size
+        values = (np.arange(batch_size) + self.rng.random(batch_size)) * segment
+        indices = np.minimum(self.tree.find(values), self.size - 1)
+
+        # Poids d'importance sampling normalisés par le poids max
+        probabilities = self.tree.tree[indices + self.tree.leaf_count] / self.tree.total
+        weights = (self.size * probabilities) ** -self.beta
+        weights /= weights.max()
+        self.sample_count += 1
+
+        batch = self._gather(indices)
+        weights_t = self._batch["weights_t"]
+        weights_t.copy_(torch.from_numpy(weights))
+        return batch + (weights_t, indices)
+
+    def update_priorities(self, indices, td_errors):
+        """Remplace les priorités des transitions échantillonnées par leurs nouvelles erreurs TD"""
+        priorities = np.abs(td_errors) + self.epsilon
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self.tree.update(indices, priorities ** self.alpha)
+
+def benchmark_sampling(capacities=(50000, 1000000), batch_size=128, iterations=1000, state_size=6):
+    """Compare le coût de sample() (et update_priorities) entre replay uniforme et priorisé"""
+    import time
+    results = {}
+    for capacity in capacities:
+        for name, memory in (("uniform", ReplayMemory(capacity, state_size, seed=0)),
+                             ("prioritized", PrioritizedReplayMemory(capacity, state_size, seed=0))):
+            rng = np.random.default_rng(0)
+            memory.push_batch(
+                rng.random((capacity, state_size), dtype=np.float32), rng.integers(0, 3, capacity),
+                rng.random(capacity, dtype=np.float32), rng.random((capacity, state_size), dtype=np.float32),
+                np.zeros(capacity, dtype=bool),
+            )
+            start = time.perf_counter()
+            for _ in range(iterations):
+                batch = memory.sample(batch_size)
+                if name == "prioritized":
+                    memory.update_priorities(batch[-1], rng.random(batch_size))
+            results[(name, capacity)] = (time.perf_counter() - start) / iterations
+    return results
+
+if __name__ == "__main__":
+    for (name, capacity), seconds in benchmark_sampling().items():
+        print(f"{name:12s} capacité {capacity:>8d} : {seconds * 1e6:.1f} µs / batch")
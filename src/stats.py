@@ -1,9 +1,38 @@
-import json
 import time
-from dataclasses import dataclass, asdict
-from typing import List, Dict
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import List, Callable, Sequence
 import os
-from datetime import datetime
+from stats_db import StatsDB, DB_FILE
+
+# Bornes des histogrammes par partie : taille fixe quelle que soit la durée de la partie
+REACTION_TIME_EDGES = [i / 10 for i in range(21)]  # 0 à 2 par pas de 0.1
+BALL_SPEED_EDGES = list(range(21))  # 0 à 20 px/frame
+
+class Histogram:
+    """Histogramme à bornes fixes avec nombre, somme et maximum des valeurs (mémoire constante)"""
+
+    def __init__(self, edges: Sequence[float]):
+        self.edges = list(edges)
+        # Un compteur par intervalle [edges[i], edges[i+1]), plus un pour les valeurs au-delà de la dernière borne
+        self.counts = [0] * len(self.edges)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float):
+        self.counts[max(bisect_right(self.edges, value) - 1, 0)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def count_below(self, value: float) -> int:
+        """Nombre de valeurs < value (value doit être une des bornes)"""
+        return sum(self.counts[:self.edges.index(value)])
 
 @dataclass
 class GameStats:
@@ -16,37 +45,44 @@ class GameStats:
     max_rally_length: int
     ball_speed_avg: float
     ball_speed_max: float
-    player1_reaction_times: List[float]
-    player2_reaction_times: List[float]
+    player1_reaction_times: List[int]  # Histogramme sur REACTION_TIME_EDGES
+    player2_reaction_times: List[int]
     player1_accuracy: float  # % de fois où la balle est touchée au bon endroit
     player2_accuracy: float
+    ball_speeds: List[int] = None  # Histogramme sur BALL_SPEED_EDGES
+    player1_reaction_avg: float = 0.0
+    player2_reaction_avg: float = 0.0
 
 class StatsManager:
-    def __init__(self, save_dir: str = "stats"):
+    def __init__(self, save_dir: str = "stats", clock: Callable[[], float] = time.time, db=None):
         self.save_dir = save_dir
+        self.clock = clock  # Horloge des parties (temps simulé en mode headless)
         self.current_game = None
         self.current_rally_hits = 0
-        self.rally_lengths = []
-        self.ball_speeds = []
-        self.reaction_times = {"player1": [], "player2": []}
-        self.paddle_positions = {"player1": [], "player2": []}
+        self.rally_count = 0
+        self.rally_total = 0
+        self.rally_max = 0
+        self.ball_speeds = Histogram(BALL_SPEED_EDGES)
+        self.reaction_times = {"player1": Histogram(REACTION_TIME_EDGES), "player2": Histogram(REACTION_TIME_EDGES)}
         
         # Crée le dossier de stats s'il n'existe pas
-        if not os.path.exists(save_dir):
-            os.makedirs(save_dir)
+        os.makedirs(save_dir, exist_ok=True)
+        # Base SQLite des parties (insertions groupées), ouverte à la première partie terminée
+        self.db = db
     
     def start_game(self):
         """Démarre une nouvelle partie"""
         self.current_game = {
-            "start_time": time.time(),
+            "start_time": self.clock(),
             "hits": 0,
             "scores": {"player1": 0, "player2": 0}
         }
         self.current_rally_hits = 0
-        self.rally_lengths = []
-        self.ball_speeds = []
-        self.reaction_times = {"player1": [], "player2": []}
-        self.paddle_positions = {"player1": [], "player2": []}
+        self.rally_count = 0
+        self.rally_total = 0
+        self.rally_max = 0
+        self.ball_speeds = Histogram(BALL_SPEED_EDGES)
+        self.reaction_times = {"player1": Histogram(REACTION_TIME_EDGES), "player2": Histogram(REACTION_TIME_EDGES)}
     
     def log_hit(self, player: str, ball_speed: float, reaction_time: float, accuracy: float):
         """Enregistre un hit de balle"""
@@ -55,8 +91,8 @@ class StatsManager:
             
         self.current_game["hits"] += 1
         self.current_rally_hits += 1
-        self.ball_speeds.append(ball_speed)
-        self.reaction_times[player].append(reaction_time)
+        self.ball_speeds.add(ball_speed)
+        self.reaction_times[player].add(reaction_time)
         
     def log_score(self, scorer: str):
         """Enregistre un point marqué"""
@@ -64,7 +100,9 @@ class StatsManager:
             return
             
         self.current_game["scores"][scorer] += 1
-        self.rally_lengths.append(self.current_rally_hits)
+        self.rally_count += 1
+        self.rally_total += self.current_rally_hits
+        self.rally_max = max(self.rally_max, self.current_rally_hits)
         self.current_rally_hits = 0
     
     def end_game(self) -> GameStats:
@@ -72,7 +110,7 @@ class StatsManager:
         if not self.current_game:
             return None
             
-        duration = time.time() - self.current_game["start_time"]
+        duration = self.clock() - self.current_game["start_time"]
         
         # Calcul des stats
         stats = GameStats(
@@ -81,14 +119,17 @@ class StatsManager:
             player1_score=self.current_game["scores"]["player1"],
             player2_score=self.current_game["scores"]["player2"],
             total_hits=self.current_game["hits"],
-            avg_rally_length=sum(self.rally_lengths) / len(self.rally_lengths) if self.rally_lengths else 0,
-            max_rally_length=max(self.rally_lengths) if self.rally_lengths else 0,
-            ball_speed_avg=sum(self.ball_speeds) / len(self.ball_speeds) if self.ball_speeds else 0,
-            ball_speed_max=max(self.ball_speeds) if self.ball_speeds else 0,
-            player1_reaction_times=self.reaction_times["player1"],
-            player2_reaction_times=self.reaction_times["player2"],
+            avg_rally_length=self.rally_total / self.rally_count if self.rally_count else 0,
+            max_rally_length=self.rally_max,
+            ball_speed_avg=self.ball_speeds.mean,
+            ball_speed_max=self.ball_speeds.max,
+            player1_reaction_times=list(self.reaction_times["player1"].counts),
+            player2_reaction_times=list(self.reaction_times["player2"].counts),
             player1_accuracy=self._calculate_accuracy("player1"),
-            player2_accuracy=self._calculate_accuracy("player2")
+            player2_accuracy=self._calculate_accuracy("player2"),
+            ball_speeds=list(self.ball_speeds.counts),
+            player1_reaction_avg=self.reaction_times["player1"].mean,
+            player2_reaction_avg=self.reaction_times["player2"].mean,
         )
         
         # Sauvegarde des stats
@@ -99,17 +140,21 @@ class StatsManager:
     
     def _calculate_accuracy(self, player: str) -> float:
         """Calcule la précision d'un joueur"""
-        hits = len(self.reaction_times[player])
-        if not hits:
+        reaction_times = self.reaction_times[player]
+        if not reaction_times.count:
             return 0.0
         # On considère qu'un temps de réaction < 0.1s est "précis"
-        good_hits = sum(1 for t in self.reaction_times[player] if t < 0.1)
-        return good_hits / hits * 100
+        good_hits = reaction_times.count_below(0.1)
+        return good_hits / reaction_times.count * 100
     
     def _save_stats(self, stats: GameStats):
-        """Sauvegarde les stats dans un fichier JSON"""
-        timestamp = datetime.fromtimestamp(stats.timestamp)
-        filename = f"{self.save_dir}/game_{timestamp.strftime('%Y%m%d_%H%M%S')}.json"
-        
-        with open(filename, 'w') as f:
-            json.dump(asdict(stats), f, indent=2) 
\ No newline at end of file
+        """Ajoute la partie à la base (écrite par lots, voir close())"""
+        if self.db is None:
+            self.db = StatsDB(os.path.join(self.save_dir, DB_FILE))
+        self.db.add(stats)
+    
+    def close(self):
+        """Écrit les parties en attente et ferme la base"""
+        if self.db is not None:
+            self.db.close()
+            self.db = None
@@ -0,0 +1,218 @@
+import os
+import glob
+import json
+import sqlite3
+import argparse
+import numpy as np
+
+DB_FILE = "stats.db"
+PLAYERS = ("player1", "player2")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    duration REAL,
+    player1_score INTEGER,
+    player2_score INTEGER,
+    winner TEXT,
+    total_hits INTEGER,
+    avg_rally_length REAL,
+    max_rally_length INTEGER,
+    ball_speed_avg REAL,
+    ball_speed_max REAL,
+    ball_speeds BLOB,
+    source TEXT UNIQUE
+);
+CREATE TABLE IF NOT EXISTS players (
+    game_id INTEGER NOT NULL REFERENCES games(id),
+    player TEXT NOT NULL,
+    score INTEGER,
+    won INTEGER,
+    accuracy REAL,
+    reaction_avg REAL,
+    reaction_count INTEGER,
+    reaction_times BLOB,
+    PRIMARY KEY (game_id, player)
+);
+CREATE INDEX IF NOT EXISTS games_timestamp ON games(timestamp);
+CREATE INDEX IF NOT EXISTS players_player ON players(player, game_id);
+"""
+
+
+def _histogram_blob(counts):
+    return None if counts is None else np.asarray(counts, dtype="<u4").tobytes()
+
+
+def _histogram(blob):
+    return np.frombuffer(blob, dtype="<u4") if blob else None
+
+
+class StatsDB:
+    """Stats des parties dans une base SQLite locale : insertions groupées par transactions de batch_size parties.
+
+    Plusieurs processus peuvent écrire dans la même base (mode WAL, attente si elle est verrouillée).
+    """
+
+    def __init__(self, path, batch_size=50):
+        self.path = path
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(path, timeout=30.0)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self._pending = []
+        self.inserted = 0  # Parties réellement ajoutées (hors sources déjà importées)
+
+    def add(self, stats, source=None):
+        """Ajoute une partie (GameStats), écrite avec les suivantes dans une seule transaction"""
+        self._pending.append((stats, source))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Écrit les parties en attente"""
+        if not self._pending:
+            return
+        with self.conn:
+            for stats, source in self._pending:
+                self.inserted += self._insert(stats, source)
+        self._pending.clear()
+
+    def _insert(self, stats, source):
+        winner = None
+        if stats.player1_score != stats.player2_score:
+            winner = "player1" if stats.player1_score > stats.player2_score else "player2"
+        # Une source déjà importée est ignorée (réimport sans doublons)
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO games (timestamp, duration, player1_score, player2_score, winner, total_hits, "
+            "avg_rally_length, max_rally_length, ball_speed_avg, ball_speed_max, ball_speeds, source) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (stats.timestamp, stats.duration, stats.player1_score, stats.player2_score, winner, stats.total_hits,
+             stats.avg_rally_length, stats.max_rally_length, stats.ball_speed_avg, stats.ball_speed_max,
+             _histogram_blob(stats.ball_speeds), source))
+        if not cursor.rowcount:
+            return 0
+        game_id = cursor.lastrowid
+        self.conn.executemany(
+            "INSERT INTO players (game_id, player, score, won, accuracy, reaction_avg, reaction_count, reaction_times) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(game_id, player, getattr(stats, f"{player}_score"), int(winner == player),
+              getattr(stats, f"{player}_accuracy"), getattr(stats, f"{player}_reaction_avg"),
+              int(sum(getattr(stats, f"{player}_reaction_times"))),
+              _histogram_blob(getattr(stats, f"{player}_reaction_times")))
+             for player in PLAYERS])
+        return 1
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    @staticmethod
+    def _window(last=None, since=None):
+        """Sous-requête des parties retenues : depuis since (timestamp) et/ou les last plus récentes"""
+        query = "SELECT * FROM games"
+        params = []
+        if since is not None:
+            query += " WHERE timestamp >= ?"
+            params.append(since)
+        if last is not None:
+            query += " ORDER BY timestamp DESC LIMIT ?"
+            params.append(last)
+        return query, params
+
+    def summary(self, last=None, since=None):
+        """Moyennes sur les parties retenues (par exemple last=10000 pour les 10 000 dernières)"""
+        window, params = self._window(last, since)
+        row = self.conn.execute(
+            f"SELECT COUNT(*), AVG(duration), AVG(total_hits), AVG(avg_rally_length), MAX(max_rally_length), "
+            f"AVG(ball_speed_avg), MAX(ball_speed_max), MIN(timestamp), MAX(timestamp) FROM ({window})", params).fetchone()
+        keys = ("games", "duration", "hits", "rally_length", "max_rally_length", "ball_speed", "ball_speed_max",
+                "first_timestamp", "last_timestamp")
+        return dict(zip(keys, row))
+
+    def player_summary(self, player, last=None, since=None):
+        """Victoires, précision et temps de réaction moyens d'un joueur"""
+        window, params = self._window(last, since)
+        row = self.conn.execute(
+            f"SELECT COUNT(*), SUM(p.won), AVG(p.accuracy), "
+            f"SUM(p.reaction_avg * p.reaction_count) / NULLIF(SUM(p.reaction_count), 0), AVG(p.score) "
+            f"FROM players p JOIN ({window}) g ON g.id = p.game_id WHERE p.player = ?", params + [player]).fetchone()
+        games, wins = row[0], row[1] or 0
+        return {"games": games, "wins": wins, "win_rate": wins / games if games else 0.0,
+                "accuracy": row[2], "reaction_avg": row[3], "score": row[4]}
+
+    def reaction_histogram(self, player, last=None, since=None):
+        """Histogramme cumulé des temps de réaction (bornes stats.REACTION_TIME_EDGES)"""
+        window, params = self._window(last, since)
+        total = None
+        for (blob,) in self.conn.execute(
+                f"SELECT p.reaction_times FROM players p JOIN ({window}) g ON g.id = p.game_id WHERE p.player = ?",
+                params + [player]):
+            counts = _histogram(blob)
+            if counts is not None:
+                total = counts.astype(np.int64) if total is None else total + counts
+        return total
+
+    def recent_games(self, n=10):
+        """Les n dernières parties (sans les histogrammes)"""
+        cursor = self.conn.execute(
+            "SELECT id, timestamp, duration, player1_score, player2_score, winner, total_hits, avg_rally_length, "
+            "max_rally_length FROM games ORDER BY timestamp DESC LIMIT ?", (n,))
+        names = [column[0] for column in cursor.description]
+        return [dict(zip(names, row)) for row in cursor]
+
+
+def import_json_files(db, directory, pattern="game_*.json"):
+    """Importe les anciens fichiers game_*.json (un par partie), renvoie le nombre de parties ajoutées"""
+    from stats import GameStats, Histogram, REACTION_TIME_EDGES
+    inserted = db.inserted
+    for path in sorted(glob.glob(os.path.join(directory, pattern))):
+        with open(path) as f:
+            record = json.load(f)
+        # Les listes complètes de temps de réaction deviennent des histogrammes
+        histograms = {}
+        for player in ("player1", "player2"):
+            histogram = Histogram(REACTION_TIME_EDGES)
+            for value in record.get(f"{player}_reaction_times", []):
+                histogram.add(value)
+            histograms[player] = histogram
+        fields = {name: record[name] for name in GameStats.__dataclass_fields__ if name in record}
+        fields.update(
+            player1_reaction_times=histograms["player1"].counts,
+            player2_reaction_times=histograms["player2"].counts,
+            player1_reaction_avg=histograms["player1"].mean,
+            player2_reaction_avg=histograms["player2"].mean,
+        )
+        # Les vitesses de balle individuelles n'étaient pas conservées : pas d'histogramme
+        db.add(GameStats(**fields), source=os.path.basename(path))
+    db.flush()
+    return db.inserted - inserted
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Base des stats de parties")
+    parser.add_argument("--db", default=os.path.join("stats", DB_FILE))
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    import_parser = subparsers.add_parser("import", help="Importe les fichiers game_*.json d'un dossier")
+    import_parser.add_argument("directory", nargs="?", default="stats")
+    summary_parser = subparsers.add_parser("summary", help="Moyennes sur les dernières parties")
+    summary_parser.add_argument("--last", type=int, help="Nombre de parties (toutes par défaut)")
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(args.db) or ".", exist_ok=True)
+    db = StatsDB(args.db)
+    try:
+        if args.command == "import":
+            print(f"{import_json_files(db, args.directory)} parties importées dans {args.db}")
+        else:
+            summary = db.summary(last=args.last)
+            print(f"{summary['games']} parties")
+            if summary["games"]:
+                print(f"Durée moyenne : {summary['duration']:.1f}s | Hits moyens : {summary['hits']:.1f}")
+                print(f"Longueur moyenne des échanges : {summary['rally_length']:.2f} (max {summary['max_rally_length']})")
+                print(f"Vitesse moyenne de la balle : {summary['ball_speed']:.1f}")
+                for player in PLAYERS:
+                    stats = db.player_summary(player, last=args.last)
+                    print(f"{player} : {stats['win_rate']:.1%} de victoires, précision {stats['accuracy']:.1f}%")
+    finally:
+        db.close()
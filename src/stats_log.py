@@ -0,0 +1,131 @@
+import os
+import json
+import time
+import numpy as np
+
+STATS_FILE = "training_stats.jsonl"
+LEGACY_STATS_FILE = "training_stats.json"
+
+
+class StatsLog:
+    """Journal des stats d'entraînement en JSON Lines : une ligne compacte par épisode, en ajout seulement.
+
+    Les lignes sont gardées en mémoire jusqu'à buffer_size enregistrements,
+    et le fichier n'est synchronisé sur disque (fsync) qu'au plus une fois
+    toutes les fsync_interval secondes, et à la fermeture.
+    """
+
+    def __init__(self, path, buffer_size=50, fsync_interval=30.0):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.fsync_interval = fsync_interval
+        self._buffer = []
+        self._file = open(path, "a", encoding="utf-8")
+        self._last_fsync = time.monotonic()
+
+    def append(self, **record):
+        """Ajoute l'enregistrement d'un épisode (valeurs numériques)"""
+        self._buffer.append(json.dumps(record, separators=(",", ":")))
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self, sync=False):
+        """Écrit les lignes en attente, fsync si demandé ou si le dernier date de fsync_interval"""
+        if self._buffer:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._buffer.clear()
+        self._file.flush()
+        now = time.monotonic()
+        if sync or now - self._last_fsync >= self.fsync_interval:
+            os.fsync(self._file.fileno())
+            self._last_fsync = now
+
+    def close(self):
+        if not self._file.closed:
+            self.flush(sync=True)
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _to_arrays(records, fields=None):
+    """Liste de dicts -> tableaux NumPy par champ (NaN pour les valeurs absentes)"""
+    if fields is None:
+        fields = []
+        for record in records:
+            fields.extend(key for key in record if key not in fields)
+    return {field: np.array([record.get(field, np.nan) for record in records], dtype=np.float64)
+            for field in fields}
+
+
+class StatsReader:
+    """Lecture d'un journal StatsLog sous forme de tableaux NumPy, complète, incrémentale ou par la fin"""
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0  # Position après la dernière ligne complète déjà lue par read_new
+
+    def _parse(self, data):
+        return [json.loads(line) for line in data.splitlines() if line.strip()]
+
+    def load(self, fields=None):
+        """Tout l'historique"""
+        if not os.path.exists(self.path):
+            return _to_arrays([], fields or [])
+        with open(self.path, "rb") as f:
+            return _to_arrays(self._parse(f.read()), fields)
+
+    def read_new(self, fields=None):
+        """Enregistrements ajoutés depuis le dernier appel (les lignes incomplètes sont laissées pour plus tard)"""
+        if not os.path.exists(self.path):
+            return _to_arrays([], fields or [])
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        self.offset += end
+        return _to_arrays(self._parse(data[:end]), fields)
+
+    def tail(self, n, fields=None, block_size=1 << 16):
+        """Les n derniers enregistrements, en ne lisant que la fin du fichier"""
+        if not os.path.exists(self.path):
+            return _to_arrays([], fields or [])
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            data = b""
+            # On remonte par blocs jusqu'à avoir n lignes complètes
+            while position > 0 and data.count(b"\n") <= n:
+                step = min(block_size, position)
+                position -= step
+                f.seek(position)
+                data = f.read(step) + data
+        lines = data[:data.rfind(b"\n") + 1].splitlines()  # Sans la ligne en cours d'écriture
+        if position > 0:
+            lines = lines[1:]  # Première ligne coupée par le bloc
+        return _to_arrays(self._parse(b"\n".join(lines[-n:])), fields)
+
+
+def import_json_stats(json_path, log_path):
+    """Convertit un ancien training_stats.json (dict de listes) en journal JSON Lines, renvoie le nombre d'épisodes"""
+    with open(json_path) as f:
+        stats = json.load(f)
+    # Colonnes au singulier comme les enregistrements de train()
+    names = {"episodes": "episode", "scores": "score", "avg_scores": "avg_score", "losses": "loss"}
+    columns = {names.get(key, key): values for key, values in stats.items()}
+    count = min(len(values) for values in columns.values()) if columns else 0
+    with StatsLog(log_path, buffer_size=1000) as log:
+        for i in range(count):
+            log.append(**{key: values[i] for key, values in columns.items()})
+    return count
+
+
+if __name__ == "__main__":
+    import sys
+    stats_dir = sys.argv[1] if len(sys.argv) > 1 else "training_stats"
+    count = import_json_stats(os.path.join(stats_dir, LEGACY_STATS_FILE), os.path.join(stats_dir, STATS_FILE))
+    print(f"{count} épisodes importés dans {os.path.join(stats_dir, STATS_FILE)}")
@@ -0,0 +1,224 @@
+import os
+import glob
+import json
+import hashlib
+import argparse
+import itertools
+import multiprocessing as mp
+import numpy as np
+import torch
+from vector_env import VectorPongEnv
+from q_agent import DQN, AgentConfig
+
+CACHE_FILE = "tournament_cache.json"
+STATE_SIZE = 6
+ACTION_SIZE = 3
+
+
+def file_hash(path):
+    """Empreinte du contenu d'un checkpoint : un fichier renommé ou dupliqué n'est évalué qu'une fois"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def load_policy(path):
+    """Poids du réseau principal (float32, CPU) et variante de réseau d'un checkpoint complet ou d'un export"""
+    checkpoint = torch.load(path, map_location="cpu")
+    state_dict = {name: tensor.float() for name, tensor in checkpoint['model_state_dict'].items()}
+    return state_dict, checkpoint.get('config', {})
+
+
+def mirror_observations(observations):
+    """Observations vues depuis la raquette de droite : axe x inversé, raquettes échangées"""
+    mirrored = observations.copy()
+    mirrored[:, 0] *= -1
+    mirrored[:, 2] *= -1
+    mirrored[:, 4] = observations[:, 5]
+    mirrored[:, 5] = observations[:, 4]
+    return mirrored
+
+
+# Réseaux du worker, construits une seule fois par processus
+_models = {}
+
+
+def _init_worker(policies):
+    torch.set_num_threads(1)
+    for key, (state_dict, config) in policies.items():
+        config = AgentConfig(**config)
+        model = DQN(STATE_SIZE, ACTION_SIZE, config.hidden_size, config.dueling)
+        model.load_state_dict(state_dict)
+        model.eval()
+        _models[key] = model
+
+
+def _greedy(model, observations):
+    with torch.no_grad():
+        return model(torch.from_numpy(observations)).argmax(1).numpy()
+
+
+def play_batch(left, right, episodes, difficulty=0.2, seed=0, max_steps=10000):
+    """Joue `episodes` parties en parallèle (une par environnement, actions calculées en batch).
+
+    left / right : fonctions observations -> actions. right=None fait jouer l'IA simple de
+    VectorPongEnv. Renvoie par partie : victoire de la gauche (1, 0, ou 0.5 si max_steps est
+    atteint), nombre de renvois de la gauche et longueur en frames.
+    """
+    # Service aléatoire : sans lui, toutes les parties du batch seraient identiques
+    env = VectorPongEnv(episodes, opponent_difficulty=difficulty, seed=seed, random_serve=True)
+    observations, _ = env.reset(seed=seed)
+    wins = np.full(episodes, 0.5)
+    hits = np.zeros(episodes)
+    lengths = np.full(episodes, max_steps)
+    finished = np.zeros(episodes, dtype=bool)
+
+    for _ in range(max_steps):
+        opponent_actions = right(mirror_observations(observations)) if right is not None else None
+        observations, _, dones, _, infos = env.step(left(observations), opponent_actions)
+        # Première fin de partie de chaque environnement (les suivantes sont ignorées)
+        new = dones & ~finished
+        if new.any():
+            wins[new] = infos["final_obs"][new, 0] > 0  # Balle sortie à droite : la gauche marque
+            hits[new] = infos["episode_hits"][new]
+            lengths[new] = infos["episode_lengths"][new]
+            finished |= new
+            if finished.all():
+                break
+    hits[~finished] = env.hits[~finished]
+    return wins, hits, lengths
+
+
+def _evaluate_scripted(key, difficulty, episodes, seed, max_steps):
+    model = _models[key]
+    wins, hits, lengths = play_batch(lambda obs: _greedy(model, obs), None, episodes, difficulty, seed, max_steps)
+    return {"win_rate": float(wins.mean()), "rally": float(hits.mean()), "length": float(lengths.mean())}
+
+
+def _evaluate_pair(key_a, key_b, episodes, seed, max_steps):
+    """Chaque réseau joue la moitié des parties à gauche (le service va toujours vers la droite)"""
+    model_a, model_b = _models[key_a], _models[key_b]
+    half = episodes // 2
+
+    def left(obs):
+        return np.concatenate([_greedy(model_a, obs[:half]), _greedy(model_b, obs[half:])])
+
+    def right(obs):
+        return np.concatenate([_greedy(model_b, obs[:half]), _greedy(model_a, obs[half:])])
+
+    wins, hits, lengths = play_batch(left, right, episodes, seed=seed, max_steps=max_steps)
+    wins_a = np.concatenate([wins[:half], 1 - wins[half:]])
+    return {"win_rate": float(wins_a.mean()), "rally": float(hits.mean()), "length": float(lengths.mean())}
+
+
+def _run_task(task):
+    kind, args = task
+    if kind == "scripted":
+        return task, _evaluate_scripted(*args)
+    return task, _evaluate_pair(*args)
+
+
+def run_tournament(model_dir="models", pattern="*.pth", episodes=32, difficulties=(0.0, 0.2, 0.5),
+                   round_robin=True, processes=None, seed=0, max_steps=10000):
+    """Évalue chaque checkpoint contre l'IA simple et contre les autres, renvoie le classement"""
+    paths = sorted(glob.glob(os.path.join(model_dir, pattern)))
+    hashes = {path: file_hash(path) for path in paths}
+    keys = sorted(set(hashes.values()))
+
+    # Cache par empreinte, invalidé si les paramètres d'évaluation changent
+    settings = {"episodes": episodes, "seed": seed, "max_steps": max_steps}
+    cache_path = os.path.join(model_dir, CACHE_FILE)
+    cache = {"settings": settings, "scripted": {}, "pairs": {}}
+    if os.path.exists(cache_path):
+        with open(cache_path) as f:
+            stored = json.load(f)
+        if stored.get("settings") == settings:
+            cache = stored
+
+    tasks = [("scripted", (key, difficulty, episodes, seed, max_steps))
+             for key in keys for difficulty in difficulties
+             if str(difficulty) not in cache["scripted"].get(key, {})]
+    if round_robin:
+        tasks += [("pair", (a, b, episodes, seed, max_steps))
+                  for a, b in itertools.combinations(keys, 2) if f"{a}:{b}" not in cache["pairs"]]
+
+    if tasks:
+        # Chaque checkpoint n'est chargé qu'une fois, puis envoyé aux workers
+        needed = {key for _, args in tasks for key in args[:2] if key in keys}
+        policies = {}
+        for path in paths:
+            if hashes[path] in needed and hashes[path] not in policies:
+                policies[hashes[path]] = load_policy(path)
+
+        ctx = mp.get_context("spawn")
+        with ctx.Pool(processes, initializer=_init_worker, initargs=(policies,)) as pool:
+            for (kind, args), result in pool.imap_unordered(_run_task, tasks):
+                if kind == "scripted":
+                    key, difficulty = args[:2]
+                    cache["scripted"].setdefault(key, {})[str(difficulty)] = result
+                else:
+                    cache["pairs"][f"{args[0]}:{args[1]}"] = result
+
+        with open(cache_path, "w") as f:
+            json.dump(cache, f, indent=2)
+
+    return _ranking(paths, hashes, cache, difficulties, round_robin)
+
+
+def _ranking(paths, hashes, cache, difficulties, round_robin):
+    """Une ligne par fichier, triée par taux de victoire moyen contre l'IA simple puis en round-robin"""
+    rows = []
+    for path in paths:
+        key = hashes[path]
+        scripted = [cache["scripted"][key][str(d)] for d in difficulties]
+        row = {
+            "checkpoint": os.path.basename(path),
+            "hash": key,
+            "win_rate": {str(d): result["win_rate"] for d, result in zip(difficulties, scripted)},
+            "scripted_win_rate": float(np.mean([result["win_rate"] for result in scripted])),
+            "rally": float(np.mean([result["rally"] for result in scripted])),
+            "round_robin_win_rate": None,
+        }
+        if round_robin:
+            rates = []
+            for pair, result in cache["pairs"].items():
+                a, b = pair.split(":")
+                if key == a:
+                    rates.append(result["win_rate"])
+                elif key == b:
+                    rates.append(1 - result["win_rate"])
+            row["round_robin_win_rate"] = float(np.mean(rates)) if rates else None
+        rows.append(row)
+    rows.sort(key=lambda row: (row["scripted_win_rate"], row["round_robin_win_rate"] or 0), reverse=True)
+    return rows
+
+
+def print_ranking(rows, difficulties):
+    header = "".join(f"  diff {d:<5}" for d in difficulties)
+    print(f"{'#':>3}  {'checkpoint':32s}{header}  {'moyenne':>8}  {'round-robin':>11}  {'renvois':>7}")
+    for rank, row in enumerate(rows, 1):
+        rates = "".join(f"  {row['win_rate'][str(d)]:>10.1%}" for d in difficulties)
+        round_robin = f"{row['round_robin_win_rate']:.1%}" if row["round_robin_win_rate"] is not None else "-"
+        print(f"{rank:>3}  {row['checkpoint']:32s}{rates}  {row['scripted_win_rate']:>8.1%}  {round_robin:>11}  {row['rally']:>7.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tournoi entre les checkpoints sauvegardés")
+    parser.add_argument("--model-dir", default="models")
+    parser.add_argument("--pattern", default="*.pth", help="Motif des fichiers à évaluer dans model-dir")
+    parser.add_argument("--episodes", type=int, default=32, help="Parties par match (jouées en batch)")
+    parser.add_argument("--difficulties", type=float, nargs="+", default=[0.0, 0.2, 0.5])
+    parser.add_argument("--no-round-robin", action="store_true", help="Seulement contre l'IA simple")
+    parser.add_argument("--processes", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Classement au format JSON")
+    args = parser.parse_args()
+
+    rows = run_tournament(args.model_dir, args.pattern, args.episodes, tuple(args.difficulties),
+                          not args.no_round_robin, args.processes, args.seed)
+    print_ranking(rows, args.difficulties)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(rows, f, indent=2)
@@ -1,32 +1,134 @@
 import os
 import numpy as np
+import torch
 from pong_env import PongEnv
+from vector_env import VectorPongEnv
+from actor_learner import ActorLearner
 from q_agent import QLearningAgent
-import matplotlib.pyplot as plt
-from collections import deque
-import json
+from checkpoints import CheckpointManager
+from stats_log import StatsLog, import_json_stats, STATS_FILE, LEGACY_STATS_FILE
+from plotting import ProgressPlotter
+from metrics import MetricsTracker
+from profiler import Profiler, ProfileWindow
+from recording import Recorder
 import time
 
-def plot_training_progress(scores, avg_scores, filename="training_progress.png"):
-    plt.figure(figsize=(10, 5))
-    plt.plot(scores, label='Score', alpha=0.4)
-    plt.plot(avg_scores, label='Score moyen (100 épisodes)', linewidth=2)
-    plt.xlabel('Épisode')
-    plt.ylabel('Score')
-    plt.legend()
-    plt.savefig(filename)
-    plt.close()
+def run_episodes(env, agent, profiler=None):
+    """Joue des épisodes sur un seul environnement et renvoie (score, frames, hits, steps) à chaque fin d'épisode.
+    
+    frames compte les frames de physique, steps les décisions de l'agent (frames / frame_skip de l'env).
+    """
+    profiler = profiler if profiler is not None else Profiler()
+    while True:
+        state, _ = env.reset()
+        score = 0
+        steps = 0
+        
+        while True:
+            # Sélection et exécution de l'action
+            with profiler.timer("agent.get_action"):
+                action = agent.get_action(state)
+            with profiler.timer("env.step"):
+                next_state, reward, done, _, _ = env.step(action)
+            
+            # Enregistrement dans la mémoire et entraînement
+            with profiler.timer("memory.push"):
+                agent.memory.push(state, action, reward, next_state, done)
+            with profiler.timer("agent.train_step"):
+                agent.train_step()
+            profiler.count("steps")
+            
+            state = next_state
+            score += reward
+            steps += 1
+            
+            if done:
+                break
+                
+        yield score, env.episode_frames, env.hits, steps
 
-def train(save_interval=50, model_dir="models", stats_dir="training_stats", load_model=True):
+def run_vector_episodes(env, agent, profiler=None):
+    """Fait avancer toutes les parties de VectorPongEnv en même temps et renvoie (score, frames, hits, steps) de chaque épisode terminé"""
+    profiler = profiler if profiler is not None else Profiler()
+    states, _ = env.reset()
+    scores = np.zeros(env.num_envs)
+    
+    while True:
+        with profiler.timer("agent.get_action"):
+            actions = agent.get_actions(states)
+        with profiler.timer("env.step"):
+            next_states, rewards, dones, _, infos = env.step(actions)
+        
+        # L'observation finale des parties terminées est dans infos (reset automatique)
+        final_states = next_states
+        if dones.any():
+            final_states = next_states.copy()
+            final_states[dones] = infos["final_obs"][dones]
+        
+        # Un step d'entraînement par step vectorisé
+        with profiler.timer("memory.push"):
+            agent.memory.push_batch(states, actions, rewards, final_states, dones)
+        with profiler.timer("agent.train_step"):
+            agent.train_step()
+        profiler.count("steps", env.num_envs)
+        
+        scores += rewards
+        for i in np.flatnonzero(dones):
+            # Une frame de physique par step
+            yield scores[i], infos["episode_lengths"][i], infos["episode_hits"][i], infos["episode_lengths"][i]
+            scores[i] = 0
+                
+        states = next_states
+
+def train(save_interval=50, model_dir="models", stats_dir="training_stats", load_model=True, num_envs=1, num_workers=0, prioritized=False,
+          memory_dir=None, memory_capacity=50000, updates_per_step=1, seed=None,
+          config=None, keep_last=3, keep_best=3, half_export=True, plot=True, plot_interval=30.0,
+          max_episodes=None, profile=False, profile_episodes=None, frame_skip=1, record=None):
+    """Entraîne l'agent en continu (ou max_episodes épisodes) et renvoie un résumé de l'entraînement.
+    
+    profile=True ajoute un résumé des timers à chaque affichage, profile_episodes=(début, fin)
+    enregistre un profil cProfile des épisodes début à fin - 1 dans stats_dir. frame_skip=k fait décider l'agent
+    toutes les k frames (action répétée, k fois moins de passes dans le réseau et de transitions).
+    record=chemin enregistre toutes les frames jouées (format de recording.py, compressé).
+    """
+    if frame_skip > 1 and num_envs > 1 and num_workers == 0:
+        raise ValueError("frame_skip n'est pas pris en charge par VectorPongEnv (num_envs > 1)")
+    if record is not None and (num_envs > 1 or num_workers > 0):
+        raise ValueError("record n'est pris en charge qu'avec un seul environnement")
     # Création des dossiers si nécessaire
     os.makedirs(model_dir, exist_ok=True)
     os.makedirs(stats_dir, exist_ok=True)
     
-    # Initialisation
-    env = PongEnv(opponent_difficulty=0.2)
-    state_size = env.observation_space.shape[0]
-    action_size = env.action_space.n
-    agent = QLearningAgent(state_size, action_size)
+    # Graine commune pour des courbes d'apprentissage reproductibles
+    if seed is not None:
+        np.random.seed(seed)
+        torch.manual_seed(seed)
+    
+    # Timers des chemins chauds (sans coût s'ils sont désactivés)
+    profiler = Profiler(enabled=profile)
+    profile_window = None
+    if profile_episodes is not None:
+        start, end = profile_episodes
+        profile_window = ProfileWindow(start, end, os.path.join(stats_dir, f"profile_{start}_{end}.pstats"))
+    
+    # Initialisation : un seul environnement, ou num_envs parties simulées en parallèle
+    if num_envs > 1:
+        env = VectorPongEnv(num_envs, opponent_difficulty=0.2, seed=seed)
+        state_size = env.single_observation_space.shape[0]
+        action_size = env.single_action_space.n
+    else:
+        recorder = Recorder(record, compress=True, metadata={"source": "train", "seed": seed}) if record else None
+        env = PongEnv(opponent_difficulty=0.2, profiler=profiler, frame_skip=frame_skip, recorder=recorder)
+        env.reset(seed=seed)
+        state_size = env.observation_space.shape[0]
+        action_size = env.action_space.n
+    # memory_dir : mémoire de replay sur disque, conservée après un Ctrl+C
+    agent = QLearningAgent(state_size, action_size, prioritized=prioritized,
+                           memory_capacity=memory_capacity, memory_dir=memory_dir,
+                           updates_per_step=updates_per_step, seed=seed, config=config)
+    
+    # Checkpoints écrits en arrière-plan, seuls les keep_last derniers et keep_best meilleurs sont gardés
+    checkpoints = CheckpointManager(model_dir, keep_last=keep_last, keep_best=keep_best, half=half_export)
     
     # Chargement du meilleur modèle précédent s'il existe
     best_model_path = os.path.join(model_dir, "best_model.pth")
@@ -44,21 +146,24 @@ def train(save_interval=50, model_dir="models", stats_dir="training_stats", load
         agent.epsilon_decay = 0.9995
         agent.epsilon_min = 0.05  # On garde un minimum d'exploration
     
-    # Pour le suivi des performances
-    scores = []
-    avg_scores = []
-    score_window = deque(maxlen=100)
-    best_avg_score = -np.inf
+    # Pour le suivi des performances : moyennes glissantes sur 100 épisodes et historique borné
+    metrics = MetricsTracker(("score", "loss", "length", "hits"), window=100)
+    # Meilleur score déjà indexé dans model_dir : best_model.pth n'est remplacé que s'il est battu
+    best_avg_score = checkpoints.best_score if checkpoints.best_score is not None else -np.inf
     episode = 0
+    frames = 0  # Frames de physique jouées par l'agent
+    steps = 0  # Décisions de l'agent (transitions), frames / frame_skip
+    loss = 0.0  # Lue sur le device seulement à l'affichage
     
-    # Stats d'entraînement
-    training_stats = {
-        "episodes": [],
-        "scores": [],
-        "avg_scores": [],
-        "epsilon": [],
-        "losses": []
-    }
+    # Stats d'entraînement : une ligne par épisode ajoutée au journal (l'ancien JSON est importé une fois)
+    stats_path = os.path.join(stats_dir, STATS_FILE)
+    legacy_stats_path = os.path.join(stats_dir, LEGACY_STATS_FILE)
+    if not os.path.exists(stats_path) and os.path.exists(legacy_stats_path):
+        import_json_stats(legacy_stats_path, stats_path)
+    stats_log = StatsLog(stats_path)
+    
+    # Courbes tracées en arrière-plan depuis le journal (matplotlib n'est importé que dans ce cas)
+    plotter = ProgressPlotter(stats_path, interval=plot_interval) if plot else None
     
     print("Début de l'entraînement continu (Ctrl+C pour arrêter)...")
     print(f"Epsilon initial: {agent.epsilon}")
@@ -66,42 +171,47 @@ def train(save_interval=50, model_dir="models", stats_dir="training_stats", load
     print(f"Epsilon minimum: {agent.epsilon_min}")
     start_time = time.time()
     
+    # Mode acteur/learner : les workers jouent, ce processus ne fait qu'entraîner
+    actor_learner = None
+    if num_workers > 0:
+        actor_learner = ActorLearner(agent, num_workers, opponent_difficulty=0.2, seed=seed, profiler=profiler,
+                                     frame_skip=frame_skip)
+        episodes = actor_learner.episodes()
+    elif num_envs > 1:
+        episodes = run_vector_episodes(env, agent, profiler)
+    else:
+        episodes = run_episodes(env, agent, profiler)
+    if profile_window is not None:
+        profile_window.on_episode_end(0)  # Fenêtre qui commence au premier épisode
+    
     try:
-        while True:  # Boucle infinie
+        for score, length, hits, episode_steps in episodes:  # Boucle infinie (sauf avec max_episodes)
             episode += 1
-            state, _ = env.reset()
-            score = 0
-            episode_losses = []
+            frames += length
+            steps += episode_steps
             
-            while True:
-                # Sélection et exécution de l'action
-                action = agent.get_action(state)
-                next_state, reward, done, _, _ = env.step(action)
-                
-                # Enregistrement dans la mémoire et entraînement
-                agent.memory.push(state, action, reward, next_state, done)
-                loss = agent.train_step()
-                if loss is not None:
-                    episode_losses.append(loss)
-                
-                state = next_state
-                score += reward
-                
-                if done:
-                    break
+            # Fenêtre cProfile éventuelle : l'épisode suivant est-il le premier ou le dernier + 1 ?
+            if profile_window is not None:
+                profile_report = profile_window.on_episode_end(episode)
+                if profile_report:
+                    print(f"\nProfil cProfile des épisodes {profile_window.start} à {profile_window.end - 1} "
+                          f"({profile_window.filename}) :\n{profile_report}")
+            
+            # La loss n'est relue depuis le device qu'à chaque affichage
+            new_loss = None
+            if episode % 10 == 0:
+                loss = new_loss = agent.pop_loss()
             
             # Mise à jour des stats
-            score_window.append(score)
-            scores.append(score)
-            avg_score = np.mean(score_window)
-            avg_scores.append(avg_score)
+            metrics.update(score=score, loss=new_loss, length=length, hits=hits)
+            avg_score = metrics["score"].mean
             
             # Sauvegarde des stats
-            training_stats["episodes"].append(episode)
-            training_stats["scores"].append(score)
-            training_stats["avg_scores"].append(avg_score)
-            training_stats["epsilon"].append(agent.epsilon)
-            training_stats["losses"].append(np.mean(episode_losses) if episode_losses else 0)
+            # La loss n'est écrite que pour les épisodes où elle a été relue (NaN à la lecture sinon)
+            measured = {"loss": float(new_loss)} if new_loss is not None else {}
+            with profiler.timer("stats.append"):
+                stats_log.append(episode=episode, score=float(score), avg_score=avg_score,
+                                 epsilon=agent.epsilon, length=int(length), hits=int(hits), **measured)
             
             # Affichage des progrès
             if episode % 10 == 0:
@@ -109,48 +219,70 @@ def train(save_interval=50, model_dir="models", stats_dir="training_stats", load
                 print(f"\nTemps écoulé: {elapsed_time/3600:.2f} heures")
                 print(f"Épisode {episode}")
                 print(f"Score: {score:.2f}")
-                print(f"Score moyen: {avg_score:.2f}")
+                print(f"Score moyen: {avg_score:.2f} (EMA {metrics['score'].ema:.2f}, "
+                      f"min {metrics['score'].window.min:.2f}, max {metrics['score'].window.max:.2f})")
                 print(f"Meilleur score moyen: {best_avg_score:.2f}")
-                print(f"Epsilon: {agent.epsilon:.2f}")
-                print(f"Loss: {np.mean(episode_losses) if episode_losses else 0:.4f}")
+                if actor_learner is not None:
+                    # Epsilons fixes des workers (ceux qui jouent), celui du learner n'est pas utilisé
+                    print(f"Epsilons des workers: {', '.join(f'{e:.2g}' for e in actor_learner.epsilons)}")
+                else:
+                    print(f"Epsilon: {agent.epsilon:.2f}")
+                print(f"Loss: {loss:.4f}")
+                print(f"Longueur moyenne: {metrics['length'].mean:.0f} frames | Hits moyens: {metrics['hits'].mean:.1f}")
+                print(f"Steps de l'agent: {steps} | Frames de physique: {frames} ({frames / max(elapsed_time, 1e-9):.0f} frames/s)")
+                if actor_learner is not None:
+                    transitions_per_sec, updates_per_sec = actor_learner.throughput()
+                    print(f"Transitions/s: {transitions_per_sec:.0f} | Updates/s: {updates_per_sec:.1f}")
+                if profiler.enabled:
+                    print(profiler.report())
+                    profiler.reset()
                 print("-" * 50)
             
-            # Sauvegarde du modèle
+            # Sauvegarde du modèle (best_model.pth est mis à jour par le gestionnaire)
             if episode % save_interval == 0:
-                model_path = os.path.join(model_dir, f"model_episode_{episode}.pth")
-                agent.save(model_path)
-                
-                # Si c'est le meilleur modèle, on le sauvegarde séparément
-                if avg_score > best_avg_score:
+                with profiler.timer("checkpoint.save"):
+                    is_best = checkpoints.save(agent, episode, avg_score)
+                if is_best:
                     best_avg_score = avg_score
-                    agent.save(os.path.join(model_dir, "best_model.pth"))
                     print(f"\n>>> Nouveau meilleur score moyen: {best_avg_score:.2f} !")
                     
-                # Sauvegarde des stats
-                stats_path = os.path.join(stats_dir, "training_stats.json")
-                with open(stats_path, 'w') as f:
-                    json.dump(training_stats, f, indent=2)
-                    
-                # Plot des progrès
-                plot_training_progress(scores, avg_scores)
+                # Écriture des stats en attente (lues par le plotter)
+                with profiler.timer("stats.flush"):
+                    stats_log.flush()
+            
+            if max_episodes is not None and episode >= max_episodes:
+                break
                 
     except KeyboardInterrupt:
         print("\n\nEntraînement interrompu par l'utilisateur!")
         # Sauvegarde de sécurité
         print("Sauvegarde de l'état actuel...")
-        agent.save(os.path.join(model_dir, "interrupted_model.pth"))
-        if avg_score > best_avg_score:
-            agent.save(os.path.join(model_dir, "best_model.pth"))
-        with open(os.path.join(stats_dir, "training_stats.json"), 'w') as f:
-            json.dump(training_stats, f, indent=2)
-        plot_training_progress(scores, avg_scores)
+        checkpoints.save_as(agent, "interrupted_model.pth")
+        # Checkpoint indexé comme les autres : rétention, index et best_model.pth s'il bat le meilleur score
+        if episode > 0 and checkpoints.save(agent, episode, avg_score):
+            best_avg_score = avg_score
+    
+    finally:
+        if profile_window is not None:
+            profile_window.stop()
+        if actor_learner is not None:
+            actor_learner.close()
+        # Attend la fin des écritures de checkpoints en cours
+        checkpoints.close()
+        stats_log.close()
+        if record is not None:
+            env.recorder.close()
+        if plotter is not None:
+            plotter.close()
     
     # Stats finales
     training_time = time.time() - start_time
     print("\nStats finales:")
     print(f"Durée totale: {training_time/3600:.2f} heures")
     print(f"Épisodes joués: {episode}")
+    print(f"Steps de l'agent: {steps} | Frames de physique: {frames}")
     print(f"Meilleur score moyen: {best_avg_score:.2f}")
+    return {"episodes": episode, "steps": int(steps), "frames": int(frames), "duration": training_time, "best_avg_score": best_avg_score}
 
 if __name__ == "__main__":
     # Entraînement continu
@@ -0,0 +1,124 @@
+import math
+import numpy as np
+from physics import (WINDOW_WIDTH, WINDOW_HEIGHT, BALL_SIZE, BALL_MAX_SPEED, PADDLE_WIDTH,
+                     LEFT_PADDLE_X, RIGHT_PADDLE_X)
+
+# Abscisse du centre de la balle au contact de chaque raquette
+LEFT_CONTACT_X = LEFT_PADDLE_X + PADDLE_WIDTH + BALL_SIZE / 2
+RIGHT_CONTACT_X = RIGHT_PADDLE_X - BALL_SIZE / 2
+
+
+def predict_intercept(x, y, vx, vy, target_x, height=WINDOW_HEIGHT, radius=BALL_SIZE / 2):
+    """Position y du centre de la balle quand elle atteindra target_x, rebonds sur les murs compris.
+
+    La trajectoire est dépliée en ligne droite puis repliée dans la bande
+    [radius, height - radius] : chaque rebond est un miroir. Renvoie None si
+    la balle s'éloigne de target_x. Le bruit des rebonds muraux n'est pas modélisé.
+    """
+    if vx == 0 or (target_x - x) * vx < 0:
+        return None
+    unfolded = y + vy * (target_x - x) / vx
+
+    # Repli dans la bande : période 2 * span
+    span = height - 2 * radius
+    offset = (unfolded - radius) % (2 * span)
+    if offset > span:
+        offset = 2 * span - offset
+    return radius + offset
+
+
+def predict_intercepts(x, y, vx, vy, target_x, height=WINDOW_HEIGHT, radius=BALL_SIZE / 2):
+    """Version vectorisée de predict_intercept, NaN pour les balles qui s'éloignent"""
+    x, y, vx, vy = (np.asarray(a, dtype=np.float64) for a in (x, y, vx, vy))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        unfolded = y + vy * (target_x - x) / vx
+
+    span = height - 2 * radius
+    offset = np.mod(unfolded - radius, 2 * span)
+    offset = np.where(offset > span, 2 * span - offset, offset)
+
+    approaching = (vx != 0) & ((target_x - x) * vx >= 0)
+    return np.where(approaching, radius + offset, np.nan)
+
+
+class InterceptTable:
+    """Table précalculée des interceptions, indexée par (x, y, vx, vy) quantifiés : requête en O(1).
+
+    Moins précise que predict_intercept (erreur de quantification de quelques
+    pixels) ; utile surtout pour les requêtes en batch avec lookup_many.
+    """
+
+    def __init__(self, target_x, bins=(40, 60, 24, 96), height=WINDOW_HEIGHT, width=WINDOW_WIDTH,
+                 max_speed=BALL_MAX_SPEED, radius=BALL_SIZE / 2):
+        self.target_x = target_x
+        self.bins = bins
+        # Bornes de chaque dimension (vy dépasse un peu max_speed avec l'effet de raquette)
+        self.low = np.array([0.0, 0.0, -max_speed, -1.5 * max_speed])
+        self.high = np.array([width, height, max_speed, 1.5 * max_speed])
+        self.scale = np.array(bins) / (self.high - self.low)
+
+        # Interception calculée au centre de chaque cellule
+        centers = [self.low[i] + (np.arange(bins[i]) + 0.5) / self.scale[i] for i in range(4)]
+        grid = np.meshgrid(*centers, indexing="ij")
+        self.table = predict_intercepts(*grid, target_x, height, radius).astype(np.float32)
+        self._prepare()
+
+    def _prepare(self):
+        """Copies Python des bornes pour des requêtes scalaires sans opérations NumPy"""
+        self._low = tuple(float(v) for v in self.low)
+        self._scale = tuple(float(v) for v in self.scale)
+        self._last = tuple(b - 1 for b in self.bins)
+
+    def lookup(self, x, y, vx, vy):
+        """Interception approchée (None si la balle s'éloigne)"""
+        low, scale, last = self._low, self._scale, self._last
+        index = (
+            min(max(int((x - low[0]) * scale[0]), 0), last[0]),
+            min(max(int((y - low[1]) * scale[1]), 0), last[1]),
+            min(max(int((vx - low[2]) * scale[2]), 0), last[2]),
+            min(max(int((vy - low[3]) * scale[3]), 0), last[3]),
+        )
+        value = self.table[index]
+        return None if math.isnan(value) else float(value)
+
+    def lookup_many(self, x, y, vx, vy):
+        """Version vectorisée de lookup, NaN pour les balles qui s'éloignent"""
+        values = np.stack([np.asarray(v, dtype=np.float64) for v in (x, y, vx, vy)], axis=-1)
+        indices = ((values - self.low) * self.scale).astype(np.int64)
+        indices = np.clip(indices, 0, np.array(self.bins) - 1)
+        return self.table[tuple(np.moveaxis(indices, -1, 0))]
+
+    def save(self, filename):
+        np.savez_compressed(filename, table=self.table, target_x=self.target_x, bins=self.bins,
+                            low=self.low, high=self.high)
+
+    @classmethod
+    def load(cls, filename):
+        data = np.load(filename)
+        table = cls.__new__(cls)
+        table.target_x = float(data["target_x"])
+        table.bins = tuple(int(b) for b in data["bins"])
+        table.low = data["low"]
+        table.high = data["high"]
+        table.scale = np.array(table.bins) / (table.high - table.low)
+        table.table = data["table"]
+        table._prepare()
+        return table
+
+
+def reference_action(observation, height=WINDOW_HEIGHT, width=WINDOW_WIDTH, max_speed=BALL_MAX_SPEED, dead_zone=2):
+    """Politique de référence pour la raquette gauche de PongEnv (démonstrations) à partir d'une observation"""
+    ball_x = (observation[0] + 1) * width / 2
+    ball_y = (observation[1] + 1) * height / 2
+    vx = observation[2] * max_speed
+    vy = observation[3] * max_speed
+    paddle_y = (observation[4] + 1) * height / 2
+
+    target_y = predict_intercept(ball_x, ball_y, vx, vy, LEFT_CONTACT_X, height)
+    if target_y is None:
+        target_y = height / 2  # La balle s'éloigne : retour au centre
+    if paddle_y < target_y - dead_zone:
+        return 2  # Descendre
+    if paddle_y > target_y + dead_zone:
+        return 1  # Monter
+    return 0
@@ -0,0 +1,221 @@
+import numpy as np
+from gymnasium import spaces
+from gymnasium.vector import VectorEnv, AutoresetMode
+from gymnasium.vector.utils import batch_space
+from physics import (WINDOW_WIDTH, WINDOW_HEIGHT, PADDLE_WIDTH, PADDLE_HEIGHT, PADDLE_SPEED,
+                     BALL_SIZE, BALL_BASE_SPEED, BALL_MIN_ANGLE, BALL_MAX_SPEED, BALL_MAX_ANGLE, PADDLE_EFFECT, SPEED_UP,
+                     LEFT_PADDLE_X, RIGHT_PADDLE_X, PADDLE_START_Y, BALL_START_X, BALL_START_Y,
+                     MAX_SPEED_Y_RATIO, SIN_MIN_ANGLE)
+from pong_env import OPPONENT_MODES
+from trajectory import predict_intercepts, RIGHT_CONTACT_X
+
+
+class VectorPongEnv(VectorEnv):
+    """N parties de Pong simulées en parallèle avec des tableaux NumPy.
+
+    Chaque attribut de l'état (balle, raquettes, compteurs) est un tableau
+    de taille N, et `step` fait avancer toutes les parties en un seul appel
+    vectorisé avec la même physique que `physics.Ball`, `physics.Paddle` et
+    l'adversaire de `PongEnv`. Les parties terminées sont réinitialisées dans le même
+    step : l'observation finale est alors dans `infos["final_obs"]`.
+    """
+
+    metadata = {"render_modes": [], "autoreset_mode": AutoresetMode.SAME_STEP}
+
+    def __init__(self, num_envs, opponent_difficulty=0.2, seed=None, opponent_mode="tracker", random_serve=False):
+        if opponent_mode not in OPPONENT_MODES:
+            raise ValueError(f"opponent_mode inconnu : {opponent_mode}")
+        self.num_envs = num_envs
+        self.opponent_difficulty = opponent_difficulty
+        self.opponent_mode = opponent_mode
+        # Service avec un angle aléatoire comme Ball.reset (toujours vers la droite), sinon à plat
+        self.random_serve = random_serve
+
+        # Mêmes espaces que PongEnv, pour un seul environnement puis en batch
+        self.single_observation_space = spaces.Box(low=-1, high=1, shape=(6,), dtype=np.float32)
+        self.single_action_space = spaces.Discrete(3)
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+        self.action_space = batch_space(self.single_action_space, num_envs)
+
+        self._rng = np.random.default_rng(seed)
+
+        # Structure-of-arrays : une case par partie
+        self.ball_x = np.zeros(num_envs)
+        self.ball_y = np.zeros(num_envs)
+        self.ball_vx = np.zeros(num_envs)
+        self.ball_vy = np.zeros(num_envs)
+        self.ball_hits = np.zeros(num_envs, dtype=np.int64)
+        self.paddle_y = np.zeros(num_envs)
+        self.paddle_movement = np.zeros(num_envs)
+        self.opponent_y = np.zeros(num_envs)
+        self.opponent_movement = np.zeros(num_envs)
+        self.hits = np.zeros(num_envs, dtype=np.int64)
+        self.last_distance = np.zeros(num_envs)
+        self.episode_lengths = np.zeros(num_envs, dtype=np.int64)
+        self.dones = np.zeros(num_envs, dtype=bool)
+
+        self._observations = np.zeros((num_envs, 6), dtype=np.float32)
+
+        self.reset(seed=seed)
+
+    def reset(self, seed=None, options=None):
+        if seed is not None:
+            self._rng = np.random.default_rng(seed)
+        self._reset_envs(np.ones(self.num_envs, dtype=bool))
+        return self._get_observations().copy(), {}
+
+    def _reset_envs(self, mask):
+        """Remet à zéro les parties sélectionnées par le masque"""
+        self.ball_x[mask] = BALL_START_X
+        self.ball_y[mask] = BALL_START_Y
+        self.ball_vx[mask] = BALL_BASE_SPEED
+        self.ball_vy[mask] = 0
+        if self.random_serve:
+            count = int(np.count_nonzero(mask))
+            angles = self._rng.uniform(BALL_MIN_ANGLE, 45, count) * self._rng.choice([-1, 1], count)
+            self.ball_vy[mask] = BALL_BASE_SPEED * np.tan(np.radians(angles))
+        self.ball_hits[mask] = 0
+        self.paddle_y[mask] = PADDLE_START_Y
+        self.paddle_movement[mask] = 0
+        self.opponent_y[mask] = PADDLE_START_Y
+        self.opponent_movement[mask] = 0
+        self.hits[mask] = 0
+        self.episode_lengths[mask] = 0
+        self.dones[mask] = False
+        self.last_distance[mask] = np.abs(
+            (self.paddle_y[mask] + PADDLE_HEIGHT / 2) - (self.ball_y[mask] + BALL_SIZE / 2)
+        )
+
+    def _move_paddles(self, y, movement, up, down):
+        """Équivalent vectorisé de Paddle.move (movement n'est mis à jour que si move est appelé)"""
+        previous_y = y.copy()
+        y[up & (y > 0)] -= PADDLE_SPEED
+        y[down & (y + PADDLE_HEIGHT < WINDOW_HEIGHT)] += PADDLE_SPEED
+        moved = up | down
+        movement[moved] = (y - previous_y)[moved]
+
+    def _bounce_on_paddle(self, mask, paddle_y, paddle_movement):
+        """Équivalent vectorisé de Ball.bounce("x", paddle)"""
+        vx = -self.ball_vx[mask]
+
+        relative_intersect_y = (paddle_y[mask] + PADDLE_HEIGHT / 2) - (self.ball_y[mask] + BALL_SIZE / 2)
+        normalized_intersect = relative_intersect_y / (PADDLE_HEIGHT / 2)
+        too_flat = np.abs(normalized_intersect) < SIN_MIN_ANGLE
+        normalized_intersect[too_flat] = np.copysign(SIN_MIN_ANGLE, normalized_intersect[too_flat])
+
+        bounce_angle = np.radians(normalized_intersect * BALL_MAX_ANGLE)
+        paddle_effect = paddle_movement[mask] * PADDLE_EFFECT
+
+        speed = np.minimum(np.abs(vx) + SPEED_UP, BALL_MAX_SPEED)
+        self.ball_vx[mask] = np.copysign(speed * np.cos(bounce_angle), vx)
+        self.ball_vy[mask] = speed * -np.sin(bounce_angle) + paddle_effect
+        self.ball_hits[mask] += 1
+
+    def _collides(self, paddle_x, paddle_y):
+        """Équivalent vectorisé de Rect.colliderect entre la balle et une raquette"""
+        return (
+            (self.ball_x < paddle_x + PADDLE_WIDTH) & (paddle_x < self.ball_x + BALL_SIZE)
+            & (self.ball_y < paddle_y + PADDLE_HEIGHT) & (paddle_y < self.ball_y + BALL_SIZE)
+        )
+
+    def step(self, actions, opponent_actions=None):
+        """opponent_actions (mêmes codes que actions) remplace l'IA simple pour la raquette de droite"""
+        actions = np.asarray(actions)
+        n = self.num_envs
+
+        # Action des agents
+        self._move_paddles(self.paddle_y, self.paddle_movement, actions == 1, actions == 2)
+
+        if opponent_actions is not None:
+            opponent_actions = np.asarray(opponent_actions)
+            self._move_paddles(self.opponent_y, self.opponent_movement, opponent_actions == 1, opponent_actions == 2)
+        else:
+            # IA simple pour les adversaires
+            target_y = self.ball_y + BALL_SIZE / 2
+            if self.opponent_mode == "predictive":
+                intercepts = predict_intercepts(self.ball_x + BALL_SIZE / 2, target_y, self.ball_vx, self.ball_vy,
+                                                RIGHT_CONTACT_X)
+                target_y = np.where(np.isnan(intercepts), target_y, intercepts)
+            target_y = target_y + self._rng.uniform(-50, 50, n) * self.opponent_difficulty
+            opponent_centery = self.opponent_y + PADDLE_HEIGHT / 2
+            go_down = opponent_centery < target_y - 2
+            go_up = ~go_down & (opponent_centery > target_y + 2)
+            self._move_paddles(self.opponent_y, self.opponent_movement, go_up, go_down)
+
+        # Mouvement de la balle (Ball.move)
+        self.ball_vx = np.where(
+            np.abs(self.ball_vx) < BALL_BASE_SPEED, np.copysign(BALL_BASE_SPEED, self.ball_vx), self.ball_vx
+        )
+        max_speed_y = np.abs(self.ball_vx) * MAX_SPEED_Y_RATIO
+        self.ball_vy = np.clip(self.ball_vy, -max_speed_y, max_speed_y)
+        self.ball_x += self.ball_vx
+        self.ball_y += self.ball_vy
+
+        # Collisions avec les murs
+        wall = (self.ball_y <= 0) | (self.ball_y + BALL_SIZE >= WINDOW_HEIGHT)
+        self.ball_vy[wall] = -self.ball_vy[wall] + self._rng.uniform(-0.5, 0.5, int(wall.sum()))
+
+        # Collisions avec les raquettes
+        paddle_hit = self._collides(LEFT_PADDLE_X, self.paddle_y)
+        opponent_hit = ~paddle_hit & self._collides(RIGHT_PADDLE_X, self.opponent_y)
+        if paddle_hit.any():
+            self._bounce_on_paddle(paddle_hit, self.paddle_y, self.paddle_movement)
+            self.hits[paddle_hit] += 1
+        if opponent_hit.any():
+            self._bounce_on_paddle(opponent_hit, self.opponent_y, self.opponent_movement)
+
+        # Points et fin d'épisode
+        missed = self.ball_x <= 0
+        opponent_missed = ~missed & (self.ball_x + BALL_SIZE >= WINDOW_WIDTH)
+        terminated = missed | opponent_missed
+
+        # Calcul de la récompense (même barème que PongEnv._calculate_reward)
+        rewards = np.zeros(n, dtype=np.float32)
+        rewards[missed] -= 2.0
+        rewards[opponent_missed] += 2.0
+
+        paddle_centery = self.paddle_y + PADDLE_HEIGHT / 2
+        ball_centery = self.ball_y + BALL_SIZE / 2
+        distance = np.abs(paddle_centery - ball_centery)
+
+        # La balle n'a pas bougé depuis le rebond : la collision est la même
+        accuracy = np.maximum(0, 1 - distance / (PADDLE_HEIGHT / 2))
+        rewards[paddle_hit] += 0.5 + accuracy[paddle_hit] * 0.3
+
+        approaching = (self.ball_vx < 0) & (distance < self.last_distance)
+        rewards[approaching] += 0.1
+
+        self.last_distance = distance
+        self.episode_lengths += 1
+        self.dones = terminated.copy()
+
+        observations = self._get_observations()
+        truncations = np.zeros(n, dtype=bool)
+        infos = {}
+
+        # Réinitialisation automatique des parties terminées
+        if terminated.any():
+            infos = {
+                "final_obs": observations.copy(),
+                "_final_obs": terminated.copy(),
+                "episode_hits": self.hits.copy(),
+                "episode_lengths": self.episode_lengths.copy(),
+            }
+            self._reset_envs(terminated)
+            observations = self._get_observations()
+
+        return observations.copy(), rewards, terminated.copy(), truncations, infos
+
+    def _get_observations(self):
+        # Normalisation des observations entre -1 et 1 (voir PongEnv._get_observation)
+        obs = self._observations
+        obs[:, 0] = (self.ball_x + BALL_SIZE / 2) / (WINDOW_WIDTH / 2) - 1
+        obs[:, 1] = (self.ball_y + BALL_SIZE / 2) / (WINDOW_HEIGHT / 2) - 1
+        obs[:, 2] = self.ball_vx / BALL_MAX_SPEED
+        obs[:, 3] = self.ball_vy / BALL_MAX_SPEED
+        obs[:, 4] = (self.paddle_y + PADDLE_HEIGHT / 2) / (WINDOW_HEIGHT / 2) - 1
+        obs[:, 5] = (self.opponent_y + PADDLE_HEIGHT / 2) / (WINDOW_HEIGHT / 2) - 1
+        return obs
+
+    def close(self, **kwargs):
+        pass
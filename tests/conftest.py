@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Les modules de src/ s'importent entre eux par leur nom (lancement depuis src/)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+# pygame sans fenêtre
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
@@ -0,0 +1,81 @@
+import queue
+import threading
+import time
+import numpy as np
+import pytest
+from actor_learner import worker_epsilon, _run_worker, ActorLearner
+from q_agent import DQN, QLearningAgent
+
+
+def test_worker_epsilons_from_explorer_to_greedy():
+    epsilons = [worker_epsilon(i, 4) for i in range(4)]
+    assert epsilons[0] == pytest.approx(0.4)
+    assert epsilons == sorted(epsilons, reverse=True)
+    assert epsilons[-1] == pytest.approx(0.4 ** 8)
+    assert worker_epsilon(0, 1) == pytest.approx(0.4)
+
+
+def test_worker_chunks_are_consecutive_transitions():
+    transitions = queue.Queue()
+    stop_event = threading.Event()
+    chunk_size = 64
+    worker = threading.Thread(target=_run_worker, args=(
+        0, DQN(6, 3), transitions, stop_event, 0.5, 0.2, chunk_size, 1000, 0, 128, False))
+    worker.start()
+    try:
+        chunk = transitions.get(timeout=30)
+    finally:
+        stop_event.set()
+        worker.join()
+
+    worker_id, states, actions, rewards, next_states, dones, _ = chunk
+    assert worker_id == 0 and len(actions) == chunk_size
+    # Hors fin d'épisode, l'état suivant est l'état du step d'après
+    continuing = dones[:-1].numpy() == 0
+    np.testing.assert_array_equal(next_states[:-1].numpy()[continuing], states[1:].numpy()[continuing])
+
+
+def test_learner_receives_worker_transitions():
+    agent = QLearningAgent(6, 3, device="cpu", memory_capacity=5000, seed=0)
+    agent.train_start = 200
+    actor_learner = ActorLearner(agent, 1, chunk_size=100, seed=0)
+    try:
+        episodes = actor_learner.episodes()
+        score, frames, hits, steps = next(episodes)
+    finally:
+        actor_learner.close()
+    assert frames >= steps > 0
+    assert len(agent.memory) >= agent.train_start
+    assert actor_learner.transition_count == len(agent.memory)
+
+
+def test_worker_blocked_on_full_queue_sees_stop():
+    transitions = queue.Queue(maxsize=1)
+    stop_event = threading.Event()
+    worker = threading.Thread(target=_run_worker, args=(
+        0, DQN(6, 3), transitions, stop_event, 0.5, 0.2, 16, 1000, 0, 128, False), daemon=True)
+    worker.start()
+    try:
+        transitions.get(timeout=30)
+        while not transitions.full():
+            time.sleep(0.01)
+        time.sleep(0.2)  # Le worker attend de pouvoir envoyer le paquet suivant
+    finally:
+        stop_event.set()
+        worker.join(timeout=5)
+    assert not worker.is_alive()
+
+
+def test_close_stops_workers_without_terminate():
+    agent = QLearningAgent(6, 3, device="cpu", memory_capacity=5000, seed=0)
+    actor_learner = ActorLearner(agent, 2, chunk_size=16, queue_size=1, seed=0)
+    for worker in actor_learner.workers:
+        worker.start()
+    # File pleine : les workers sont bloqués sur leur envoi
+    deadline = time.time() + 60
+    while not actor_learner.transitions.full() and time.time() < deadline:
+        time.sleep(0.05)
+    time.sleep(0.5)
+    actor_learner.close()
+    # Arrêt propre : sans terminate, le code de sortie est 0
+    assert [worker.exitcode for worker in actor_learner.workers] == [0, 0]
@@ -0,0 +1,41 @@
+import json
+import os
+import pytest
+from benchmarks import run_suite, compare
+from benchmarks.__main__ import main
+
+
+def _results(**values):
+    return {"results": {key: {"value": value, "unit": "", "higher_is_better": higher}
+                        for key, (value, higher) in values.items()}}
+
+
+def test_compare_flags_regressions_in_both_directions():
+    baseline = _results(steps=(100.0, True), latency=(10.0, False), new=(1.0, True))
+    current = _results(steps=(85.0, True), latency=(9.0, False), other=(5.0, True))
+    rows = {row[0]: row for row in compare(current, baseline, threshold=0.10)}
+    assert set(rows) == {"steps", "latency"}  # Clés absentes de la référence ignorées
+    assert rows["steps"][3] == pytest.approx(-0.15) and rows["steps"][4] is True
+    assert rows["latency"][4] is False and rows["latency"][3] > 0
+
+
+def test_suite_output_and_baseline(tmp_path):
+    results = run_suite(["env"], quick=True, repeats=1, verbose=False)
+    assert results["meta"]["quick"] and results["results"]["env_steps_per_sec"]["value"] > 0
+
+    output = str(tmp_path / "results.json")
+    assert main(["env", "--quick", "--repeats", "1", "--output", output]) == 0
+    # Référence dix fois plus rapide : régression signalée par le code de sortie
+    with open(output) as f:
+        baseline = json.load(f)
+    baseline["results"]["env_steps_per_sec"]["value"] *= 10
+    with open(output, "w") as f:
+        json.dump(baseline, f)
+    assert main(["env", "--quick", "--repeats", "1", "--baseline", output]) == 1
+
+
+def test_committed_baseline_is_readable():
+    path = os.path.join(os.path.dirname(__file__), os.pardir, "src", "benchmarks", "baseline_quick.json")
+    with open(path) as f:
+        baseline = json.load(f)
+    assert baseline["meta"]["quick"] and baseline["results"]
@@ -0,0 +1,59 @@
+import json
+import os
+import threading
+import pytest
+import torch
+from checkpoints import CheckpointManager, BEST_MODEL_FILE, INDEX_FILE
+from q_agent import QLearningAgent
+
+
+@pytest.fixture
+def agent(tmp_path):
+    torch.manual_seed(0)
+    return QLearningAgent(6, 3, device="cpu", memory_capacity=100, memory_dir=str(tmp_path / "memory"), seed=0)
+
+
+@pytest.mark.parametrize("async_save", [True, False])
+def test_retention_keeps_last_and_best(tmp_path, agent, async_save):
+    model_dir = str(tmp_path / "models")
+    manager = CheckpointManager(model_dir, keep_last=2, keep_best=1, async_save=async_save)
+    scores = [5.0, 9.0, 1.0, 2.0, 3.0]
+    best = [manager.save(agent, episode, score) for episode, score in enumerate(scores, 1)]
+    manager.close()
+
+    assert best == [True, True, False, False, False]
+    kept = sorted(entry["episode"] for entry in manager.entries)
+    assert kept == [2, 4, 5]
+    files = set(os.listdir(model_dir))
+    for episode in (1, 3):
+        assert f"model_episode_{episode}.pth" not in files
+    assert {BEST_MODEL_FILE, INDEX_FILE, "policy_episode_2.pth"} <= files
+
+    # Un nouveau gestionnaire reprend l'index et le meilleur score
+    with open(os.path.join(model_dir, INDEX_FILE)) as f:
+        assert json.load(f)["best_score"] == 9.0
+    reopened = CheckpointManager(model_dir, async_save=False)
+    assert reopened.best_score == 9.0 and reopened.best()["episode"] == 2
+
+
+def test_export_is_half_precision_weights_only(tmp_path, agent):
+    manager = CheckpointManager(str(tmp_path / "models"), async_save=False)
+    manager.save(agent, 1, 0.0)
+    export = torch.load(str(tmp_path / "models" / "policy_episode_1.pth"))
+    assert set(export) == {"model_state_dict", "config"}
+    assert all(tensor.dtype == torch.float16 for tensor in export["model_state_dict"].values())
+
+
+def test_async_save_flushes_memory_on_writer_thread(tmp_path, agent):
+    threads = []
+    flush = agent.memory.flush
+
+    def recording_flush(cursor=None):
+        threads.append(threading.current_thread().name)
+        flush(cursor)
+
+    agent.memory.flush = recording_flush
+    manager = CheckpointManager(str(tmp_path / "models"))
+    manager.save(agent, 1, 0.0)
+    manager.close()
+    assert threads == ["checkpoint-writer"]
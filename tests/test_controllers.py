@@ -0,0 +1,78 @@
+import threading
+import time
+import pytest
+from physics import Ball, Paddle, LEFT_PADDLE_X, RIGHT_PADDLE_X, PADDLE_START_Y, BALL_START_X, BALL_START_Y
+from controllers import AsyncController, apply_action, NONE, UP, DOWN
+
+
+class Follower:
+    """Contrôleur de test : suit la balle, optionnellement avec un délai de calcul"""
+
+    def __init__(self, paddle, delay=0.0):
+        self.paddle = paddle
+        self.delay = delay
+        self.threads = set()
+
+    def decide(self, ball, current_time):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        if ball.rect.centery < self.paddle.rect.centery:
+            return UP
+        return DOWN if ball.rect.centery > self.paddle.rect.centery else NONE
+
+
+def _play(controller, ball, frames, frame_time=0.01):
+    for frame in range(frames):
+        ball.rect.y = 100 + frame  # Balle en haut de l'écran : la raquette doit monter
+        controller.update(ball, frame / 60)
+        time.sleep(frame_time)
+
+
+def test_apply_action():
+    paddle = Paddle(LEFT_PADDLE_X, PADDLE_START_Y)
+    apply_action(paddle, UP)
+    apply_action(paddle, NONE)
+    assert paddle.rect.y == PADDLE_START_Y - paddle.speed
+    apply_action(paddle, DOWN)
+    assert paddle.rect.y == PADDLE_START_Y
+
+
+def test_decisions_run_on_worker_thread_and_move_paddle():
+    paddle = Paddle(LEFT_PADDLE_X, PADDLE_START_Y)
+    follower = Follower(paddle)
+    controller = AsyncController(follower, latency_budget=0.5, name="test-ai")
+    try:
+        _play(controller, Ball(BALL_START_X, BALL_START_Y), 30)
+    finally:
+        controller.close()
+    assert follower.threads == {"test-ai"}
+    # Le contrôleur ne touche qu'à sa copie de la raquette, le jeu applique ses décisions
+    assert follower.paddle is not paddle
+    assert paddle.rect.y < PADDLE_START_Y
+    stats = controller.stats()
+    assert stats["frames"] == 29 and stats["missed"] <= 2
+
+
+def test_slow_decisions_are_missed():
+    paddle = Paddle(RIGHT_PADDLE_X, PADDLE_START_Y)
+    controller = AsyncController(Follower(paddle, delay=0.02), latency_budget=0.001)
+    try:
+        _play(controller, Ball(BALL_START_X, BALL_START_Y), 20)
+    finally:
+        controller.close()
+    stats = controller.stats()
+    assert stats["missed"] == stats["frames"] == 19
+    assert stats["latency_ms"]["mean"] >= 20
+
+
+def test_worker_error_is_raised_on_update():
+    class Failing(Follower):
+        def decide(self, ball, current_time):
+            raise ValueError("boom")
+
+    controller = AsyncController(Failing(Paddle(LEFT_PADDLE_X, PADDLE_START_Y)))
+    ball = Ball(BALL_START_X, BALL_START_Y)
+    controller.update(ball, 0.0)
+    controller.thread.join(5)
+    with pytest.raises(RuntimeError):
+        controller.update(ball, 0.1)
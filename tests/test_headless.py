@@ -0,0 +1,30 @@
+from dataclasses import asdict
+import pytest
+from main import Game, run_headless_matches, WINNING_SCORE
+
+
+def _without_timestamp(stats):
+    fields = asdict(stats)
+    del fields["timestamp"]  # Départ réel de la partie
+    return fields
+
+
+def test_headless_match_is_reproducible(tmp_path):
+    results = []
+    for _ in range(2):
+        game = Game(headless=True, seed=7, stats_dir=str(tmp_path), verbose=False)
+        try:
+            results.append(game.play_match())
+        finally:
+            game.close()
+    stats = results[0]
+    assert max(stats.player1_score, stats.player2_score) == WINNING_SCORE
+    assert stats.duration == pytest.approx(game.frame / 60, abs=1e-3)  # Temps simulé
+    assert _without_timestamp(results[0]) == _without_timestamp(results[1])
+
+
+def test_parallel_matches_match_sequential(tmp_path):
+    sequential = run_headless_matches(3, processes=1, seed=0, stats_dir=str(tmp_path / "sequential"))
+    parallel = run_headless_matches(3, processes=2, seed=0, stats_dir=str(tmp_path / "parallel"))
+    assert [_without_timestamp(stats) for stats in sequential] == [_without_timestamp(stats) for stats in parallel]
+    assert len({stats.duration for stats in sequential}) > 1  # Une graine par partie
@@ -0,0 +1,47 @@
+import math
+import numpy as np
+import pytest
+from metrics import RollingWindow, P2Quantile, ChunkedHistory, MetricsTracker
+
+
+def test_rolling_window_matches_last_values():
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=1000)
+    window = RollingWindow(100)
+    assert math.isnan(window.mean)
+    for i, value in enumerate(values):
+        window.update(value)
+        recent = values[max(0, i - 99):i + 1]
+        assert window.mean == pytest.approx(recent.mean())
+        assert (window.min, window.max) == (recent.min(), recent.max())
+    assert window.percentile(90) == pytest.approx(np.percentile(values[-100:], 90))
+
+
+@pytest.mark.parametrize("q", [0.5, 0.9, 0.99])
+def test_p2_quantile_estimate(q):
+    values = np.random.default_rng(1).exponential(size=20000)
+    estimator = P2Quantile(q)
+    for value in values:
+        estimator.update(value)
+    assert estimator.value == pytest.approx(np.quantile(values, q), rel=0.05)
+
+
+def test_chunked_history_is_bounded_and_keeps_means():
+    history = ChunkedHistory(chunk_size=8, max_chunks=4)
+    values = np.arange(1000, dtype=np.float64)
+    for value in values:
+        history.append(value)
+    x, stored = history.values()
+    assert len(history) == 1000
+    assert len(stored) <= 8 * 4 and history.stride > 1
+    # Chaque point est la moyenne des valeurs qu'il remplace, placé au milieu de celles-ci
+    np.testing.assert_allclose(stored, x)
+
+
+def test_tracker_ignores_missing_values():
+    tracker = MetricsTracker(("score", "loss"), window=10)
+    tracker.update(score=1.0, loss=None)
+    tracker.update(score=3.0, loss=0.5)
+    assert tracker["score"].mean == 2.0
+    assert len(tracker["loss"].window) == 1
+    assert tracker.summary()["score"]["max"] == 3.0
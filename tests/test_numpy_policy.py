@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+import torch
+from physics import Ball, Paddle, WINDOW_WIDTH, LEFT_PADDLE_X, RIGHT_PADDLE_X, PADDLE_START_Y, BALL_START_X, BALL_START_Y
+from numpy_policy import export_npz, NumpyDQN, DQNPolicy, load_model
+from q_agent import DQN
+
+
+@pytest.mark.parametrize("dueling", [False, True])
+def test_numpy_forward_matches_torch(tmp_path, dueling):
+    torch.manual_seed(0)
+    model = DQN(6, 3, 64, dueling)
+    checkpoint_path, npz_path = str(tmp_path / "model.pth"), str(tmp_path / "model.npz")
+    torch.save({"model_state_dict": model.state_dict(), "config": {"hidden_size": 64, "dueling": dueling}},
+               checkpoint_path)
+    export_npz(checkpoint_path, npz_path)
+
+    numpy_model = load_model(npz_path)
+    assert isinstance(numpy_model, NumpyDQN) and numpy_model.dueling == dueling
+    observations = np.random.default_rng(0).uniform(-1, 1, (256, 6)).astype(np.float32)
+    with torch.no_grad():
+        expected = model(torch.from_numpy(observations)).numpy()
+    np.testing.assert_allclose(numpy_model(observations), expected, rtol=1e-5, atol=1e-5)
+    np.testing.assert_allclose(load_model(checkpoint_path)(observations), expected, rtol=1e-6, atol=1e-6)
+
+
+def test_policy_mirrors_right_paddle():
+    left, right = Paddle(LEFT_PADDLE_X, PADDLE_START_Y), Paddle(RIGHT_PADDLE_X, PADDLE_START_Y + 40)
+    ball = Ball(BALL_START_X + 100, BALL_START_Y)
+    ball.speed_x, ball.speed_y = 6, 2
+    left_view = DQNPolicy(left, right, None).observe(ball).copy()
+
+    # Situation symétrique vue depuis la droite : même observation
+    mirrored_ball = Ball(WINDOW_WIDTH - ball.rect.right, BALL_START_Y)
+    mirrored_ball.speed_x, mirrored_ball.speed_y = -6, 2
+    right_view = DQNPolicy(right, left, None).observe(mirrored_ball)
+    # Raquettes échangées : la raquette "propre" de la droite est l'adversaire de la gauche
+    np.testing.assert_allclose(right_view[0], left_view[0, [0, 1, 2, 3, 5, 4]])
+
+
+def test_policy_moves_paddle_with_argmax():
+    paddle, opponent = Paddle(LEFT_PADDLE_X, PADDLE_START_Y), Paddle(RIGHT_PADDLE_X, PADDLE_START_Y)
+
+    def always_down(observations):
+        return np.array([[0.0, 0.0, 1.0]])
+
+    policy = DQNPolicy(paddle, opponent, always_down)
+    policy.update(Ball(BALL_START_X, BALL_START_Y), 0.0)
+    assert paddle.rect.y == PADDLE_START_Y + paddle.speed
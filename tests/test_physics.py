@@ -0,0 +1,55 @@
+import os
+import random
+import subprocess
+import sys
+import physics
+from physics import (Ball, Paddle, step_ball, WINDOW_HEIGHT, BALL_START_X, BALL_START_Y, LEFT_PADDLE_X,
+                     RIGHT_PADDLE_X, PADDLE_START_Y, BALL_BASE_SPEED, SPEED_UP)
+
+
+def _rally(seed, frames=3000):
+    ball = Ball(BALL_START_X, BALL_START_Y, rng=random.Random(seed))
+    ball.reset(BALL_START_X, BALL_START_Y)
+    left, right = Paddle(LEFT_PADDLE_X, PADDLE_START_Y), Paddle(RIGHT_PADDLE_X, PADDLE_START_Y)
+    events = []
+    for _ in range(frames):
+        # Raquettes qui suivent la balle
+        for paddle in (left, right):
+            if abs(paddle.rect.centery - ball.rect.centery) > 10:
+                paddle.move(up=paddle.rect.centery > ball.rect.centery)
+        result = step_ball(ball, left, right)
+        events.append((ball.rect.x, ball.rect.y, result))
+        if result.left_missed or result.right_missed:
+            break
+    return events
+
+
+def test_importable_without_pygame():
+    code = "import sys, physics; assert 'pygame' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(physics.__file__))
+
+
+def test_deterministic_with_seeded_rng():
+    assert _rally(3) == _rally(3)
+    assert _rally(3) != _rally(4)
+
+
+def test_paddle_bounce_speeds_up_and_reverses():
+    ball = Ball(LEFT_PADDLE_X + 10, PADDLE_START_Y + 30)
+    ball.speed_x = -BALL_BASE_SPEED
+    paddle = Paddle(LEFT_PADDLE_X, PADDLE_START_Y)
+    ball.bounce("x", paddle)
+    assert ball.speed_x > 0
+    assert abs(complex(ball.speed_x, ball.speed_y)) == BALL_BASE_SPEED + SPEED_UP
+    assert ball.hits == 1
+
+
+def test_paddle_stays_on_screen():
+    paddle = Paddle(LEFT_PADDLE_X, PADDLE_START_Y)
+    for _ in range(200):
+        paddle.move(up=False)
+    assert paddle.rect.bottom <= WINDOW_HEIGHT + paddle.speed
+    assert paddle.movement == 0
+    for _ in range(200):
+        paddle.move(up=True)
+    assert paddle.rect.top >= -paddle.speed
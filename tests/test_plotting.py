@@ -0,0 +1,35 @@
+import os
+import numpy as np
+import pytest
+from plotting import BoundedHistory, ProgressPlotter
+from stats_log import StatsLog
+
+
+def test_bounded_history_keeps_means():
+    history = BoundedHistory(10)
+    history.extend(np.arange(7.0))
+    x, y = history.data()
+    assert x.tolist() == list(range(7)) and y.tolist() == list(range(7))
+
+    # Ajouts par morceaux de tailles quelconques : taille bornée, paquets fusionnés deux à deux
+    values = np.arange(1000.0)
+    for chunk in np.array_split(values[7:], [1, 5, 6, 100, 101, 500]):
+        history.extend(chunk)
+    x, y = history.data()
+    assert len(history) == 1000 and history.sums.shape == (10,) and len(x) <= 11
+    # Moyenne de chaque paquet au centre du paquet : droite conservée
+    np.testing.assert_allclose(y, x)
+    weights = np.append(np.full(history.bins, history.bin_size), history.partial_count)[:len(y)]
+    assert np.average(y, weights=weights) == pytest.approx(values.mean())
+
+
+def test_plotter_draws_on_close(tmp_path):
+    pytest.importorskip("matplotlib")
+    stats_path, filename = str(tmp_path / "stats.jsonl"), str(tmp_path / "progress.png")
+    with StatsLog(stats_path) as log:
+        for episode in range(50):
+            log.append(episode=episode, score=float(episode), avg_score=episode / 2)
+    plotter = ProgressPlotter(stats_path, filename, interval=3600)
+    plotter.close()
+    assert not plotter.worker.is_alive()
+    assert os.path.getsize(filename) > 0
@@ -0,0 +1,62 @@
+import numpy as np
+from pong_env import PongEnv
+
+
+def _episode(env, seed, actions):
+    observation, _ = env.reset(seed=seed)
+    trajectory = [observation]
+    for action in actions:
+        observation, reward, terminated, _, _ = env.step(int(action))
+        trajectory.append(np.append(observation, reward))
+        if terminated:
+            break
+    return np.concatenate(trajectory)
+
+
+def test_seeded_reset_is_reproducible():
+    actions = np.random.default_rng(0).integers(0, 3, 3000)
+    env = PongEnv()
+    first = _episode(env, 5, actions)
+    # Même graine après d'autres épisodes : même bruit de l'adversaire (tiré par blocs) et mêmes rebonds
+    _episode(env, 6, actions)
+    np.testing.assert_array_equal(_episode(env, 5, actions), first)
+    np.testing.assert_array_equal(_episode(PongEnv(), 5, actions), first)
+
+
+def test_observations_are_normalized():
+    env = PongEnv()
+    observation, _ = env.reset(seed=0)
+    for action in np.random.default_rng(1).integers(0, 3, 2000):
+        assert env.observation_space.contains(observation)
+        observation, _, terminated, _, _ = env.step(int(action))
+        if terminated:
+            observation, _ = env.reset()
+
+
+def test_frame_skip_repeats_action_and_sums_rewards():
+    actions = np.random.default_rng(2).integers(0, 3, 500)
+    single, skipped = PongEnv(), PongEnv(frame_skip=4)
+    single.reset(seed=3)
+    skipped.reset(seed=3)
+    for action in actions:
+        total = 0.0
+        for _ in range(4):
+            observation, reward, terminated, _, _ = single.step(int(action))
+            total += reward
+            if terminated:
+                break
+        skipped_observation, skipped_reward, skipped_terminated, _, _ = skipped.step(int(action))
+        np.testing.assert_array_equal(skipped_observation, observation)
+        assert skipped_reward == total and skipped_terminated == terminated
+        assert skipped.episode_frames == single.episode_frames
+        if terminated:
+            break
+    assert terminated
+
+
+def test_max_pool_over_last_two_frames():
+    env, reference = PongEnv(frame_skip=3, max_pool=True), PongEnv()
+    env.reset(seed=0)
+    reference.reset(seed=0)
+    observations = [reference.step(1)[0] for _ in range(3)]
+    np.testing.assert_array_equal(env.step(1)[0], np.maximum(observations[1], observations[2]))
@@ -0,0 +1,44 @@
+import pstats
+from profiler import Profiler, ProfileWindow
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler()
+    with profiler.timer("step"):
+        profiler.count("frames")
+    assert profiler.summary()["timers"] == {} and profiler.summary()["counters"] == {}
+
+
+def test_timers_and_counters():
+    profiler = Profiler(enabled=True)
+    for _ in range(3):
+        with profiler.timer("step"):
+            profiler.count("frames", 2)
+    summary = profiler.summary()
+    calls, total, mean_us, _ = summary["timers"]["step"]
+    assert calls == 3 and mean_us == total / 3 * 1e6
+    assert summary["counters"] == {"frames": 6}
+    assert "step" in profiler.report()
+    profiler.reset()
+    assert profiler.summary()["timers"] == {}
+
+
+def _play():
+    pass
+
+
+def test_window_profiles_requested_episodes(tmp_path):
+    for start, end in ((3, 5), (1, 3)):
+        filename = str(tmp_path / f"profile_{start}_{end}.pstats")
+        window = ProfileWindow(start, end, filename)
+        # Même séquence d'appels que train() : 0 avant le premier épisode, puis après chaque épisode
+        reports = [window.on_episode_end(0)]
+        profiled = []
+        for episode in range(1, 7):
+            profiled.append(window.profile is not None)
+            _play()
+            reports.append(window.on_episode_end(episode))
+        assert profiled == [start <= episode < end for episode in range(1, 7)]
+        assert [bool(report) for report in reports] == [episode == end - 1 for episode in range(7)]
+        calls = sum(value[1] for key, value in pstats.Stats(filename).stats.items() if key[2] == "_play")
+        assert calls == end - start
@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+import torch
+from q_agent import QLearningAgent, AgentConfig
+from replay import PrioritizedReplayMemory
+
+
+def _agent(**kwargs):
+    torch.manual_seed(0)
+    return QLearningAgent(6, 3, device="cpu", memory_capacity=1000, seed=0, **kwargs)
+
+
+def test_greedy_actions_match_model():
+    agent = _agent()
+    agent.epsilon = 0.0
+    states = np.random.default_rng(0).uniform(-1, 1, (64, 6)).astype(np.float32)
+    with torch.no_grad():
+        expected = agent.model(torch.from_numpy(states)).argmax(1).numpy()
+    np.testing.assert_array_equal(agent.get_actions(states), expected)
+    assert agent.get_action(states[3]) == expected[3]
+
+
+def test_exploration_rate():
+    agent = _agent()
+    agent.epsilon = 0.5
+    states = np.zeros((20000, 6), dtype=np.float32)
+    greedy = agent.model(torch.from_numpy(states[:1])).argmax().item()
+    actions = agent.get_actions(states)
+    assert ((actions >= 0) & (actions < 3)).all()
+    # Moitié d'exploration, dont un tiers retombe sur l'action gloutonne
+    assert abs((actions != greedy).mean() - 1 / 3) < 0.02
+
+
+def _fill(agent, count=300):
+    rng = np.random.default_rng(0)
+    transitions = (rng.uniform(-1, 1, (count, 6)).astype(np.float32), rng.integers(0, 3, count),
+                   rng.random(count, dtype=np.float32), rng.uniform(-1, 1, (count, 6)).astype(np.float32),
+                   rng.random(count) < 0.05)
+    if agent.memory.n_step > 1:
+        # Une seule séquence : push_batch traiterait chaque ligne comme un flux
+        for i in range(count):
+            agent.memory.push(*(field[i] for field in transitions))
+    else:
+        agent.memory.push_batch(*transitions)
+    agent.train_start = agent.batch_size
+
+
+def test_train_step_reuses_batch_buffers():
+    agent = _agent()
+    _fill(agent)
+    first = agent.memory.sample_stacked(agent.batch_size)
+    second = agent.memory.sample_stacked(agent.batch_size)
+    assert all(a is b for a, b in zip(first, second))
+
+
+def test_pop_loss_averages_since_last_call():
+    agent = _agent()
+    assert agent.train_step() is None  # Mémoire vide : pas d'entraînement
+    _fill(agent)
+    losses = [agent.train_step() for _ in range(5)]
+    assert all(isinstance(loss, torch.Tensor) for loss in losses)
+    assert agent.pop_loss() == pytest.approx(torch.stack(losses).mean().item())
+    assert agent.pop_loss() == 0.0
+    assert agent.training_step == 5
+
+
+def test_config_variants_train():
+    for config in (AgentConfig(dueling=True), AgentConfig(double_dqn=True, n_step=3)):
+        agent = _agent(config=config)
+        _fill(agent)
+        assert agent.train_step() is not None
+        assert agent.model(torch.zeros(2, 6)).shape == (2, 3)
+
+
+def test_load_rebuilds_networks_and_n_step_memory(tmp_path):
+    path = str(tmp_path / "model.pth")
+    saved = _agent(config=AgentConfig(dueling=True, n_step=3))
+    saved.save(path)
+
+    agent = _agent(prioritized=True)
+    state = np.zeros(6, dtype=np.float32)
+    agent.memory.push(state, 0, 1.0, state, False)
+    agent.load(path)
+    assert agent.config == saved.config
+    for name, tensor in saved.model.state_dict().items():
+        assert torch.equal(agent.model.state_dict()[name], tensor)
+    # Mémoire recréée pour le nouveau n_step : même type et capacité, sans accumulateurs de l'ancien n
+    memory = agent.memory
+    assert isinstance(memory, PrioritizedReplayMemory) and memory.capacity == 1000
+    assert (memory.n_step, memory.gamma, memory._accumulators) == (3, agent.gamma, {})
+    for _ in range(3):
+        memory.push(state, 0, 1.0, state, False)
+    assert memory.rewards[0] == np.float32(1 + agent.gamma + agent.gamma ** 2)
+
+
+def test_load_with_other_n_step_empties_disk_memory(tmp_path):
+    path, memory_dir = str(tmp_path / "model.pth"), str(tmp_path / "memory")
+    _agent(config=AgentConfig(n_step=3)).save(path)
+
+    agent = _agent(memory_dir=memory_dir)
+    state = np.zeros(6, dtype=np.float32)
+    for _ in range(10):
+        agent.memory.push(state, 0, 1.0, state, False)
+    agent.load(path)
+    # Les retours à 1 pas déjà sur disque ne sont pas réactualisés avec gamma ** 3
+    memory = agent.memory
+    assert (memory.storage_dir, memory.n_step, len(memory)) == (memory_dir, 3, 0)
+    for _ in range(3):
+        memory.push(state, 0, 1.0, state, False)
+    memory.flush()
+    # Le n_step est enregistré avec le curseur : un agent à 3 pas retrouve la mémoire, un agent à 1 pas non
+    assert len(_agent(memory_dir=memory_dir, config=AgentConfig(n_step=3)).memory) == 1
+    assert len(_agent(memory_dir=memory_dir).memory) == 0
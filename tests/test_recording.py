@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from pong_env import PongEnv
+from recording import Recorder, Replay, TRAILER, LEFT_MISSED, RIGHT_MISSED
+
+
+def _record(path, compress, episodes=3, chunk_frames=100):
+    """Enregistre quelques épisodes de PongEnv, renvoie les positions de balle et les débuts d'épisode"""
+    recorder = Recorder(path, chunk_frames=chunk_frames, compress=compress, metadata={"seed": 1})
+    env = PongEnv(recorder=recorder)
+    env.reset(seed=1)
+    positions, starts = [], []
+    actions = np.random.default_rng(0).integers(0, 3, 100000)
+    for episode in range(episodes):
+        if episode:
+            env.reset()
+        starts.append(recorder.frame)
+        for action in actions:
+            terminated = env.step(int(action))[2]
+            positions.append((env.ball.rect.x, env.ball.rect.y))
+            if terminated:
+                break
+    recorder.close()
+    return np.array(positions, dtype=np.float32), starts
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_round_trip(tmp_path, compress):
+    path = str(tmp_path / "match.rec")
+    positions, starts = _record(path, compress)
+    replay = Replay(path)
+    assert replay.metadata["seed"] == 1 and replay.metadata["compressed"] == compress
+    assert len(replay) == len(positions) > 200  # Plusieurs chunks
+
+    frames = replay.frames()
+    np.testing.assert_array_equal(frames["frame"], np.arange(len(positions)))
+    np.testing.assert_array_equal(np.stack([frames["ball_x"], frames["ball_y"]], 1), positions)
+    # Accès direct et tranches à cheval sur plusieurs chunks
+    assert replay.frame(250) == frames[250]
+    np.testing.assert_array_equal(replay.frames(95, 305), frames[95:305])
+    with pytest.raises(IndexError):
+        replay.frame(len(replay))
+
+    # Un échange par épisode, chacun terminé par un point
+    assert replay.rallies.tolist() == starts
+    assert replay.rally_at(starts[1]) == 1 and replay.rally_at(starts[1] - 1) == 0
+    ends = np.array(starts[1:] + [len(replay)]) - 1
+    assert ((frames["events"][ends] & (LEFT_MISSED | RIGHT_MISSED)) != 0).all()
+    replay.close()
+
+
+def test_interrupted_recording_is_recovered(tmp_path):
+    path, truncated = str(tmp_path / "match.rec"), str(tmp_path / "truncated.rec")
+    positions, starts = _record(path, compress=True)
+    with open(path, "rb") as f:
+        data = f.read()
+    # Sans l'index final ni la fin du dernier chunk : les chunks complets restent lisibles
+    (index_offset, _) = TRAILER.unpack_from(data, len(data) - TRAILER.size)
+    with open(truncated, "wb") as f:
+        f.write(data[:index_offset - 10])
+    replay = Replay(truncated)
+    assert 0 < len(replay) < len(positions) and len(replay) % 100 == 0
+    np.testing.assert_array_equal(replay.frames()["ball_x"], positions[:len(replay), 0])
+    assert replay.rallies.tolist() == [start for start in starts if start < len(replay)]
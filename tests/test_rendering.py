@@ -0,0 +1,36 @@
+import pygame
+from game_states import TextCache, GameState
+from main import Game
+
+
+def test_text_cache_reuses_surfaces_with_lru_bound():
+    cache = TextCache(max_entries=2)
+    first = cache.render("1", 74)
+    assert cache.render("1", 74) is first
+    assert cache.font(74) is cache.font(74)
+    cache.render("2", 74)
+    cache.render("1", 74)  # "1" redevient le plus récent
+    cache.render("3", 74)
+    assert list(cache.surfaces) == [("1", 74, (255, 255, 255)), ("3", 74, (255, 255, 255))]
+
+
+def test_dirty_rect_frames_match_full_redraw(tmp_path):
+    game = Game(seed=0, stats_dir=str(tmp_path), verbose=False)
+    try:
+        game.state = GameState.PLAYING
+        game.draw_game(full=True)
+        full_screen = pygame.Surface(game.screen.get_size())
+        for frame in range(600):
+            game.update()
+            if game.state != GameState.PLAYING:
+                break
+            game.draw_game()
+            # Même frame redessinée entièrement sur une copie de l'écran
+            incremental = pygame.image.tobytes(game.screen, "RGB")
+            screen, previous = game.screen, game.previous_rects
+            game.screen = full_screen
+            game.draw_game(full=True)
+            game.screen, game.previous_rects = screen, previous
+            assert pygame.image.tobytes(full_screen, "RGB") == incremental, f"frame {frame}"
+    finally:
+        game.close()
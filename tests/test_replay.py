@@ -0,0 +1,162 @@
+import numpy as np
+import pytest
+from replay import ReplayMemory, PrioritizedReplayMemory, SumTree, NStepAccumulator
+
+
+def _transitions(count, state_size=6, start=0):
+    # L'état encode le numéro de la transition pour vérifier ce qui est stocké
+    index = np.arange(start, start + count, dtype=np.float32)
+    states = np.repeat(index[:, None], state_size, axis=1)
+    return states, (index % 3).astype(np.int64), index, states + 0.5, index % 7 == 0
+
+
+def test_ring_buffer_overwrites_oldest():
+    memory = ReplayMemory(10, seed=0)
+    states, actions, rewards, next_states, dones = _transitions(25)
+    for i in range(25):
+        memory.push(states[i], actions[i], rewards[i], next_states[i], dones[i])
+    assert len(memory) == 10 and memory.position == 5
+    assert sorted(memory.rewards.tolist()) == list(range(15, 25))
+
+
+def test_push_batch_matches_push():
+    single, batched = ReplayMemory(16, seed=0), ReplayMemory(16, seed=0)
+    transitions = _transitions(40)
+    for i in range(40):
+        single.push(*(field[i] for field in transitions))
+    for start in range(0, 40, 8):
+        batched.push_batch(*(field[start:start + 8] for field in transitions))
+    for name in ("states", "actions", "rewards", "next_states", "dones"):
+        np.testing.assert_array_equal(getattr(single, name), getattr(batched, name))
+    assert (single.position, single.size) == (batched.position, batched.size)
+
+
+def test_sample_returns_stored_transitions():
+    memory = ReplayMemory(100, seed=0)
+    memory.push_batch(*_transitions(50))
+    states, actions, rewards, next_states, dones = memory.sample(32)
+    assert states.shape == (32, 6)
+    np.testing.assert_array_equal(states[:, 0].numpy(), rewards.numpy())
+    np.testing.assert_array_equal(next_states.numpy(), states.numpy() + 0.5)
+    np.testing.assert_array_equal(actions.numpy(), rewards.numpy() % 3)
+    np.testing.assert_array_equal(dones.numpy(), (rewards.numpy() % 7 == 0))
+    assert rewards.max() < 50
+
+
+def test_sum_tree_sums_and_find():
+    tree = SumTree(5)
+    priorities = np.array([1.0, 0.0, 3.0, 2.0, 4.0])
+    tree.update(np.arange(5), priorities)
+    assert tree.total == priorities.sum()
+    # Chaque valeur tombe dans l'intervalle de somme cumulée de sa feuille (les feuilles nulles sont sautées)
+    values = np.array([0.5, 1.5, 3.9, 4.5, 5.9, 6.1, 9.9])
+    np.testing.assert_array_equal(tree.find(values), [0, 2, 2, 3, 3, 4, 4])
+
+
+def test_sum_tree_update_one_matches_vectorised_update():
+    rng = np.random.default_rng(0)
+    scalar, vectorised = SumTree(100), SumTree(100)
+    for _ in range(500):
+        index, priority = int(rng.integers(100)), rng.random()
+        scalar.update_one(index, priority)
+        vectorised.update(np.array([index]), priority)
+    np.testing.assert_array_equal(scalar.tree, vectorised.tree)
+    assert scalar.total == scalar.tree[scalar.leaf_count:].sum()
+
+
+def test_prioritized_sampling_is_proportional():
+    memory = PrioritizedReplayMemory(4, seed=0, alpha=1.0)
+    memory.push_batch(*_transitions(4))
+    memory.update_priorities(np.array([0, 1, 2, 3]), np.array([1.0, 1.0, 1.0, 9.0]))
+    counts = np.zeros(4)
+    for _ in range(200):
+        counts += np.bincount(memory.sample_stacked(64)[-1], minlength=4)
+    np.testing.assert_allclose(counts / counts.sum(), [1 / 12, 1 / 12, 1 / 12, 9 / 12], atol=0.01)
+
+
+def test_prioritized_push_gets_max_priority():
+    memory = PrioritizedReplayMemory(8, seed=0)
+    memory.push_batch(*_transitions(4))
+    memory.update_priorities(np.array([0]), np.array([5.0]))
+    states, actions, rewards, next_states, dones = _transitions(1, start=4)
+    memory.push(states[0], actions[0], rewards[0], next_states[0], dones[0])
+    leaves = memory.tree.tree[memory.tree.leaf_count:]
+    assert leaves[4] == pytest.approx(leaves[0]) and leaves[0] == pytest.approx((5.0 + memory.epsilon) ** memory.alpha)
+
+
+def test_memmap_storage_reopens_with_cursor(tmp_path):
+    storage_dir = str(tmp_path / "memory")
+    memory = ReplayMemory(32, seed=0, storage_dir=storage_dir)
+    memory.push_batch(*_transitions(40))
+    memory.flush()
+    del memory
+
+    reopened = ReplayMemory(32, seed=0, storage_dir=storage_dir)
+    assert (reopened.position, reopened.size) == (8, 32)
+    assert sorted(reopened.rewards.tolist()) == list(range(8, 40))
+
+
+def test_memmap_storage_rejects_other_capacity(tmp_path):
+    storage_dir = str(tmp_path / "memory")
+    ReplayMemory(32, storage_dir=storage_dir)
+    with pytest.raises(ValueError):
+        ReplayMemory(64, storage_dir=storage_dir)
+
+
+def _n_step_reference(rewards, dones, n_step, gamma):
+    """Retours à n pas d'une séquence, tronqués en fin d'épisode"""
+    returns = []
+    for t in range(len(rewards)):
+        total, discount = 0.0, 1.0
+        for k in range(t, min(t + n_step, len(rewards))):
+            total += discount * rewards[k]
+            discount *= gamma
+            if dones[k]:
+                break
+        returns.append(total)
+    return returns
+
+
+def test_n_step_accumulator_returns():
+    n_step, gamma = 3, 0.9
+    rewards = [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0]
+    dones = [False, False, False, True, False, False, True]
+    accumulator = NStepAccumulator(n_step, gamma, 1, 6)
+    out_states, out_returns, out_next, out_dones = [], [], [], []
+    for t, (reward, done) in enumerate(zip(rewards, dones)):
+        ready = accumulator.add(np.full((1, 6), t), [0], [reward], np.full((1, 6), t + 1), [done])
+        if ready is not None:
+            states, _, returns, next_states, ready_dones = ready
+            out_states += states[:, 0].tolist()
+            out_returns += returns.tolist()
+            out_next += next_states[:, 0].tolist()
+            out_dones += ready_dones.tolist()
+
+    # Chaque transition sort une fois, avec l'état n pas plus loin (ou la fin d'épisode)
+    order = np.argsort(out_states)
+    assert np.array(out_states)[order].tolist() == list(range(7))
+    expected = _n_step_reference(rewards[:4], dones[:4], n_step, gamma) + \
+        _n_step_reference(rewards[4:], dones[4:], n_step, gamma)
+    np.testing.assert_allclose(np.array(out_returns)[order], expected, rtol=1e-6)
+    assert np.array(out_next)[order].tolist() == [3, 4, 4, 4, 7, 7, 7]
+    assert np.array(out_dones)[order].tolist() == [False, True, True, True, True, True, True]
+
+
+def test_n_step_streams_are_independent():
+    memory = ReplayMemory(100, seed=0, n_step=2, gamma=0.5)
+    state = np.zeros(6, dtype=np.float32)
+    for t in range(4):
+        memory.push(state, 0, 1.0, state, False, stream=0)
+        memory.push(state, 0, 10.0, state, False, stream=1)
+    assert sorted(memory.rewards[:len(memory)].tolist()) == [1.5] * 3 + [15.0] * 3
+
+
+def test_memmap_flush_writes_given_cursor(tmp_path):
+    storage_dir = str(tmp_path / "memory")
+    memory = ReplayMemory(32, seed=0, storage_dir=storage_dir)
+    memory.push_batch(*_transitions(10))
+    cursor = memory.cursor()
+    memory.push_batch(*_transitions(5, start=10))
+    # Curseur relevé avant les dernières écritures (flush depuis le thread des checkpoints)
+    memory.flush(cursor)
+    assert len(ReplayMemory(32, storage_dir=storage_dir)) == 10
@@ -0,0 +1,80 @@
+import json
+import numpy as np
+import pytest
+from stats import GameStats, Histogram, StatsManager, REACTION_TIME_EDGES
+from stats_db import StatsDB, import_json_files
+
+
+def _reaction_counts(*values):
+    histogram = Histogram(REACTION_TIME_EDGES)
+    for value in values:
+        histogram.add(value)
+    return histogram.counts, histogram.mean
+
+
+def _game(timestamp, score1, score2, reactions1=(0.05,), reactions2=(0.3, 0.5), hits=10):
+    counts1, mean1 = _reaction_counts(*reactions1)
+    counts2, mean2 = _reaction_counts(*reactions2)
+    return GameStats(timestamp=timestamp, duration=60.0 + timestamp, player1_score=score1, player2_score=score2,
+                     total_hits=hits, avg_rally_length=2.0, max_rally_length=hits // 2, ball_speed_avg=8.0,
+                     ball_speed_max=11.0, player1_reaction_times=counts1, player2_reaction_times=counts2,
+                     player1_accuracy=100.0, player2_accuracy=0.0, player1_reaction_avg=mean1,
+                     player2_reaction_avg=mean2)
+
+
+def test_aggregates_over_windows(tmp_path):
+    db = StatsDB(str(tmp_path / "stats.db"), batch_size=2)
+    for timestamp, (score1, score2) in enumerate([(5, 1), (2, 5), (5, 4)]):
+        db.add(_game(float(timestamp), score1, score2, hits=10 * (timestamp + 1)))
+    db.flush()
+
+    summary = db.summary()
+    assert summary["games"] == 3 and summary["hits"] == 20.0 and summary["max_rally_length"] == 15
+    # last : seulement les parties les plus récentes
+    assert db.summary(last=1)["hits"] == 30.0
+    assert db.summary(since=1.0)["games"] == 2
+
+    player1 = db.player_summary("player1")
+    assert (player1["games"], player1["wins"]) == (3, 2) and player1["win_rate"] == pytest.approx(2 / 3)
+    assert db.player_summary("player2", last=2)["wins"] == 1
+    # Moyenne des temps de réaction pondérée par le nombre de renvois
+    assert db.player_summary("player2")["reaction_avg"] == pytest.approx(0.4)
+
+    histogram = db.reaction_histogram("player2")
+    assert histogram.sum() == 6 and histogram[REACTION_TIME_EDGES.index(0.3)] == 3
+    assert [game["timestamp"] for game in db.recent_games(2)] == [2.0, 1.0]
+    db.close()
+
+
+def test_stats_manager_writes_to_db(tmp_path):
+    clock = iter(range(100))
+    manager = StatsManager(str(tmp_path), clock=lambda: float(next(clock)))
+    manager.start_game()
+    manager.log_hit("player1", ball_speed=7.5, reaction_time=0.05, accuracy=1.0)
+    manager.log_score("player1")
+    stats = manager.end_game()
+    manager.close()
+    assert stats.player1_accuracy == 100.0 and stats.ball_speeds[7] == 1
+
+    db = StatsDB(str(tmp_path / "stats.db"))
+    assert db.summary()["games"] == 1 and db.player_summary("player1")["wins"] == 1
+    db.close()
+
+
+def test_import_json_files_once(tmp_path):
+    for i, (score1, score2) in enumerate([(5, 3), (1, 5)]):
+        record = {"timestamp": float(i), "duration": 30.0, "player1_score": score1, "player2_score": score2,
+                  "total_hits": 12, "avg_rally_length": 3.0, "max_rally_length": 6, "ball_speed_avg": 7.0,
+                  "ball_speed_max": 9.0, "player1_reaction_times": [0.05, 0.15, 0.25],
+                  "player2_reaction_times": [0.5], "player1_accuracy": 33.3, "player2_accuracy": 0.0}
+        with open(tmp_path / f"game_{i}.json", "w") as f:
+            json.dump(record, f)
+
+    db = StatsDB(str(tmp_path / "stats.db"))
+    assert import_json_files(db, str(tmp_path)) == 2
+    # Réimport : les sources déjà importées sont ignorées
+    assert import_json_files(db, str(tmp_path)) == 0
+    assert db.summary()["games"] == 2
+    assert db.player_summary("player1")["reaction_avg"] == pytest.approx(0.15)
+    assert np.array_equal(np.nonzero(db.reaction_histogram("player1"))[0], [0, 1, 2])
+    db.close()
@@ -0,0 +1,50 @@
+import json
+import numpy as np
+from stats_log import StatsLog, StatsReader, import_json_stats
+
+
+def test_round_trip_with_missing_fields(tmp_path):
+    path = str(tmp_path / "stats.jsonl")
+    with StatsLog(path, buffer_size=3) as log:
+        for episode in range(1, 11):
+            # La loss n'est relevée qu'un épisode sur dix, comme dans train()
+            measured = {"loss": 0.5} if episode % 10 == 0 else {}
+            log.append(episode=episode, score=float(episode), **measured)
+    stats = StatsReader(path).load()
+    np.testing.assert_array_equal(stats["episode"], np.arange(1, 11))
+    assert np.isnan(stats["loss"][:9]).all() and stats["loss"][9] == 0.5
+
+
+def test_read_new_and_tail(tmp_path):
+    path = str(tmp_path / "stats.jsonl")
+    reader = StatsReader(path)
+    assert len(reader.read_new(["episode"])["episode"]) == 0
+    log = StatsLog(path, buffer_size=1)
+    for episode in range(5):
+        log.append(episode=episode)
+    assert reader.read_new()["episode"].tolist() == [0, 1, 2, 3, 4]
+    # Ligne en cours d'écriture : laissée pour la lecture suivante
+    with open(path, "a") as f:
+        f.write('{"episode":')
+    assert len(reader.read_new(["episode"])["episode"]) == 0
+    with open(path, "a") as f:
+        f.write('5}\n')
+    assert reader.read_new()["episode"].tolist() == [5]
+    log.close()
+
+    # tail lit par blocs depuis la fin, y compris avec des blocs plus petits qu'une ligne
+    with StatsLog(path) as log:
+        for episode in range(6, 500):
+            log.append(episode=episode)
+    assert StatsReader(path).tail(3, block_size=7)["episode"].tolist() == [497, 498, 499]
+
+
+def test_import_legacy_json(tmp_path):
+    json_path, log_path = str(tmp_path / "stats.json"), str(tmp_path / "stats.jsonl")
+    with open(json_path, "w") as f:
+        json.dump({"episodes": [1, 2, 3], "scores": [1.0, 2.0, 3.0], "avg_scores": [1.0, 1.5, 2.0],
+                   "losses": [0.1, 0.2]}, f)
+    # Colonnes de longueurs différentes : on s'arrête à la plus courte
+    assert import_json_stats(json_path, log_path) == 2
+    stats = StatsReader(log_path).load()
+    assert stats["score"].tolist() == [1.0, 2.0] and stats["loss"].tolist() == [0.1, 0.2]
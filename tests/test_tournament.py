@@ -0,0 +1,48 @@
+import os
+import shutil
+import numpy as np
+import torch
+from q_agent import DQN
+from tournament import mirror_observations, play_batch, run_tournament, CACHE_FILE
+
+
+def test_mirror_is_an_involution():
+    observations = np.random.default_rng(0).uniform(-1, 1, (8, 6)).astype(np.float32)
+    mirrored = mirror_observations(observations)
+    np.testing.assert_array_equal(mirrored[:, 4], observations[:, 5])
+    np.testing.assert_array_equal(mirror_observations(mirrored), observations)
+
+
+def test_play_batch_results():
+    def idle(observations):
+        return np.zeros(len(observations), dtype=np.int64)
+
+    wins, hits, lengths = play_batch(idle, None, 8, max_steps=2000)
+    assert wins.shape == hits.shape == lengths.shape == (8,)
+    assert set(wins.tolist()) <= {0.0, 0.5, 1.0} and (lengths > 0).all()
+    # Une raquette immobile ne marque pas contre l'IA simple
+    assert wins.mean() < 0.5
+
+
+def test_tournament_ranks_and_caches(tmp_path):
+    model_dir = str(tmp_path)
+    for name, seed in (("a.pth", 0), ("b.pth", 1)):
+        torch.manual_seed(seed)
+        torch.save({"model_state_dict": DQN(6, 3, 16).state_dict(), "config": {"hidden_size": 16}},
+                   os.path.join(model_dir, name))
+    shutil.copy(os.path.join(model_dir, "a.pth"), os.path.join(model_dir, "a_copy.pth"))
+
+    kwargs = dict(episodes=4, difficulties=(0.2,), processes=1, max_steps=300)
+    rows = run_tournament(model_dir, **kwargs)
+    assert sorted(row["checkpoint"] for row in rows) == ["a.pth", "a_copy.pth", "b.pth"]
+    by_name = {row["checkpoint"]: row for row in rows}
+    # Copie identique : même empreinte, évaluée une seule fois
+    assert by_name["a.pth"]["hash"] == by_name["a_copy.pth"]["hash"]
+    assert by_name["a.pth"]["win_rate"] == by_name["a_copy.pth"]["win_rate"]
+    assert rows == sorted(rows, key=lambda row: (row["scripted_win_rate"], row["round_robin_win_rate"] or 0),
+                          reverse=True)
+
+    # Deuxième appel : tout vient du cache, sans relancer de parties
+    mtime = os.path.getmtime(os.path.join(model_dir, CACHE_FILE))
+    assert run_tournament(model_dir, **kwargs) == rows
+    assert os.path.getmtime(os.path.join(model_dir, CACHE_FILE)) == mtime
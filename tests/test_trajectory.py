@@ -0,0 +1,75 @@
+import random
+import numpy as np
+import pytest
+from physics import Ball, move_ball, WINDOW_HEIGHT, BALL_SIZE
+from trajectory import (predict_intercept, predict_intercepts, InterceptTable, reference_action,
+                        LEFT_CONTACT_X, RIGHT_CONTACT_X)
+
+RADIUS = BALL_SIZE / 2
+
+
+class NoWallNoise(random.Random):
+    """Rebonds muraux sans perturbation aléatoire (non modélisée par le prédicteur)"""
+
+    def uniform(self, a, b):
+        return 0.0
+
+
+def test_straight_line_and_mirror_bounce():
+    assert predict_intercept(100, 300, 10, 5, 300) == pytest.approx(400)
+    # 400 px plus bas que le mur du bas : replié en miroir
+    bottom = WINDOW_HEIGHT - RADIUS
+    assert predict_intercept(100, 300, 10, 20, 300) == pytest.approx(bottom - (300 + 400 - bottom))
+    assert predict_intercept(100, 300, 10, -20, 300) == pytest.approx(RADIUS + (400 - 300 + RADIUS))
+    assert predict_intercept(300, 300, 10, 5, 100) is None
+
+
+def test_vectorised_matches_scalar():
+    rng = np.random.default_rng(0)
+    x, y = rng.uniform(0, 800, 500), rng.uniform(RADIUS, WINDOW_HEIGHT - RADIUS, 500)
+    vx, vy = rng.uniform(-12, 12, 500), rng.uniform(-15, 15, 500)
+    predicted = predict_intercepts(x, y, vx, vy, LEFT_CONTACT_X)
+    for i in range(500):
+        expected = predict_intercept(x[i], y[i], vx[i], vy[i], LEFT_CONTACT_X)
+        if expected is None:
+            assert np.isnan(predicted[i])
+        else:
+            assert predicted[i] == pytest.approx(expected)
+
+
+def test_prediction_matches_simulated_ball():
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        ball = Ball(0, 0, rng=NoWallNoise())
+        ball.rect.x, ball.rect.y = rng.uniform(100, 600), rng.uniform(10, 570)
+        ball.speed_x, ball.speed_y = rng.uniform(6, 12), rng.uniform(-12, 12)
+        predicted = predict_intercept(ball.rect.centerx, ball.rect.centery, ball.speed_x, ball.speed_y,
+                                      RIGHT_CONTACT_X)
+        bounces = 0
+        while ball.rect.centerx + ball.speed_x <= RIGHT_CONTACT_X:
+            bounces += move_ball(ball)
+        # Dernière frame avant le contact ; chaque rebond discret décale la balle d'au plus un pas
+        assert abs(predicted - ball.rect.centery) <= 2 * abs(ball.speed_y) * (bounces + 1) + 1e-6
+
+
+def test_intercept_table_close_to_exact(tmp_path):
+    table = InterceptTable(LEFT_CONTACT_X)
+    rng = np.random.default_rng(2)
+    x, y = rng.uniform(200, 800, 1000), rng.uniform(RADIUS, WINDOW_HEIGHT - RADIUS, 1000)
+    vx, vy = rng.uniform(-12, -6, 1000), rng.uniform(-3, 3, 1000)
+    exact = predict_intercepts(x, y, vx, vy, LEFT_CONTACT_X)
+    approximate = table.lookup_many(x, y, vx, vy)
+    assert np.median(np.abs(approximate - exact)) < 20
+    assert table.lookup(x[0], y[0], vx[0], vy[0]) == pytest.approx(approximate[0])
+
+    path = str(tmp_path / "table.npz")
+    table.save(path)
+    np.testing.assert_array_equal(InterceptTable.load(path).lookup_many(x, y, vx, vy), approximate)
+
+
+def test_reference_action_moves_toward_intercept():
+    # Balle qui arrive vers la gauche en descendant, raquette au-dessus : il faut descendre
+    observation = np.array([0.0, 0.0, -0.5, 0.1, -0.5, 0.0], dtype=np.float32)
+    assert reference_action(observation) == 2
+    observation[4] = 0.9
+    assert reference_action(observation) == 1
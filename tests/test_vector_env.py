@@ -0,0 +1,54 @@
+import numpy as np
+from physics import WINDOW_HEIGHT
+from pong_env import PongEnv
+from vector_env import VectorPongEnv
+
+
+def _tracking_action(observation):
+    """Suit la balle : assez pour renvoyer la balle et tester les rebonds sur raquette"""
+    if abs(observation[1] - observation[4]) < 0.02:
+        return 0
+    return 1 if observation[1] < observation[4] else 2
+
+
+def test_same_trajectory_as_pong_env():
+    # Sans bruit de l'adversaire, les deux environnements sont déterministes jusqu'au premier
+    # rebond sur un mur (bruit aléatoire tiré par des générateurs différents)
+    env = PongEnv(opponent_difficulty=0.0)
+    observation, _ = env.reset(seed=0)
+    vector_env = VectorPongEnv(1, opponent_difficulty=0.0, seed=0)
+    vector_observations, _ = vector_env.reset(seed=0)
+    np.testing.assert_allclose(vector_observations[0], observation, atol=1e-6)
+
+    steps = 0
+    while True:
+        action = _tracking_action(observation)
+        observation, reward, terminated, _, _ = env.step(action)
+        vector_observations, rewards, terminations, _, infos = vector_env.step([action])
+        if terminations[0]:
+            vector_observations = infos["final_obs"]
+        ball = env.ball.rect
+        if ball.top <= 0 or ball.bottom >= WINDOW_HEIGHT:
+            break
+        np.testing.assert_allclose(vector_observations[0], observation, atol=1e-5)
+        assert rewards[0] == np.float32(reward)
+        assert terminations[0] == terminated
+        assert vector_env.hits[0] == env.hits
+        steps += 1
+        if terminated:
+            break
+    assert env.hits >= 1 and steps > 100
+
+
+def test_autoreset_returns_final_observation():
+    vector_env = VectorPongEnv(4, seed=0)
+    for _ in range(2000):
+        observations, _, terminations, _, infos = vector_env.step(np.zeros(4, dtype=np.int64))
+        if terminations.any():
+            break
+    assert terminations.any()
+    assert infos["_final_obs"].tolist() == terminations.tolist()
+    # Les parties terminées repartent de l'état initial, les autres continuent
+    reset_observations, _ = VectorPongEnv(1, seed=0).reset()
+    np.testing.assert_allclose(observations[terminations], np.repeat(reset_observations, terminations.sum(), 0))
+    assert (vector_env.episode_lengths[terminations] == 0).all()